@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from itertools import count
+
+from denuncias import LIMITADA, MSG_DENUNCIAS_EXCEDIDAS, OCULTADA, REPETIDA, registro_denuncias
+from eventos import ConteudoOcultado, DenunciaRegistrada, FalhaOperacao, publicar
 
 class Noticia:
     def __init__(self, categoria, autor, conteudo, data, imagem, fonte):
@@ -42,17 +46,23 @@ class TopicoAdapterInterface(ABC):
         pass
 
     @abstractmethod
-    def denunciar(self):
+    def denunciar(self, usuario=None):
         pass
 
 # --- Adapter unificado ---
 
+# Ids dos tópicos adaptados: a chave no registro de denúncias não pode
+# segurar o próprio adapter (o registro é global e viveria mais que ele).
+_ids_adapters = count(1)
+
 class TopicoAdapter(TopicoAdapterInterface):
     def __init__(self, noticia=None, equipamento=None, receita=None, evento=None):
+        self.id = next(_ids_adapters)
         self.noticia = noticia
         self.equipamento = equipamento
         self.receita = receita
         self.evento = evento
+        self.oculto = False
 
     def criar(self):
         if self.noticia:
@@ -69,8 +79,19 @@ class TopicoAdapter(TopicoAdapterInterface):
     def editar(self, topico):
         print(f"Editando tópico: {topico}")
 
-    def denunciar(self):
-        print("Denúncia registrada.")
+    def denunciar(self, usuario=None, registro=None):
+        nome_usuario = getattr(usuario, "nome_usuario", usuario)
+        resultado = (registro or registro_denuncias()).registrar(("topico_adaptado", self.id), nome_usuario)
+        if resultado == LIMITADA:
+            publicar(FalhaOperacao("denunciar", MSG_DENUNCIAS_EXCEDIDAS))
+            return resultado
+        if resultado == REPETIDA:
+            return resultado
+        publicar(DenunciaRegistrada("topico", self.id, nome_denunciante=nome_usuario))
+        if resultado == OCULTADA:
+            self.oculto = True
+            publicar(ConteudoOcultado("topico", self.id))
+        return resultado
 
     def _criar_noticia(self):
         return f"Notícia criada: {self.noticia.categoria} - {self.noticia.autor} - {self.noticia.fonte}"
@@ -0,0 +1,167 @@
+import re
+import threading
+import time
+from collections import deque
+from itertools import count
+
+from busca import normalizar
+
+# === Detecção de quase-duplicatas ===
+# Cada texto vira uma assinatura MinHash sobre os seus k-gramas de caracteres
+# (depois de normalizado: minúsculas, sem acentos e sem pontuação), o que pega
+# variações com palavras trocadas, erros de digitação e emojis a mais. Em vez
+# de `permutacoes` funções de hash por k-grama, cada k-grama é hasheado uma
+# vez só e cai num dos `permutacoes` compartimentos, que guardam o menor valor
+# visto (one permutation hashing); compartimentos vazios copiam o próximo
+# preenchido, deslocado pela distância (densificação por rotação). O custo é
+# linear no tamanho do texto.
+#
+# A assinatura é cortada em `bandas` faixas; textos que coincidem em alguma
+# faixa inteira são candidatos, e só os candidatos têm a similaridade
+# estimada (fração de compartimentos iguais) comparada com `limiar`. Com 16
+# faixas de 4 linhas, pares com Jaccard 0,7 viram candidatos em ~98% das vezes
+# e pares com 0,2, em ~2,5%.
+#
+# A memória é limitada: assinaturas saem depois de `ttl` segundos ou, acima
+# de `capacidade`, as mais antigas primeiro. Uma duplicata encontrada não
+# entra no índice (senão uma onda de spam encheria os baldes), mas renova o
+# original, que continua representando a onda enquanto ela durar.
+SINALIZAR, REJEITAR = "sinalizar", "rejeitar"
+
+_MASCARA = (1 << 64) - 1
+_VAZIO = _MASCARA + 1
+_PALAVRA = re.compile(r"[^\W_]+")
+
+
+def _fragmentos(texto):
+    return " ".join(_PALAVRA.findall(normalizar(texto)))
+
+
+class IndiceDuplicatas:
+    def __init__(self, permutacoes: int = 64, bandas: int = 16, limiar: float = 0.6, tamanho_kgrama: int = 5,
+                 tamanho_minimo: int = 40, capacidade: int = 200_000, ttl: float = 24 * 3600,
+                 relogio=time.monotonic):
+        if permutacoes % bandas:
+            raise ValueError("permutacoes deve ser múltiplo de bandas")
+        self.permutacoes = permutacoes
+        self.bandas = bandas
+        self.linhas = permutacoes // bandas
+        self.limiar = limiar
+        self.tamanho_kgrama = tamanho_kgrama
+        self.tamanho_minimo = tamanho_minimo
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.relogio = relogio
+        self._assinaturas = {}    # chave -> (assinatura, sequência da entrada em _ordem)
+        self._baldes = [{} for _ in range(bandas)]  # por faixa: hash da faixa -> [chaves]
+        self._ordem = deque()     # (instante, sequência, chave), na ordem de entrada ou renovação
+        self._sequencia = count()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._assinaturas)
+
+    def assinatura(self, texto):
+        # None para textos curtos demais para distinguir ("Obrigado!").
+        normal = _fragmentos(texto)
+        n = self.tamanho_kgrama
+        if len(normal) < max(self.tamanho_minimo, n):
+            return None
+        k = self.permutacoes
+        minimos = [_VAZIO] * k
+        for h in {hash(normal[i:i + n]) & _MASCARA for i in range(len(normal) - n + 1)}:
+            compartimento, valor = h % k, h // k
+            if valor < minimos[compartimento]:
+                minimos[compartimento] = valor
+        if _VAZIO in minimos:
+            self._densificar(minimos)
+        return tuple(minimos)
+
+    @staticmethod
+    def _densificar(minimos):
+        k = len(minimos)
+        origem = minimos[:]
+        for i in range(k):
+            if origem[i] == _VAZIO:
+                distancia = 1
+                while origem[(i + distancia) % k] == _VAZIO:
+                    distancia += 1
+                minimos[i] = origem[(i + distancia) % k] + distancia * _VAZIO
+
+    def _faixas(self, assinatura):
+        r = self.linhas
+        return [hash(assinatura[b * r:(b + 1) * r]) for b in range(self.bandas)]
+
+    def _similaridade(self, a, b):
+        return sum(x == y for x, y in zip(a, b)) / self.permutacoes
+
+    def semelhante(self, assinatura, ignorar=None):
+        # (chave, similaridade) do primeiro texto indexado acima do limiar;
+        # `ignorar` é a chave do próprio texto, numa edição.
+        if assinatura is None:
+            return None
+        faixas = self._faixas(assinatura)
+        with self._trava:
+            self._expirar(self.relogio())
+            vistos = {ignorar}
+            for balde, faixa in zip(self._baldes, faixas):
+                for chave in balde.get(faixa, ()):
+                    if chave in vistos:
+                        continue
+                    vistos.add(chave)
+                    similaridade = self._similaridade(assinatura, self._assinaturas[chave][0])
+                    if similaridade >= self.limiar:
+                        return chave, similaridade
+        return None
+
+    def adicionar(self, chave, assinatura):
+        if assinatura is None:
+            return
+        faixas = self._faixas(assinatura)
+        with self._trava:
+            agora = self.relogio()
+            if chave in self._assinaturas:
+                self._remover(chave)
+            sequencia = next(self._sequencia)
+            self._assinaturas[chave] = (assinatura, sequencia)
+            self._ordem.append((agora, sequencia, chave))
+            for balde, faixa in zip(self._baldes, faixas):
+                balde.setdefault(faixa, []).append(chave)
+            self._expirar(agora)
+
+    def remover(self, chave):
+        # Conteúdo apagado deixa de ser comparado.
+        with self._trava:
+            if chave in self._assinaturas:
+                self._remover(chave)
+
+    def renovar(self, chave):
+        with self._trava:
+            registro = self._assinaturas.get(chave)
+            if registro is not None:
+                sequencia = next(self._sequencia)
+                self._assinaturas[chave] = (registro[0], sequencia)
+                # A entrada antiga em _ordem fica obsoleta e é pulada ao expirar.
+                self._ordem.append((self.relogio(), sequencia, chave))
+
+    def _expirar(self, agora):
+        ordem, assinaturas = self._ordem, self._assinaturas
+        limite = agora - self.ttl
+        while ordem and (ordem[0][0] <= limite or len(assinaturas) > self.capacidade):
+            _, sequencia, chave = ordem.popleft()
+            registro = assinaturas.get(chave)
+            if registro is not None and registro[1] == sequencia:
+                self._remover(chave)
+        # Renovações acumulam entradas obsoletas; o deque não passa de o dobro
+        # do índice.
+        if len(ordem) > 2 * len(assinaturas) + 1024:
+            self._ordem = deque(entrada for entrada in ordem
+                                if assinaturas.get(entrada[2], (None, None))[1] == entrada[1])
+
+    def _remover(self, chave):
+        assinatura, _ = self._assinaturas.pop(chave)
+        for balde, faixa in zip(self._baldes, self._faixas(assinatura)):
+            chaves = balde[faixa]
+            chaves.remove(chave)
+            if not chaves:
+                del balde[faixa]
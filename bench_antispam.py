@@ -0,0 +1,99 @@
+import random
+import string
+import sys
+import time
+
+from antispam import IndiceDuplicatas
+
+# Uso: python bench_antispam.py [postagens_legitimas] [modelos_de_spam] [variacoes_por_modelo]
+# Corpus sintético: postagens legítimas sorteadas de um vocabulário de café e
+# ondas de spam, cada uma com um modelo e variações (palavras trocadas,
+# removidas ou inseridas, erros de digitação, caixa alta, link diferente),
+# intercaladas em ordem aleatória. Mede a latência por postagem (assinatura,
+# consulta e inserção) e a precisão/revocação das sinalizações.
+
+_RAIZES = ("cafe moagem torra grao espresso coado prensa filtro barista xicara aroma acidez corpo docura "
+           "fazenda origem safra arabica robusta leite crema extracao agua temperatura balanca moedor "
+           "cafeteira chemex aeropress italiana sabor notas chocolate frutas caramelo mel amargo").split()
+_LIGACOES = "a o de da do que com para em no na um uma e mas muito pouco mais menos bem".split()
+
+
+def _vocabulario(aleatorio, tamanho):
+    palavras = set(_RAIZES)
+    while len(palavras) < tamanho:
+        palavras.add("".join(aleatorio.choices(string.ascii_lowercase, k=aleatorio.randint(3, 10))))
+    return list(palavras)
+
+
+def _texto(aleatorio, vocabulario):
+    return " ".join(aleatorio.choice(_LIGACOES) if aleatorio.random() < 0.3 else aleatorio.choice(vocabulario)
+                    for _ in range(aleatorio.randint(15, 60)))
+
+
+def _variar(aleatorio, modelo, vocabulario):
+    palavras = modelo.split()
+    for _ in range(aleatorio.randint(1, 4)):
+        acao, i = aleatorio.random(), aleatorio.randrange(len(palavras))
+        if acao < 0.25:
+            palavras[i] = aleatorio.choice(vocabulario)
+        elif acao < 0.5 and len(palavras) > 10:
+            del palavras[i]
+        elif acao < 0.75:
+            palavras.insert(i, aleatorio.choice(vocabulario))
+        else:
+            palavra = list(palavras[i])
+            palavra[aleatorio.randrange(len(palavra))] = aleatorio.choice(string.ascii_lowercase)
+            palavras[i] = "".join(palavra)
+    texto = " ".join(palavras)
+    if aleatorio.random() < 0.3:
+        texto = texto.upper()
+    return f"{texto} www.promo{aleatorio.randrange(100)}.com.br !!!"
+
+
+if __name__ == "__main__":
+    legitimas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    modelos = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    variacoes = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    aleatorio = random.Random(42)
+    vocabulario = _vocabulario(aleatorio, 5_000)
+
+    corpus = [(False, None, _texto(aleatorio, vocabulario)) for _ in range(legitimas)]
+    for onda in range(modelos):
+        modelo = _texto(aleatorio, vocabulario)
+        corpus.extend((True, onda, _variar(aleatorio, modelo, vocabulario)) for _ in range(variacoes))
+    aleatorio.shuffle(corpus)
+
+    indice = IndiceDuplicatas()
+    primeira_da_onda = set()
+    verdadeiros = falsos = perdidos = 0
+    latencias = []
+    for chave, (spam, onda, texto) in enumerate(corpus):
+        inicio = time.perf_counter()
+        assinatura = indice.assinatura(texto)
+        semelhante = indice.semelhante(assinatura)
+        if semelhante is None:
+            indice.adicionar(chave, assinatura)
+        else:
+            indice.renovar(semelhante[0])
+        latencias.append(time.perf_counter() - inicio)
+
+        # A primeira variação de cada onda não tem com o que ser comparada.
+        esperado = spam and onda in primeira_da_onda
+        if spam:
+            primeira_da_onda.add(onda)
+        if semelhante is not None:
+            if esperado:
+                verdadeiros += 1
+            else:
+                falsos += 1
+        elif esperado:
+            perdidos += 1
+
+    latencias.sort()
+    media = sum(latencias) / len(latencias) * 1e6
+    p99 = latencias[int(len(latencias) * 0.99)] * 1e6
+    print(f"postagens={len(corpus):,} | indexadas={len(indice):,}")
+    print(f"latência média {media:.1f} µs | p99 {p99:.1f} µs")
+    print(f"precisão {verdadeiros / max(1, verdadeiros + falsos):.4f} | "
+          f"revocação {verdadeiros / max(1, verdadeiros + perdidos):.4f} | "
+          f"falsos positivos {falsos} de {legitimas:,} legítimas")
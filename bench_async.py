@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from eventos import SinkNulo, definir_sink
+from forum_async import ComunidadeCafeAsync
+from forum_manager import ComunidadeCafeManager
+from repositorio import RepositorioSQLite
+
+# Uso: python bench_async.py [clientes] [requisicoes_por_cliente]
+# Cada cliente alterna postagem e resposta num tópico próprio; compara o envio
+# em lotes (padrão) com um salto para o executor por requisição (tamanho_lote=1).
+
+
+async def cliente(forum, indice, requisicoes):
+    titulo = f"Tópico {indice}"
+    postagem = None
+    for n in range(requisicoes):
+        if postagem is None or n % 4 == 0:
+            postagem = await forum.adicionar_postagem(titulo, "autor", f"postagem {n}")
+        else:
+            await forum.responder_postagem_por_id(postagem.id, "autor", f"resposta {n}")
+
+
+async def medir(forum, clientes, requisicoes):
+    await forum.registrar_usuario("Autor", "autor", "123", "admin")
+    await asyncio.gather(*(forum.criar_topico(f"Tópico {i}", "autor", "Discussão", "") for i in range(clientes)))
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(forum, i, requisicoes) for i in range(clientes)))
+    await forum.confirmar()
+    return clientes * requisicoes / (time.perf_counter() - inicio)
+
+
+def executar(descricao, clientes, requisicoes, tamanho_lote, caminho=None):
+    ComunidadeCafeManager._instancia = None
+    manager = ComunidadeCafeManager()
+    if caminho:
+        manager.usar_repositorio(RepositorioSQLite(caminho))
+    forum = ComunidadeCafeAsync(manager, tamanho_lote=tamanho_lote)
+    vazao = asyncio.run(medir(forum, clientes, requisicoes))
+    manager.fechar()
+    print(f"{descricao:>22} | {vazao:>10,.0f} req/s")
+
+
+if __name__ == "__main__":
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    requisicoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    definir_sink(SinkNulo())
+    print(f"clientes={clientes} requisições/cliente={requisicoes}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for repositorio in ("memoria", "sqlite"):
+            for tamanho_lote in (1, 256):
+                caminho = os.path.join(pasta, f"forum-{tamanho_lote}.db") if repositorio == "sqlite" else None
+                executar(f"{repositorio} lote={tamanho_lote}", clientes, requisicoes, tamanho_lote, caminho)
@@ -0,0 +1,50 @@
+import itertools
+import random
+import sys
+import time
+
+from busca import POSTAGEM, IndiceTextual
+
+# Uso: python bench_busca.py [documentos]
+# Vocabulário com distribuição de Zipf: poucos termos muito comuns ("cafe"),
+# uma cauda longa de termos raros. Mede indexação e latência de consultas top-10.
+
+COMUNS = ["cafe", "coado", "espresso", "graos", "torra", "moagem", "leite", "acucar", "xicara", "barista"]
+
+
+def gerar_vocabulario(tamanho):
+    return COMUNS + [f"termo{i}" for i in range(tamanho - len(COMUNS))]
+
+
+def gerar_documentos(quantidade, vocabulario, palavras_por_documento=12, semente=42):
+    aleatorio = random.Random(semente)
+    acumulados = list(itertools.accumulate(1 / (posicao + 1) for posicao in range(len(vocabulario))))
+    palavras = aleatorio.choices(vocabulario, cum_weights=acumulados, k=quantidade * palavras_por_documento)
+    for i in range(quantidade):
+        documento = palavras[i * palavras_por_documento:(i + 1) * palavras_por_documento]
+        if i % 1000 == 0:
+            documento += ["cold", "brew"]
+        yield " ".join(documento)
+
+
+def medir_consulta(indice, consulta, repeticoes=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultados = indice.buscar(consulta, limite=10)
+    return (time.perf_counter() - inicio) / repeticoes * 1000, len(resultados)
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    vocabulario = gerar_vocabulario(50_000)
+    indice = IndiceTextual()
+
+    inicio = time.perf_counter()
+    for i, texto in enumerate(gerar_documentos(quantidade, vocabulario)):
+        indice.indexar(POSTAGEM, i, texto)
+    duracao = time.perf_counter() - inicio
+    print(f"documentos={quantidade} | indexação {quantidade / duracao:,.0f} docs/s")
+
+    for consulta in ("cold brew", "cold brew cafe", "termo4000 cafe", "cafe", "cafe coado espresso"):
+        latencia, n = medir_consulta(indice, consulta)
+        print(f"{consulta!r:>24} | {latencia:8.2f} ms | {n} resultados")
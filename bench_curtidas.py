@@ -0,0 +1,43 @@
+import random
+import resource
+import sys
+import time
+
+from curtidas import RegistroCurtidas
+
+# Uso: python bench_curtidas.py [curtidas] [usuarios] [respostas]
+# Curtidas com popularidade de Zipf entre as respostas: poucas respostas com
+# milhares de likes, uma cauda longa com um ou dois. Mede bytes por curtida
+# (variação do RSS) e a consulta em lote de uma página de 50 respostas.
+
+
+def rss_atual():
+    with open("/proc/self/statm") as arquivo:
+        return int(arquivo.read().split()[1]) * resource.getpagesize()
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    total_usuarios = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    total_respostas = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000
+    aleatorio = random.Random(42)
+    nomes = [f"usuario{i}" for i in range(total_usuarios)]
+
+    registro = RegistroCurtidas()
+    for nome in nomes:
+        registro._numero(nome)  # mede só as curtidas, não o dicionário de nomes
+    antes = rss_atual()
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        id_resposta = int(total_respostas ** aleatorio.random())
+        registro.adicionar(nomes[aleatorio.randrange(total_usuarios)], id_resposta)
+    duracao = time.perf_counter() - inicio
+    bytes_por_curtida = (rss_atual() - antes) / len(registro)
+    print(f"curtidas={len(registro):,} | {len(registro) / duracao:,.0f} curtidas/s | "
+          f"{bytes_por_curtida:.1f} B/curtida (RSS) | {registro.tamanho_em_bytes() / len(registro):.1f} B/curtida (dados)")
+
+    paginas = [[int(total_respostas ** aleatorio.random()) for _ in range(50)] for _ in range(1000)]
+    inicio = time.perf_counter()
+    for pagina in paginas:
+        registro.curtidas_em(nomes[aleatorio.randrange(total_usuarios)], pagina)
+    print(f"consulta em lote (50 respostas): {(time.perf_counter() - inicio) / len(paginas) * 1e6:.1f} µs/página")
@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+
+from diario import RepositorioDiario
+from eventos import SinkNulo, definir_sink
+from forum_manager import ComunidadeCafeManager
+
+# Uso: python bench_diario.py [topicos] [postagens_por_topico] [respostas_por_postagem]
+# Compara a partida a partir de snapshot + cauda do diário com a partida que
+# precisa reaplicar o diário inteiro.
+
+
+def abrir(pasta):
+    ComunidadeCafeManager._instancia = None
+    manager = ComunidadeCafeManager()
+    manager.usar_repositorio(RepositorioDiario(pasta, limite_diario=1 << 62))
+    return manager
+
+
+def popular(manager, topicos, postagens, respostas):
+    manager.registrar_usuario("Autor", "autor", "123", "admin")
+    total = 0
+    for t in range(topicos):
+        titulo = f"Tópico {t}"
+        manager.criar_topico(titulo, "autor", "Discussão", "Descrição do tópico")
+        for _ in range(postagens):
+            postagem = manager.adicionar_postagem(titulo, "autor", "Texto da postagem")
+            for _ in range(respostas):
+                manager.responder_postagem_por_id(postagem.id, "autor", "Conteúdo da resposta")
+                total += 1
+    return total
+
+
+def medir(rotulo, funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    print(f"{rotulo:<42} {time.perf_counter() - inicio:8.3f}s")
+    return resultado
+
+
+if __name__ == "__main__":
+    definir_sink(SinkNulo())
+    topicos, postagens, respostas = ([int(a) for a in sys.argv[1:4]] + [2_000, 10, 50][len(sys.argv[1:4]):])
+    with tempfile.TemporaryDirectory() as pasta_snapshot, tempfile.TemporaryDirectory() as pasta_diario:
+        manager = abrir(pasta_snapshot)
+        total = medir("escrita com diário", lambda: popular(manager, topicos, postagens, respostas))
+        print(f"respostas: {total:,}")
+        medir("gravação do snapshot", manager.gravar_snapshot)
+        for i in range(1_000):
+            manager.adicionar_postagem(f"Tópico {i % topicos}", "autor", "Postagem depois do snapshot")
+        manager.fechar()
+
+        manager = abrir(pasta_diario)
+        popular(manager, topicos, postagens, respostas)
+        manager.fechar()
+
+        manager = medir("partida: snapshot (mmap) + cauda do diário", lambda: abrir(pasta_snapshot))
+        medir("  primeiro acesso a uma thread", lambda: len(manager.indice_topicos.buscar("Tópico 0").postagens))
+        manager.fechar()
+        manager = medir("partida: reaplicando o diário inteiro", lambda: abrir(pasta_diario))
+        manager.fechar()
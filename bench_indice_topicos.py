@@ -0,0 +1,38 @@
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+from forum_manager import ComunidadeCafeManager
+
+# Uso: python bench_indice_topicos.py [quantidade_maxima_de_topicos]
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+POSTAGENS_MEDIDAS = 5_000
+
+
+def montar_forum(quantidade_topicos):
+    ComunidadeCafeManager._instancia = None
+    manager = ComunidadeCafeManager()
+    manager.registrar_usuario("Autor", "autor", "123", "admin")
+    for i in range(quantidade_topicos):
+        manager.criar_topico(f"Tópico {i}", "autor", "Discussão", "Descrição")
+    return manager
+
+
+def medir_postagem(manager, quantidade_topicos):
+    titulos = [f"Tópico {random.randrange(quantidade_topicos)}" for _ in range(POSTAGENS_MEDIDAS)]
+    inicio = time.perf_counter()
+    for titulo in titulos:
+        manager.adicionar_postagem(titulo, "autor", "Texto da postagem")
+    return (time.perf_counter() - inicio) / POSTAGENS_MEDIDAS
+
+
+if __name__ == "__main__":
+    limite = int(sys.argv[1]) if len(sys.argv) > 1 else TAMANHOS[-1]
+    print(f"{'tópicos':>10} | {'latência média por postagem':>28}")
+    for tamanho in [t for t in TAMANHOS if t <= limite]:
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            manager = montar_forum(tamanho)
+            latencia = medir_postagem(manager, tamanho)
+        print(f"{tamanho:>10} | {latencia * 1e6:>25.2f} µs")
@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+from forum_manager import ComunidadeCafeManager
+
+# Uso: python bench_ingestao_lote.py [quantidade_de_registros]
+# O caminho por chamada escreve no stdout. Ele é medido com a saída indo para
+# um arquivo temporário e para um pseudo-terminal (quando disponível), que é o
+# cenário de uma migração rodando num console.
+
+
+def novo_manager():
+    ComunidadeCafeManager._instancia = None
+    manager = ComunidadeCafeManager()
+    manager.limitador = None  # migração: as escritas não vêm de usuários de verdade
+    return manager
+
+
+def registros(quantidade):
+    usuarios = [(f"Usuário {i}", f"u{i}", "senha") for i in range(quantidade)]
+    topicos = [(f"Tópico {i}", f"u{i}", "Discussão", "Descrição") for i in range(quantidade)]
+    postagens = [(f"Tópico {i}", f"u{(i * 7) % quantidade}", "Texto da postagem") for i in range(quantidade)]
+    return usuarios, topicos, postagens
+
+
+@contextmanager
+def saida_em_arquivo():
+    with tempfile.TemporaryFile("w") as saida:
+        yield saida
+
+
+@contextmanager
+def saida_em_terminal():
+    import pty
+    mestre, escravo = pty.openpty()
+
+    def drenar():
+        try:
+            while os.read(mestre, 65536):
+                pass
+        except OSError:
+            pass
+
+    threading.Thread(target=drenar, daemon=True).start()
+    with os.fdopen(escravo, "w", buffering=1) as saida:
+        yield saida
+    os.close(mestre)
+
+
+def por_chamada(usuarios, topicos, postagens, destino):
+    manager = novo_manager()
+    with destino() as saida, redirect_stdout(saida):
+        inicio = time.perf_counter()
+        for r in usuarios:
+            manager.registrar_usuario(*r)
+        for r in topicos:
+            manager.criar_topico(*r)
+        for r in postagens:
+            manager.adicionar_postagem(*r)
+        return time.perf_counter() - inicio
+
+
+def em_lote(usuarios, topicos, postagens):
+    manager = novo_manager()
+    inicio = time.perf_counter()
+    manager.registrar_usuarios_em_lote(usuarios)
+    manager.criar_topicos_em_lote(topicos)
+    manager.adicionar_postagens_em_lote(postagens)
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dados = registros(quantidade)
+    total = 3 * quantidade
+    t_lote = em_lote(*dados)
+    print(f"registros: {total}")
+    print(f"em lote:                  {total / t_lote:>12,.0f} registros/s")
+    destinos = [("arquivo", saida_em_arquivo)]
+    if sys.platform != "win32":
+        destinos.append(("terminal", saida_em_terminal))
+    for nome, destino in destinos:
+        t_chamada = por_chamada(*dados, destino)
+        print(f"por chamada ({nome:8}):   {total / t_chamada:>12,.0f} registros/s"
+              f"  (lote {t_chamada / t_lote:.1f}x mais rápido)")
@@ -0,0 +1,58 @@
+import resource
+import subprocess
+import sys
+
+from forum_manager import Postagem, Resposta, Usuario
+
+# Uso: python bench_memoria.py [respostas ...]
+# Mede bytes por resposta (objeto + vaga na ListaEstavel) comparando o modelo
+# com __slots__ com uma réplica do modelo antigo, baseado em __dict__. Cada
+# medição roda num processo separado e usa a variação do RSS.
+
+
+# Valores iniciais de cada atributo de Resposta, na ordem de __slots__.
+_MOLDE = Resposta("", None)
+_PADROES = tuple((nome, getattr(_MOLDE, nome)) for nome in Resposta.__slots__)
+
+
+class RespostaComDict:
+    # Mesmos atributos de Resposta (lidos de __slots__, então acompanham o
+    # modelo), guardados num __dict__ como antes de __slots__.
+    def __init__(self, conteudo, autor, id=None):
+        valores = {"id": id, "conteudo": conteudo, "autor": autor}
+        for nome, padrao in _PADROES:
+            setattr(self, nome, valores.get(nome, padrao))
+
+
+def rss_atual():
+    with open("/proc/self/statm") as arquivo:
+        return int(arquivo.read().split()[1]) * resource.getpagesize()
+
+
+def medir(modelo, quantidade):
+    classe = Resposta if modelo == "slots" else RespostaComDict
+    autor = Usuario("Autor", "autor", "123", "padrão")
+    postagem = Postagem(autor, "Texto", id=1)
+    # Conteúdo compartilhado: mede só o custo do modelo, não o do texto.
+    conteudo = "Conteúdo da resposta"
+    antes = rss_atual()
+    for i in range(quantidade):
+        postagem.adicionar_resposta(classe(conteudo, autor, id=i))
+    return (rss_atual() - antes) / quantidade
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--modo":
+        print(medir(sys.argv[2], int(sys.argv[3])))
+        sys.exit()
+
+    quantidades = [int(a) for a in sys.argv[1:]] or [1_000_000]
+    for quantidade in quantidades:
+        resultados = {}
+        for modelo in ("dict", "slots"):
+            saida = subprocess.run([sys.executable, __file__, "--modo", modelo, str(quantidade)],
+                                   check=True, capture_output=True, text=True).stdout
+            resultados[modelo] = float(saida)
+        reducao = 1 - resultados["slots"] / resultados["dict"]
+        print(f"respostas={quantidade:>11,} | __dict__ {resultados['dict']:6.1f} B/resposta | "
+              f"__slots__ {resultados['slots']:6.1f} B/resposta | redução {reducao:.0%}")
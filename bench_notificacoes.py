@@ -0,0 +1,52 @@
+import sys
+import time
+
+from eventos import SinkEventos, definir_sink
+from notificacao_respostas import DespachanteNotificacoes, Topico, Usuario, definir_despachante
+
+# Uso: python bench_notificacoes.py [respostas]
+# Latência média de gerarResposta quando entregar uma notificação custa 0, 1 ou
+# 5 ms (um sink que dorme, simulando e-mail/push). "inline" reproduz o caminho
+# antigo, em que a resposta chamava autor.notificar() diretamente.
+
+
+class SinkLento(SinkEventos):
+    def __init__(self, custo):
+        self.custo = custo
+        self.entregues = 0
+
+    def publicar(self, evento):
+        if self.custo:
+            time.sleep(self.custo)
+        self.entregues += 1
+
+
+def medir(modo, custo, quantidade):
+    sink = SinkLento(custo)
+    definir_sink(sink)
+    despachante = DespachanteNotificacoes()
+    definir_despachante(despachante)
+    autores = [Usuario(f"Autor {i}", f"autor{i}") for i in range(100)]
+    topicos = [Topico(f"Tópico {i}", autor, "2025-06-01", "...") for i, autor in enumerate(autores)]
+    leitor = Usuario("Leitor", "leitor")
+
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        topico = topicos[i % len(topicos)]
+        if modo == "inline":
+            topico.respostas.append(i)
+            topico.autor.notificar()
+        else:
+            topico.gerarResposta(leitor, "texto")
+    latencia = (time.perf_counter() - inicio) / quantidade * 1e6
+    despachante.fechar()
+    return latencia, sink.entregues
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    for custo in (0, 0.001, 0.005):
+        for modo in ("inline", "fila"):
+            latencia, entregues = medir(modo, custo, quantidade)
+            print(f"custo {custo * 1000:3.0f} ms | {modo:>6} | {latencia:9.1f} µs/resposta | "
+                  f"{entregues:>5} notificações para {quantidade} respostas")
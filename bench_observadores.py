@@ -0,0 +1,81 @@
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import wait
+
+from moderacao import ASYNCIO, SINCRONO, THREADS, AlteracaoTopico, Observador, SujeitoObserver
+
+# Uso: python bench_observadores.py [observadores] [eventos]
+# Entregas por segundo com N observadores em cada modo de despacho, com e sem
+# filtro (10% dos observadores aceitam o evento), e o custo de desvincular todos
+# comparado com a lista do modelo antigo.
+
+
+class Nulo(Observador):
+    __slots__ = ("recebidos",)
+
+    def __init__(self):
+        self.recebidos = 0
+
+    def atualizar(self, evento=None):
+        self.recebidos += 1
+
+
+class ListaAntiga:
+    # Registro do modelo antigo: lista com remove() linear.
+    def __init__(self):
+        self.observers = []
+
+    def vincular(self, observer):
+        self.observers.append(observer)
+
+    def desvincular(self, observer):
+        self.observers.remove(observer)
+
+
+def medir_despacho(despacho, observadores, eventos, filtro=None):
+    sujeito = SujeitoObserver(despacho=despacho)
+    for i, observador in enumerate(observadores):
+        sujeito.vincular(observador, filtro if i % 10 else None)
+    evento = AlteracaoTopico(None, "editado")
+
+    inicio = time.perf_counter()
+    if despacho == ASYNCIO:
+        async def principal():
+            for _ in range(eventos):
+                await sujeito.notificar(evento)
+        asyncio.run(principal())
+    else:
+        for _ in range(eventos):
+            resultado = sujeito.notificar(evento)
+            if despacho == THREADS:
+                wait(resultado)
+    return time.perf_counter() - inicio
+
+
+def medir_desvincular(registro, observadores):
+    for observador in observadores:
+        registro.vincular(observador)
+    # Moderadores saem em ordem qualquer, não na ordem em que entraram.
+    ordem = random.Random(1).sample(observadores, len(observadores))
+    inicio = time.perf_counter()
+    for observador in ordem:
+        registro.desvincular(observador)
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    eventos = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    observadores = [Nulo() for _ in range(quantidade)]
+
+    for despacho in (SINCRONO, THREADS, ASYNCIO):
+        for nome, filtro in (("sem filtro", None), ("filtro 10%", lambda evento: False)):
+            duracao = medir_despacho(despacho, observadores, eventos, filtro)
+            print(f"{despacho:>8} | {nome} | {quantidade * eventos / duracao:>12,.0f} observadores/s | "
+                  f"{duracao / eventos * 1000:6.2f} ms/evento")
+
+    antiga = medir_desvincular(ListaAntiga(), observadores)
+    nova = medir_desvincular(SujeitoObserver(), observadores)
+    print(f"desvincular {quantidade:,}: lista {antiga * 1000:.1f} ms | WeakKeyDictionary {nova * 1000:.1f} ms")
@@ -0,0 +1,44 @@
+import random
+import sys
+import time
+
+from placar import Placar
+from strategy import RankPorAvaliacoes, Usuario
+
+# Uso: python bench_placar.py [usuarios] [atualizacoes]
+# Monta o placar de RankPorAvaliacoes com usuários sem histórico (só os
+# agregados) e aplica um fluxo contínuo de avaliações novas, intercalado com
+# as consultas da página do placar: top 100, posição e vizinhança de um
+# usuário.
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    atualizacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    aleatorio = random.Random(42)
+    placar = Placar(RankPorAvaliacoes(), semente=42)
+
+    usuarios = []
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        usuario = Usuario(f"u{i}", manter_historico=False)
+        for _ in range(aleatorio.randrange(1, 4)):
+            usuario.adicionar_avaliacao(aleatorio.randint(1, 50) / 10)
+        usuarios.append(usuario)
+    placar.carregar(usuarios)
+    print(f"usuarios={quantidade:,} | carga {time.perf_counter() - inicio:.1f} s")
+
+    inicio = time.perf_counter()
+    for _ in range(atualizacoes):
+        aleatorio.choice(usuarios).adicionar_avaliacao(aleatorio.randint(1, 50) / 10)
+    duracao = time.perf_counter() - inicio
+    print(f"atualizações   {atualizacoes / duracao:10,.0f}/s | {duracao / atualizacoes * 1e6:6.1f} µs cada")
+
+    consultas = 20_000
+    for nome, consulta in (("top 100", lambda u: placar.primeiros(100)),
+                           ("posição", placar.posicao),
+                           ("vizinhança ±5", placar.ao_redor)):
+        amostra = [aleatorio.choice(usuarios) for _ in range(consultas)]
+        inicio = time.perf_counter()
+        for usuario in amostra:
+            consulta(usuario)
+        print(f"{nome:<14} {(time.perf_counter() - inicio) / consultas * 1e6:6.1f} µs")
@@ -0,0 +1,74 @@
+import random
+import sys
+import time
+from array import array
+
+import strategy
+from strategy import (
+    ColunasUsuarios, RankComposto, RankPorAvaliacoes, RankPorParticipacao, RankPorTempoNoSistema, Usuario,
+)
+
+# Uso: python bench_rank_lote.py [usuarios] [amostra_por_usuario]
+# Compara calcular_rank() usuário a usuário com calcular_lote() nas colunas.
+# O caminho por usuário roda numa amostra (10 milhões de objetos Usuario com
+# listas não cabem na memória de uma máquina comum) e é extrapolado; o lote
+# roda na base inteira, com NumPy (se instalado) e com o laço em Python. A
+# última linha é a composta das três, normalizada por min-max.
+
+ESTRATEGIAS = (RankPorParticipacao(), RankPorAvaliacoes(), RankPorTempoNoSistema())
+COMPOSTA = RankComposto(zip(ESTRATEGIAS, (0.5, 0.3, 0.2)), "minmax")
+
+
+def colunas_aleatorias(quantidade, aleatorio):
+    qtd_avaliacoes = array("q", (aleatorio.randrange(8) for _ in range(quantidade)))
+    return ColunasUsuarios(
+        (aleatorio.randrange(50) for _ in range(quantidade)),
+        (aleatorio.randrange(10) for _ in range(quantidade)),
+        (aleatorio.random() * 5 * n for n in qtd_avaliacoes),
+        qtd_avaliacoes,
+        (aleatorio.randrange(120) for _ in range(quantidade)),
+    )
+
+
+def usuarios_aleatorios(quantidade, aleatorio):
+    usuarios = []
+    for i in range(quantidade):
+        usuario = Usuario(f"u{i}")
+        usuario.comentarios = ["c"] * aleatorio.randrange(50)
+        usuario.topicos = ["t"] * aleatorio.randrange(10)
+        usuario.avaliacoes = [aleatorio.random() * 5 for _ in range(aleatorio.randrange(8))]
+        usuario.meses_ativo = aleatorio.randrange(120)
+        usuarios.append(usuario)
+    return usuarios
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    amostra = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    aleatorio = random.Random(42)
+    usuarios = usuarios_aleatorios(amostra, aleatorio)
+    colunas = colunas_aleatorias(quantidade, aleatorio)
+    numpy = strategy.np
+
+    print(f"usuarios={quantidade:,} | amostra por usuário={amostra:,} | NumPy {'sim' if numpy else 'não'}")
+    COMPOSTA.ajustar(ColunasUsuarios.de_usuarios(usuarios))
+    for estrategia in ESTRATEGIAS + (COMPOSTA,):
+        inicio = time.perf_counter()
+        for usuario in usuarios:
+            usuario.set_estrategia_rankeamento(estrategia)
+            usuario.calcular_rank()
+        por_usuario = (time.perf_counter() - inicio) / amostra * quantidade
+
+        tempos = []
+        for usar_numpy in ((numpy, None) if numpy else (None,)):
+            strategy.np = usar_numpy
+            inicio = time.perf_counter()
+            estrategia.calcular_lote(colunas)
+            tempos.append(time.perf_counter() - inicio)
+        strategy.np = numpy
+
+        linha = f"{type(estrategia).__name__:<22} | por usuário ~{por_usuario:7.2f} s"
+        if numpy:
+            linha += f" | lote NumPy {tempos[0]:6.3f} s ({por_usuario / tempos[0]:5.0f}x)"
+        linha += f" | lote Python {tempos[-1]:6.2f} s ({por_usuario / tempos[-1]:4.1f}x)"
+        print(linha)
@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+import time
+
+from bench_rank_lote import ESTRATEGIAS, colunas_aleatorias
+from rank_paralelo import RankeadorParalelo
+from strategy import RankComposto
+
+# Uso: python bench_rank_paralelo.py [usuarios] [max_processos]
+# Top 100 de cada estratégia na base inteira com 1, 2, 4, ... processos (até
+# max_processos, por padrão os núcleos da máquina); 1 processo é o modo
+# serial. A primeira chamada de cada rankeador cria o pool e não entra na
+# medida; das duas seguintes fica a melhor.
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    colunas = colunas_aleatorias(quantidade, random.Random(42))
+    composta = RankComposto(zip(ESTRATEGIAS, (0.5, 0.3, 0.2)), "minmax")
+    composta.ajustar(colunas)
+    processos = [1]
+    while processos[-1] * 2 <= maximo:
+        processos.append(processos[-1] * 2)
+    if processos[-1] != maximo:
+        processos.append(maximo)
+
+    print(f"usuarios={quantidade:,} | núcleos={os.cpu_count()}")
+    for estrategia in ESTRATEGIAS + (composta,):
+        linha, serial = f"{type(estrategia).__name__:<22}", None
+        for n in processos:
+            with RankeadorParalelo(processos=n, minimo_paralelo=0) as rankeador:
+                rankeador.ranquear(estrategia, colunas, 100)
+                tempos = []
+                for _ in range(2):
+                    inicio = time.perf_counter()
+                    rankeador.ranquear(estrategia, colunas, 100)
+                    tempos.append(time.perf_counter() - inicio)
+            melhor = min(tempos)
+            serial = serial or melhor
+            linha += f" | {n}p {melhor:6.3f} s ({serial / melhor:4.1f}x)"
+        print(linha)
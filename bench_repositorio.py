@@ -0,0 +1,73 @@
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from eventos import SinkNulo, definir_sink
+from forum_manager import ComunidadeCafeManager
+from repositorio import RepositorioSQLite
+
+# Uso: python bench_repositorio.py [topicos] [postagens_por_topico] [respostas_por_postagem]
+# Cada modo roda num processo separado para que o pico de memória residente
+# (ru_maxrss) de um não contamine o outro.
+
+
+def rss_maximo_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def popular(manager, topicos, postagens, respostas):
+    manager.registrar_usuario("Autor", "autor", "123", "admin")
+    operacoes = 1
+    for t in range(topicos):
+        titulo = f"Tópico {t}"
+        manager.criar_topico(titulo, "autor", "Discussão", "Descrição do tópico")
+        operacoes += 1
+        for _ in range(postagens):
+            postagem = manager.adicionar_postagem(titulo, "autor", "Texto da postagem " * 4)
+            operacoes += 1
+            for _ in range(respostas):
+                manager.responder_postagem_por_id(postagem.id, "autor", "Conteúdo da resposta " * 3)
+                operacoes += 1
+    manager.confirmar()
+    return operacoes
+
+
+def executar_modo(modo, caminho, topicos, postagens, respostas):
+    definir_sink(SinkNulo())
+    manager = ComunidadeCafeManager()
+    if modo != "memoria":
+        manager.usar_repositorio(RepositorioSQLite(caminho))
+
+    if modo == "sqlite-reaberto":
+        inicio = time.perf_counter()
+        for t in random.sample(range(topicos), min(100, topicos)):
+            for postagem in manager.indice_topicos.buscar(f"Tópico {t}").postagens:
+                len(postagem.respostas)
+        duracao = time.perf_counter() - inicio
+        print(f"{modo:>16} | abriu e leu 100 threads em {duracao:.3f}s | pico RSS {rss_maximo_mb():8.1f} MB")
+    else:
+        inicio = time.perf_counter()
+        operacoes = popular(manager, topicos, postagens, respostas)
+        duracao = time.perf_counter() - inicio
+        print(f"{modo:>16} | {operacoes / duracao:>10,.0f} escritas/s | pico RSS {rss_maximo_mb():8.1f} MB")
+    manager.fechar()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--modo":
+        modo, caminho, *tamanhos = sys.argv[2:]
+        executar_modo(modo, caminho, *map(int, tamanhos))
+        sys.exit()
+
+    tamanhos = [int(a) for a in sys.argv[1:4]] or [2_000, 10, 10]
+    tamanhos += [2_000, 10, 10][len(tamanhos):]
+    print(f"tópicos={tamanhos[0]} postagens/tópico={tamanhos[1]} respostas/postagem={tamanhos[2]}")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "forum.db")
+        for modo in ("memoria", "sqlite", "sqlite-reaberto"):
+            subprocess.run([sys.executable, __file__, "--modo", modo, caminho, *map(str, tamanhos)], check=True)
@@ -0,0 +1,51 @@
+import random
+import sys
+import time
+
+from timeline import LinhaDoTempo
+
+# Uso: python bench_timeline.py [usuarios] [publicacoes]
+# Cada usuário segue de 10 a 2000 outros (mais alguns "famosos", seguidos por
+# quase todos e portanto lidos na hora). Mede a vazão de publicação e a latência
+# de uma página de 20 itens por quantidade de usuários seguidos.
+
+
+class Pessoa:
+    __slots__ = ("numero",)
+
+    def __init__(self, numero):
+        self.numero = numero
+
+
+if __name__ == "__main__":
+    total_usuarios = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    publicacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    aleatorio = random.Random(42)
+    pessoas = [Pessoa(i) for i in range(total_usuarios)]
+    famosos = pessoas[:5]
+    linha = LinhaDoTempo(limite_pesado=total_usuarios // 10)
+
+    seguidos = {}
+    for pessoa in pessoas:
+        quantidade = aleatorio.choice((10, 100, 2000))
+        seguidos[pessoa] = quantidade
+        for seguido in aleatorio.sample(pessoas, quantidade):
+            linha.seguir(pessoa, seguido)
+        for famoso in famosos:
+            linha.seguir(pessoa, famoso)
+
+    inicio = time.perf_counter()
+    for i in range(publicacoes):
+        autor = famosos[i % 5] if i % 100 == 0 else pessoas[aleatorio.randrange(total_usuarios)]
+        linha.distribuir(i, (autor,), autor)
+    duracao = time.perf_counter() - inicio
+    print(f"usuarios={total_usuarios:,} | {publicacoes / duracao:,.0f} publicações/s")
+
+    for quantidade in (10, 100, 2000):
+        leitores = [p for p in pessoas if seguidos[p] == quantidade][:500]
+        inicio = time.perf_counter()
+        for leitor in leitores:
+            itens, antes = linha.pagina(leitor, 20)
+            linha.pagina(leitor, 20, antes)
+        latencia = (time.perf_counter() - inicio) / (2 * len(leitores)) * 1e6
+        print(f"seguindo {quantidade:>5} | {latencia:6.1f} µs/página de 20")
@@ -0,0 +1,217 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# === Tokenização ===
+# Acentos são removidos por uma tabela de tradução montada uma única vez, bem
+# mais barata que normalizar cada texto com NFKD: "Café" e "cafe" viram "cafe".
+_TABELA_ACENTOS = {}
+for _codigo in range(0xC0, 0x250):
+    _base = unicodedata.normalize("NFKD", chr(_codigo))[0]
+    if _base != chr(_codigo) and _base.isascii():
+        _TABELA_ACENTOS[_codigo] = _base
+_TABELA_ACENTOS[ord("ß")] = "ss"
+
+_PALAVRA = re.compile(r"\w+")
+
+PALAVRAS_VAZIAS = frozenset("""
+a ao aos as com da das de do dos e em na nas no nos num numa o os ou para pela pelas
+pelo pelos por que se sem um uma umas uns
+""".split())
+
+
+def normalizar(texto):
+    return texto.casefold().translate(_TABELA_ACENTOS)
+
+
+def tokenizar(texto):
+    return [t for t in _PALAVRA.findall(normalizar(texto)) if t not in PALAVRAS_VAZIAS]
+
+
+# === Índice invertido ===
+TOPICO, POSTAGEM, RESPOSTA = "topico", "postagem", "resposta"
+_CODIGOS = {TOPICO: 0, POSTAGEM: 1, RESPOSTA: 2}
+_TIPOS = (TOPICO, POSTAGEM, RESPOSTA)
+
+
+class Campeoes:
+    # Heap de (peso, documento) com os de maior peso de um termo. `pesos`
+    # guarda só as entradas válidas: documentos removidos (ou reindexados)
+    # saem de `pesos` na hora e a entrada antiga fica no heap como obsoleta,
+    # até ser despejada ou até o heap ser refeito.
+    __slots__ = ("heap", "pesos", "obsoletos")
+
+    def __init__(self, itens):
+        self.heap = list(itens)
+        heapq.heapify(self.heap)
+        self.pesos = {documento: peso for peso, documento in self.heap}
+        self.obsoletos = 0
+
+    def oferecer(self, peso, documento, capacidade):
+        heap = self.heap
+        if len(heap) < capacidade:
+            heapq.heappush(heap, (peso, documento))
+        elif (peso, documento) > heap[0]:
+            peso_saiu, saiu = heapq.heapreplace(heap, (peso, documento))
+            if self.pesos.get(saiu) == peso_saiu:
+                del self.pesos[saiu]
+            else:
+                self.obsoletos -= 1
+        else:
+            return
+        self.pesos[documento] = peso
+
+    def descartar(self, documento):
+        if self.pesos.pop(documento, None) is not None:
+            self.obsoletos += 1
+
+
+class IndiceTextual:
+    # Postings por termo num dict {documento: frequência}, com o documento
+    # codificado num int (id << 2 | tipo) para caber em pouca memória. A
+    # pontuação é BM25 e o top-k usa MaxScore: termos raros são percorridos
+    # primeiro e, quando nem a soma dos termos restantes alcança o k-ésimo
+    # melhor resultado, os termos comuns só completam a nota dos candidatos já
+    # encontrados, sem varrer as listas inteiras.
+    #
+    # Termos presentes em mais de `limite_varredura` documentos mantêm também
+    # uma lista de campeões: um heap com os `campeoes` documentos de maior peso
+    # BM25 para o termo. Quando uma consulta precisaria varrer uma lista dessas,
+    # só os campeões (e os candidatos já encontrados) são pontuados. Documentos
+    # removidos saem dos campeões na hora; quando as entradas obsoletas passam
+    # de um quarto do heap, ele é refeito a partir da lista do termo. Consultas
+    # com algum termo menos comum continuam exatas; as formadas só por termos
+    # muito comuns viram uma aproximação, em troca de latência constante.
+    def __init__(self, k1: float = 1.2, b: float = 0.75, limite_varredura: int = 20_000, campeoes: int = 1_000):
+        self.k1 = k1
+        self.b = b
+        self.limite_varredura = limite_varredura
+        self.campeoes = campeoes
+        self._postings = {}
+        self._campeoes = {}
+        self._comprimentos = {}
+        self._total_termos = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._comprimentos)
+
+    def indexar(self, tipo, id_documento, texto):
+        documento = id_documento << 2 | _CODIGOS[tipo]
+        termos = tokenizar(texto)
+        with self._trava:
+            postings = self._postings
+            self._comprimentos[documento] = len(termos)
+            self._total_termos += len(termos)
+            for termo, frequencia in Counter(termos).items():
+                lista = postings.get(termo)
+                if lista is None:
+                    lista = postings[termo] = {}
+                lista[documento] = frequencia
+                if len(lista) > self.limite_varredura:
+                    self._atualizar_campeoes(termo, lista, documento, frequencia)
+
+    def remover(self, tipo, id_documento, texto):
+        # O texto indexado é informado por quem remove, para não manter uma
+        # cópia dos termos de cada documento só para isso.
+        documento = id_documento << 2 | _CODIGOS[tipo]
+        with self._trava:
+            comprimento = self._comprimentos.pop(documento, None)
+            if comprimento is None:
+                return
+            self._total_termos -= comprimento
+            for termo in set(tokenizar(texto)):
+                lista = self._postings.get(termo)
+                if lista is not None:
+                    lista.pop(documento, None)
+                    if not lista:
+                        del self._postings[termo]
+                    if len(lista) <= self.limite_varredura:
+                        self._campeoes.pop(termo, None)
+                        continue
+                    campeoes = self._campeoes.get(termo)
+                    if campeoes is not None:
+                        campeoes.descartar(documento)
+                        if campeoes.obsoletos > self.campeoes // 4:
+                            self._campeoes[termo] = self._montar_campeoes(lista)
+
+    def _peso(self, frequencia, comprimento, media):
+        normal = self.k1 * (1 - self.b + self.b * comprimento / media)
+        return frequencia * (self.k1 + 1) / (frequencia + normal)
+
+    def _montar_campeoes(self, lista):
+        media = self._total_termos / len(self._comprimentos)
+        comprimentos = self._comprimentos
+        pesos = ((self._peso(f, comprimentos[d], media), d) for d, f in lista.items())
+        return Campeoes(heapq.nlargest(self.campeoes, pesos))
+
+    def _atualizar_campeoes(self, termo, lista, documento, frequencia):
+        # Os pesos usam o comprimento médio do momento da inserção; a média
+        # muda devagar, e a nota final é sempre recalculada na consulta.
+        campeoes = self._campeoes.get(termo)
+        if campeoes is None:
+            self._campeoes[termo] = self._montar_campeoes(lista)
+            return
+        media = self._total_termos / len(self._comprimentos)
+        campeoes.oferecer(self._peso(frequencia, self._comprimentos[documento], media), documento, self.campeoes)
+
+    def reindexar(self, tipo, id_documento, texto_anterior, texto_novo):
+        self.remover(tipo, id_documento, texto_anterior)
+        self.indexar(tipo, id_documento, texto_novo)
+
+    def buscar(self, consulta, limite=10, tipos=None):
+        # Devolve [(pontuação, tipo, id)] do mais relevante para o menos.
+        codigos = None if tipos is None else {_CODIGOS[t] for t in tipos}
+        with self._trava:
+            total_documentos = len(self._comprimentos)
+            if not total_documentos:
+                return []
+            media = self._total_termos / total_documentos or 1.0
+            k1, b, comprimentos = self.k1, self.b, self._comprimentos
+
+            termos = []
+            for termo in set(tokenizar(consulta)):
+                lista = self._postings.get(termo)
+                if lista:
+                    idf = math.log(1 + (total_documentos - len(lista) + 0.5) / (len(lista) + 0.5))
+                    termos.append((idf * (k1 + 1), idf, lista, self._campeoes.get(termo)))
+            termos.sort(key=lambda t: t[0], reverse=True)
+            restante = sum(t[0] for t in termos)
+
+            notas = {}
+            for teto, idf, lista, campeoes in termos:
+                limiar = heapq.nlargest(limite, notas.values())[-1] if len(notas) >= limite else 0.0
+                if limiar >= restante:
+                    itens = ((d, lista[d]) for d in notas if d in lista)
+                elif campeoes is not None:
+                    candidatos = set(notas)
+                    candidatos.update(campeoes.pesos)
+                    itens = ((d, lista[d]) for d in candidatos if d in lista)
+                else:
+                    itens = lista.items()
+                for documento, frequencia in itens:
+                    if codigos is not None and documento & 3 not in codigos:
+                        continue
+                    normal = k1 * (1 - b + b * comprimentos[documento] / media)
+                    notas[documento] = notas.get(documento, 0.0) + idf * frequencia * (k1 + 1) / (frequencia + normal)
+                restante -= teto
+
+            melhores = heapq.nlargest(limite, notas.items(), key=lambda item: item[1])
+        return [(nota, _TIPOS[documento & 3], documento >> 2) for documento, nota in melhores]
+
+
+class ResultadoBusca:
+    def __init__(self, tipo, objeto, pontuacao):
+        self.tipo = tipo
+        self.objeto = objeto
+        self.pontuacao = pontuacao
+
+    def __repr__(self):
+        return f'ResultadoBusca({self.tipo} #{self.objeto.id}, {self.pontuacao:.3f})'
+
+
+def texto_topico(topico):
+    return f"{topico.titulo}\n{topico.descricao or ''}"
@@ -0,0 +1,235 @@
+import threading
+from array import array
+from bisect import bisect_left
+
+# === Conjunto compacto de inteiros ===
+# Enquanto pequeno, o conjunto é um array('I') ordenado (4 bytes por valor).
+# Passando de _LIMITE_ARRAY valores, vira um conjunto no estilo roaring: os 16
+# bits altos escolhem um contêiner e os 16 baixos ficam num array('H') ordenado
+# (2 bytes por valor) ou, em contêineres densos, num bitmap de 8 KiB (1 bit por
+# valor possível).
+_LIMITE_ARRAY = 4096
+_BYTES_BITMAP = 8192
+
+
+def _para_bitmap(baixos):
+    bitmap = bytearray(_BYTES_BITMAP)
+    for baixo in baixos:
+        bitmap[baixo >> 3] |= 1 << (baixo & 7)
+    return bitmap
+
+
+def _valores_do_bitmap(bitmap):
+    for indice, byte in enumerate(bitmap):
+        while byte:
+            bit = byte & -byte
+            yield indice << 3 | (bit.bit_length() - 1)
+            byte ^= bit
+
+
+def _contem_no_conteiner(conteiner, baixo):
+    if type(conteiner) is bytearray:
+        return bool(conteiner[baixo >> 3] & (1 << (baixo & 7)))
+    i = bisect_left(conteiner, baixo)
+    return i < len(conteiner) and conteiner[i] == baixo
+
+
+class ConjuntoCompacto:
+    __slots__ = ("_valores", "_conteineres", "_tamanho")
+
+    def __init__(self, valores=()):
+        self._valores = array("I")
+        self._conteineres = None
+        self._tamanho = 0
+        for valor in valores:
+            self.adicionar(valor)
+
+    def __len__(self):
+        return self._tamanho
+
+    def __contains__(self, valor):
+        if self._conteineres is None:
+            valores = self._valores
+            i = bisect_left(valores, valor)
+            return i < len(valores) and valores[i] == valor
+        conteiner = self._conteineres.get(valor >> 16)
+        return conteiner is not None and _contem_no_conteiner(conteiner, valor & 0xFFFF)
+
+    def __iter__(self):
+        if self._conteineres is None:
+            yield from self._valores
+            return
+        for alto in sorted(self._conteineres):
+            conteiner = self._conteineres[alto]
+            baixos = _valores_do_bitmap(conteiner) if type(conteiner) is bytearray else conteiner
+            for baixo in baixos:
+                yield alto << 16 | baixo
+
+    def adicionar(self, valor):
+        if self._conteineres is None:
+            valores = self._valores
+            i = bisect_left(valores, valor)
+            if i < len(valores) and valores[i] == valor:
+                return False
+            valores.insert(i, valor)
+            self._tamanho += 1
+            if self._tamanho > _LIMITE_ARRAY:
+                self._promover()
+            return True
+
+        alto, baixo = valor >> 16, valor & 0xFFFF
+        conteiner = self._conteineres.get(alto)
+        if conteiner is None:
+            self._conteineres[alto] = array("H", (baixo,))
+        elif type(conteiner) is bytearray:
+            mascara = 1 << (baixo & 7)
+            if conteiner[baixo >> 3] & mascara:
+                return False
+            conteiner[baixo >> 3] |= mascara
+        else:
+            i = bisect_left(conteiner, baixo)
+            if i < len(conteiner) and conteiner[i] == baixo:
+                return False
+            conteiner.insert(i, baixo)
+            if len(conteiner) > _LIMITE_ARRAY:
+                self._conteineres[alto] = _para_bitmap(conteiner)
+        self._tamanho += 1
+        return True
+
+    def remover(self, valor):
+        # Bitmaps que esvaziam parcialmente não voltam a ser arrays: a remoção
+        # (descurtir) é rara perto da inserção.
+        if self._conteineres is None:
+            valores = self._valores
+            i = bisect_left(valores, valor)
+            if i == len(valores) or valores[i] != valor:
+                return False
+            del valores[i]
+            self._tamanho -= 1
+            return True
+
+        alto, baixo = valor >> 16, valor & 0xFFFF
+        conteiner = self._conteineres.get(alto)
+        if conteiner is None or not _contem_no_conteiner(conteiner, baixo):
+            return False
+        if type(conteiner) is bytearray:
+            conteiner[baixo >> 3] &= ~(1 << (baixo & 7)) & 0xFF
+        else:
+            del conteiner[bisect_left(conteiner, baixo)]
+            if not conteiner:
+                del self._conteineres[alto]
+        self._tamanho -= 1
+        return True
+
+    def _promover(self):
+        conteineres = {}
+        for valor in self._valores:
+            conteineres.setdefault(valor >> 16, array("H")).append(valor & 0xFFFF)
+        for alto, baixos in conteineres.items():
+            if len(baixos) > _LIMITE_ARRAY:
+                conteineres[alto] = _para_bitmap(baixos)
+        self._conteineres = conteineres
+        self._valores = None
+
+    def tamanho_em_bytes(self):
+        if self._conteineres is None:
+            return self._valores.itemsize * len(self._valores)
+        return sum(len(c) if type(c) is bytearray else c.itemsize * len(c) for c in self._conteineres.values())
+
+
+# === Registro de curtidas ===
+def _numeros_em(valor):
+    return (valor,) if type(valor) is int else valor
+
+
+class RegistroCurtidas:
+    # Quem curtiu o quê, indexado pelo id da resposta. Os usuários viram
+    # inteiros pequenos e densos (dados na primeira curtida), e cada resposta
+    # guarda os números de quem a curtiu: o próprio número quando é um só (a
+    # maioria das respostas tem um like ou nenhum), um ConjuntoCompacto a partir
+    # do segundo.
+    def __init__(self):
+        self._numeros = {}
+        self._nomes = []
+        self._por_resposta = {}
+        self._total = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return self._total
+
+    def _numero(self, nome_usuario):
+        numero = self._numeros.get(nome_usuario)
+        if numero is None:
+            numero = self._numeros[nome_usuario] = len(self._nomes)
+            self._nomes.append(nome_usuario)
+        return numero
+
+    def adicionar(self, nome_usuario, id_resposta):
+        with self._trava:
+            numero = self._numero(nome_usuario)
+            atual = self._por_resposta.get(id_resposta)
+            if atual is None:
+                self._por_resposta[id_resposta] = numero
+            elif type(atual) is int:
+                if atual == numero:
+                    return False
+                self._por_resposta[id_resposta] = ConjuntoCompacto((atual, numero))
+            elif not atual.adicionar(numero):
+                return False
+            self._total += 1
+            return True
+
+    def remover(self, nome_usuario, id_resposta):
+        with self._trava:
+            numero = self._numeros.get(nome_usuario)
+            atual = self._por_resposta.get(id_resposta)
+            if numero is None or atual is None:
+                return False
+            if type(atual) is int:
+                if atual != numero:
+                    return False
+                del self._por_resposta[id_resposta]
+            else:
+                if not atual.remover(numero):
+                    return False
+                if len(atual) == 1:
+                    self._por_resposta[id_resposta] = next(iter(atual))
+            self._total -= 1
+            return True
+
+    def remover_resposta(self, id_resposta):
+        with self._trava:
+            atual = self._por_resposta.pop(id_resposta, None)
+            if atual is not None:
+                self._total -= len(_numeros_em(atual))
+
+    def curtiu(self, nome_usuario, id_resposta):
+        return self.curtidas_em(nome_usuario, (id_resposta,))[0]
+
+    def curtidas_em(self, nome_usuario, ids_respostas):
+        # Uma página inteira de uma vez: [True/False] na ordem dos ids.
+        numero = self._numeros.get(nome_usuario)
+        if numero is None:
+            return [False] * len(ids_respostas)
+        obter = self._por_resposta.get
+        resultado = []
+        for id_resposta in ids_respostas:
+            atual = obter(id_resposta)
+            resultado.append(atual == numero if type(atual) is int else atual is not None and numero in atual)
+        return resultado
+
+    def usuarios_que_curtiram(self, id_resposta):
+        atual = self._por_resposta.get(id_resposta)
+        return [self._nomes[numero] for numero in _numeros_em(atual)] if atual is not None else []
+
+    def itens(self):
+        # (id_resposta, [nomes de usuário]) de todas as respostas curtidas.
+        with self._trava:
+            por_resposta = list(self._por_resposta.items())
+        nomes = self._nomes
+        for id_resposta, atual in por_resposta:
+            yield id_resposta, [nomes[numero] for numero in _numeros_em(atual)]
+
+    def tamanho_em_bytes(self):
+        return sum(4 if type(atual) is int else atual.tamanho_em_bytes() for atual in self._por_resposta.values())
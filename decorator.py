@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+from eventos import AcaoPapel, publicar
+
 
 # === Interface IUsuario ===
 class IUsuario(ABC):
@@ -11,7 +13,7 @@ class IUsuario(ABC):
 # === Decorator: Usuário Convidado ===
 class UsuarioConvidado(IUsuario):
     def acesso_topico(self) -> bool:
-        print("Convidado: acesso somente leitura.")
+        publicar(AcaoPapel("Convidado", "acesso_topico"))
         return True
 
 # === Decorator: Usuário Logado ===
@@ -25,13 +27,13 @@ class UsuarioLogado(IUsuario):
         return self.componente.acesso_topico()
 
     def comentar(self):
-        print("Comentário realizado.")
+        publicar(AcaoPapel("UsuarioLogado", "comentar"))
 
     def excluir_comentario(self, comentario: str):
-        print(f"Comentário '{comentario}' excluído.")
+        publicar(AcaoPapel("UsuarioLogado", "excluir_comentario", comentario))
 
     def visualizar_links(self):
-        print("Links visíveis para o usuário.")
+        publicar(AcaoPapel("UsuarioLogado", "visualizar_links"))
 
 # === Decorator: Lojista ===
 class Lojista(IUsuario):
@@ -41,7 +43,7 @@ class Lojista(IUsuario):
 
     def criar_estabelecimento(self, nome: str):
         self.estabelecimento = nome
-        print(f"Estabelecimento '{nome}' criado.")
+        publicar(AcaoPapel("Lojista", "criar_estabelecimento", nome))
         return self.estabelecimento
 
     def acesso_topico(self) -> bool:
@@ -63,13 +65,13 @@ class Moderador(IUsuario):
         self.id_moderador = id_moderador
 
     def aprovar_topico(self, topico: str):
-        print(f"Tópico '{topico}' aprovado.")
+        publicar(AcaoPapel("Moderador", "aprovar_topico", topico))
 
     def remover_postagem(self, postagem: str):
-        print(f"Postagem '{postagem}' removida.")
+        publicar(AcaoPapel("Moderador", "remover_postagem", postagem))
 
     def remover_permissoes(self, usuario: IUsuario, permissao: str):
-        print(f"Permissão '{permissao}' removida do usuário.")
+        publicar(AcaoPapel("Moderador", "remover_permissoes", permissao))
 
     def acesso_topico(self) -> bool:
         return self.componente.acesso_topico()
@@ -90,16 +92,16 @@ class Administrador(IUsuario):
         self.id_adm = id_adm
 
     def aprovar_topico(self, topico: str):
-        print(f"Administrador aprovou o tópico: {topico}")
+        publicar(AcaoPapel("Administrador", "aprovar_topico", topico))
 
     def remover_postagem(self, postagem: str):
-        print(f"Administrador removeu a postagem: {postagem}")
+        publicar(AcaoPapel("Administrador", "remover_postagem", postagem))
 
     def conceder_permissoes(self, usuario: IUsuario, permissao: str):
-        print(f"Permissão '{permissao}' concedida ao usuário.")
+        publicar(AcaoPapel("Administrador", "conceder_permissoes", permissao))
 
     def remover_permissoes(self, usuario: IUsuario, permissao: str):
-        print(f"Permissão '{permissao}' removida do usuário.")
+        publicar(AcaoPapel("Administrador", "remover_permissoes", permissao))
 
     def acesso_topico(self) -> bool:
         return self.componente.acesso_topico()
@@ -0,0 +1,200 @@
+import threading
+import time
+from array import array
+
+# === Contadores de denúncias em janela deslizante ===
+# O tempo é dividido em fatias de `janela / baldes` segundos. ContadorJanela é
+# um anel de `baldes` inteiros em que cada denúncia soma no balde da fatia
+# atual; ao avançar, os baldes que saíram da janela são zerados e descontados
+# do total, então somar e consultar custam no máximo `baldes` passos, sem
+# guardar nada por denúncia. É o contador por denunciante e o das denúncias
+# anônimas de cada conteúdo. As denúncias identificadas de um conteúdo
+# (DenunciasConteudo) guardam o balde de cada denunciante distinto, para que
+# cada um conte uma vez: a memória cresce com os denunciantes na janela, não
+# com as denúncias. A janela efetiva fica entre `janela - janela / baldes` e
+# `janela`.
+ACEITA, OCULTADA, LIMITADA, REPETIDA = "aceita", "ocultada", "limitada", "repetida"
+
+MSG_DENUNCIAS_EXCEDIDAS = "Limite de denúncias atingido; tente mais tarde."
+
+
+class ContadorJanela:
+    __slots__ = ("_baldes", "_atual", "_total")
+
+    def __init__(self, baldes: int):
+        self._baldes = array("I", bytes(4 * baldes))
+        self._atual = None
+        self._total = 0
+
+    def _avancar(self, balde):
+        if self._atual is None:
+            self._atual = balde
+            return
+        passos = balde - self._atual
+        if passos <= 0:
+            return
+        baldes = self._baldes
+        if passos >= len(baldes):
+            for i in range(len(baldes)):
+                baldes[i] = 0
+            self._total = 0
+        else:
+            for i in range(self._atual + 1, balde + 1):
+                j = i % len(baldes)
+                self._total -= baldes[j]
+                baldes[j] = 0
+        self._atual = balde
+
+    def somar(self, balde, quantidade=1):
+        self._avancar(balde)
+        self._baldes[balde % len(self._baldes)] += quantidade
+        self._total += quantidade
+        return self._total
+
+    def total(self, balde):
+        self._avancar(balde)
+        return self._total
+
+
+class DenunciasConteudo:
+    # Denúncias de um conteúdo: denunciantes distintos (denunciante -> balde da
+    # denúncia, em ordem de chegada) mais as denúncias anônimas. Cada
+    # denunciante conta uma vez por janela; os que saem da janela estão sempre
+    # no começo do dicionário, então expirar custa O(1) amortizado.
+    __slots__ = ("denunciantes", "anonimas", "_baldes")
+
+    def __init__(self, baldes: int):
+        self.denunciantes = {}
+        self.anonimas = ContadorJanela(baldes)
+        self._baldes = baldes
+
+    def _expirar(self, balde):
+        denunciantes = self.denunciantes
+        while denunciantes:
+            denunciante = next(iter(denunciantes))
+            if balde - denunciantes[denunciante] < self._baldes:
+                break
+            del denunciantes[denunciante]
+
+    def somar(self, balde, denunciante=None):
+        # False se o denunciante já denunciou este conteúdo dentro da janela.
+        if denunciante is None:
+            self.anonimas.somar(balde)
+            return True
+        self._expirar(balde)
+        if denunciante in self.denunciantes:
+            return False
+        self.denunciantes[denunciante] = balde
+        return True
+
+    def total(self, balde):
+        self._expirar(balde)
+        return len(self.denunciantes) + self.anonimas.total(balde)
+
+
+class RegistroDenuncias:
+    # Conta denúncias por conteúdo e por denunciante. O conteúdo denunciado
+    # por `limite_ocultar` denunciantes distintos dentro de `janela_conteudo`
+    # é ocultado (denúncias repetidas de quem já denunciou o mesmo conteúdo na
+    # janela voltam REPETIDA e não contam; anônimas contam uma a uma); quem
+    # denuncia mais de `limite_denunciante` vezes em `janela_denunciante` tem
+    # as denúncias seguintes recusadas (e não contadas) até a janela andar.
+    # Contadores que esvaziam são descartados numa varredura que só roda
+    # quando o número de contadores dobra, mantendo o custo amortizado O(1).
+    # A marca de oculto fica até reexibir() ou esquecer(); quem remove
+    # conteúdo chama esquecer() para não deixá-la para trás.
+    def __init__(self, limite_ocultar: int = 5, janela_conteudo: float = 24 * 3600,
+                 limite_denunciante: int = 20, janela_denunciante: float = 3600, baldes: int = 12,
+                 relogio=time.monotonic):
+        self.limite_ocultar = limite_ocultar
+        self.limite_denunciante = limite_denunciante
+        self.baldes = baldes
+        self.relogio = relogio
+        self._largura_conteudo = janela_conteudo / baldes
+        self._largura_denunciante = janela_denunciante / baldes
+        self._por_conteudo = {}
+        self._por_denunciante = {}
+        self._ocultos = set()
+        self._proxima_limpeza = 1024
+        self._trava = threading.Lock()
+
+    def _baldes_atuais(self):
+        agora = self.relogio()
+        return int(agora // self._largura_conteudo), int(agora // self._largura_denunciante)
+
+    def registrar(self, chave, denunciante=None):
+        # ACEITA, OCULTADA (esta denúncia atingiu o limite), REPETIDA ou
+        # LIMITADA.
+        with self._trava:
+            balde_conteudo, balde_denunciante = self._baldes_atuais()
+            if denunciante is not None:
+                contador = self._por_denunciante.get(denunciante)
+                if contador is None:
+                    contador = self._por_denunciante[denunciante] = ContadorJanela(self.baldes)
+                if contador.total(balde_denunciante) >= self.limite_denunciante:
+                    return LIMITADA
+                contador.somar(balde_denunciante)
+
+            contador = self._por_conteudo.get(chave)
+            if contador is None:
+                contador = self._por_conteudo[chave] = DenunciasConteudo(self.baldes)
+            if not contador.somar(balde_conteudo, denunciante):
+                return REPETIDA
+            total = contador.total(balde_conteudo)
+
+            if len(self._por_conteudo) + len(self._por_denunciante) > self._proxima_limpeza:
+                self._limpar(balde_conteudo, balde_denunciante)
+            if total >= self.limite_ocultar and chave not in self._ocultos:
+                self._ocultos.add(chave)
+                return OCULTADA
+            return ACEITA
+
+    def _limpar(self, balde_conteudo, balde_denunciante):
+        for contadores, balde in ((self._por_conteudo, balde_conteudo),
+                                  (self._por_denunciante, balde_denunciante)):
+            vazios = [chave for chave, contador in contadores.items() if not contador.total(balde)]
+            for chave in vazios:
+                del contadores[chave]
+        self._proxima_limpeza = max(1024, 2 * (len(self._por_conteudo) + len(self._por_denunciante)))
+
+    def denuncias(self, chave):
+        with self._trava:
+            contador = self._por_conteudo.get(chave)
+            return contador.total(self._baldes_atuais()[0]) if contador is not None else 0
+
+    def denuncias_de(self, denunciante):
+        with self._trava:
+            contador = self._por_denunciante.get(denunciante)
+            return contador.total(self._baldes_atuais()[1]) if contador is not None else 0
+
+    def oculto(self, chave):
+        return chave in self._ocultos
+
+    def reexibir(self, chave):
+        # Decisão de moderação: o conteúdo volta e a contagem recomeça.
+        with self._trava:
+            self._ocultos.discard(chave)
+            self._por_conteudo.pop(chave, None)
+
+    def esquecer(self, chave):
+        # Conteúdo removido: sai dos ocultos e dos contadores.
+        self.reexibir(chave)
+
+
+_registro = None
+_trava_registro = threading.Lock()
+
+
+def registro_denuncias():
+    global _registro
+    if _registro is None:
+        with _trava_registro:
+            if _registro is None:
+                _registro = RegistroDenuncias()
+    return _registro
+
+
+def definir_registro_denuncias(registro):
+    global _registro
+    anterior, _registro = _registro, registro
+    return anterior
@@ -0,0 +1,574 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+
+from repositorio import Repositorio
+
+# Formato binário compartilhado por diário e snapshot: cada campo é uma tag de
+# 1 byte seguida do valor ('i' = int64, 's' = uint32 + UTF-8, 'n' = None).
+_INT = struct.Struct("<q")
+_TAMANHO = struct.Struct("<I")
+_MOLDURA = struct.Struct("<II")  # tamanho do registro + CRC32
+_CABECALHO_DIARIO = struct.Struct("<8sQ")
+_RODAPE = struct.Struct("<14Q8s")
+_RODAPE_V1 = struct.Struct("<12Q8s")
+_ID_PAI = struct.Struct("<Q")
+
+MAGICO_DIARIO = b"CAFEJRN1"
+MAGICO_SNAPSHOT = b"CAFESNP3"
+MAGICO_SNAPSHOT_V2 = b"CAFESNP2"  # sem a próxima posição de cada lista; ainda é lido
+MAGICO_SNAPSHOT_V1 = b"CAFESNP1"  # sem a seção de curtidas; ainda é lido
+
+OP_USUARIO = 1
+OP_TOPICO = 2
+OP_RENOMEAR_TOPICO = 3
+OP_REMOVER_TOPICO = 4
+OP_POSTAGEM = 5
+OP_ATUALIZAR_POSTAGEM = 6
+OP_REMOVER_POSTAGEM = 7
+OP_RESPOSTA = 8
+OP_LIKES = 9
+OP_REMOVER_RESPOSTA = 10
+OP_CURTIDA = 11
+OP_DESCURTIDA = 12
+
+
+def _codificar(campos):
+    partes = []
+    for valor in campos:
+        if valor is None:
+            partes.append(b"n")
+        elif isinstance(valor, int):
+            partes.append(b"i" + _INT.pack(valor))
+        else:
+            dados = str(valor).encode("utf-8")
+            partes.append(b"s" + _TAMANHO.pack(len(dados)) + dados)
+    return b"".join(partes)
+
+
+def _decodificar(buffer, pos, quantidade):
+    valores = []
+    for _ in range(quantidade):
+        tag = buffer[pos]
+        pos += 1
+        if tag == 0x69:  # 'i'
+            valores.append(_INT.unpack_from(buffer, pos)[0])
+            pos += 8
+        elif tag == 0x73:  # 's'
+            tamanho = _TAMANHO.unpack_from(buffer, pos)[0]
+            pos += 4
+            valores.append(bytes(buffer[pos:pos + tamanho]).decode("utf-8"))
+            pos += tamanho
+        else:
+            valores.append(None)
+    return valores, pos
+
+
+_CAMPOS_POR_OP = {
+    OP_USUARIO: 4, OP_TOPICO: 5, OP_RENOMEAR_TOPICO: 2, OP_REMOVER_TOPICO: 1, OP_POSTAGEM: 5,
+    OP_ATUALIZAR_POSTAGEM: 2, OP_REMOVER_POSTAGEM: 1, OP_RESPOSTA: 6, OP_LIKES: 2, OP_REMOVER_RESPOSTA: 1,
+    OP_CURTIDA: 2, OP_DESCURTIDA: 2,
+}
+
+
+class RepositorioDiario(Repositorio):
+    # Durabilidade barata para o manager em memória: toda mutação vira um
+    # registro no diário (só acréscimo) e, de tempos em tempos, o estado inteiro
+    # é compactado num snapshot. Na partida o snapshot é mapeado com mmap e só
+    # usuários e cabeçalhos de tópicos são lidos; as threads são decodificadas do
+    # mapa quando acessadas, e o diário é reaplicado por cima como sobreposição.
+    carregamento_preguicoso = True
+
+    def __init__(self, pasta: str, limite_diario: int = 64 * 1024 * 1024, tamanho_lote: int = 1000):
+        self.pasta = pasta
+        self.limite_diario = limite_diario
+        self.tamanho_lote = tamanho_lote
+        self.caminho_snapshot = os.path.join(pasta, "snapshot.bin")
+        self.caminho_diario = os.path.join(pasta, "diario.bin")
+        self._trava = threading.RLock()
+        self._manager = None
+        self._nao_confirmados = 0
+        self._gravando_snapshot = False
+        os.makedirs(pasta, exist_ok=True)
+
+        self._abrir_snapshot()
+        self._reaplicar_diario()
+
+    # --- partida ---
+    def _abrir_snapshot(self):
+        self._mapa = None
+        self._arquivo_snapshot = None
+        self.geracao = 0
+        self._ids = [0, 0, 0]
+        self._usuarios = []
+        self._nomes_usuarios = set()
+        self._topicos = {}
+        self._blocos_postagens = {}
+        self._blocos_respostas = {}
+        self._indice_postagens = (0, 0)
+        self._indice_respostas = (0, 0)
+        self._bloco_curtidas = (0, 0)
+        self._nomes_snapshot = []
+        # Próxima posição de cada lista (postagens por tópico, respostas por
+        # postagem), para que posições removidas no fim não sejam reusadas.
+        self._proximas_postagens = {}
+        self._proximas_respostas = {}
+        self._campos_topico, self._campos_postagem = 8, 7
+        self._zerar_sobreposicao()
+        if not os.path.exists(self.caminho_snapshot):
+            return
+
+        self._arquivo_snapshot = open(self.caminho_snapshot, "rb")
+        self._mapa = mmap.mmap(self._arquivo_snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        magico = self._mapa[-8:]
+        if magico in (MAGICO_SNAPSHOT, MAGICO_SNAPSHOT_V2):
+            (self.geracao, off_topicos, n_topicos, off_usuarios, n_usuarios, off_idx_p, n_idx_p,
+             off_idx_r, n_idx_r, off_curtidas, n_curtidas, *ids, _) = _RODAPE.unpack_from(
+                self._mapa, len(self._mapa) - _RODAPE.size)
+            self._bloco_curtidas = (off_curtidas, n_curtidas)
+        elif magico == MAGICO_SNAPSHOT_V1:
+            (self.geracao, off_topicos, n_topicos, off_usuarios, n_usuarios, off_idx_p, n_idx_p,
+             off_idx_r, n_idx_r, *ids, _) = _RODAPE_V1.unpack_from(self._mapa, len(self._mapa) - _RODAPE_V1.size)
+        else:
+            raise ValueError(f"Snapshot inválido: {self.caminho_snapshot}")
+        if magico != MAGICO_SNAPSHOT:
+            # Versões antigas não guardam a próxima posição; a maior posição
+            # ainda presente é o melhor que se tem.
+            self._campos_topico, self._campos_postagem = 7, 6
+        self._ids = list(ids)
+        self._indice_postagens = (off_idx_p, n_idx_p)
+        self._indice_respostas = (off_idx_r, n_idx_r)
+
+        pos = off_usuarios
+        for _ in range(n_usuarios):
+            linha, pos = _decodificar(self._mapa, pos, 4)
+            self._usuarios.append(tuple(linha))
+            self._nomes_usuarios.add(linha[1])
+            self._nomes_snapshot.append(linha[1])
+        pos = off_topicos
+        for _ in range(n_topicos):
+            (id_topico, titulo, autor, tipo, descricao, off, n, *proxima), pos = _decodificar(
+                self._mapa, pos, self._campos_topico)
+            self._topicos[id_topico] = [id_topico, titulo, autor, tipo, descricao]
+            self._blocos_postagens[id_topico] = (off, n)
+            if proxima:
+                self._proximas_postagens[id_topico] = proxima[0]
+
+    def _zerar_sobreposicao(self):
+        self._postagens_novas = {}
+        self._respostas_novas = {}
+        self._local_postagens = {}
+        self._local_respostas = {}
+        self._postagens_removidas = set()
+        self._respostas_removidas = set()
+        self._textos = {}
+        self._likes = {}
+        self._curtidas = {}
+
+    def _reaplicar_diario(self):
+        valido = 0
+        if os.path.exists(self.caminho_diario):
+            with open(self.caminho_diario, "rb") as arquivo:
+                dados = arquivo.read()
+            if len(dados) >= _CABECALHO_DIARIO.size:
+                magico, geracao = _CABECALHO_DIARIO.unpack_from(dados, 0)
+                # Um diário de geração anterior já está contido no snapshot.
+                if magico == MAGICO_DIARIO and geracao == self.geracao:
+                    valido = self._reaplicar_registros(dados)
+
+        if valido:
+            # Descarta uma cauda truncada por queda no meio de uma escrita.
+            with open(self.caminho_diario, "r+b") as arquivo:
+                arquivo.truncate(valido)
+            self._diario = open(self.caminho_diario, "ab")
+        else:
+            self._diario = self._novo_diario(self.caminho_diario)
+
+    def _reaplicar_registros(self, dados):
+        pos = _CABECALHO_DIARIO.size
+        while pos + _MOLDURA.size <= len(dados):
+            tamanho, crc = _MOLDURA.unpack_from(dados, pos)
+            inicio, fim = pos + _MOLDURA.size, pos + _MOLDURA.size + tamanho
+            if fim > len(dados) or zlib.crc32(dados[inicio:fim]) != crc:
+                break
+            op = dados[inicio]
+            campos, _ = _decodificar(dados, inicio + 1, _CAMPOS_POR_OP[op])
+            self._aplicar(op, campos)
+            pos = fim
+        return pos
+
+    def _aplicar(self, op, campos):
+        # Um snapshot gravado com escritas concorrentes em andamento pode já
+        # conter o que os primeiros registros do diário novo repetem; inserções
+        # já conhecidas são ignoradas para a reaplicação ser idempotente.
+        if op == OP_USUARIO:
+            if campos[1] not in self._nomes_usuarios:
+                self._usuarios.append(tuple(campos))
+                self._nomes_usuarios.add(campos[1])
+        elif op == OP_TOPICO:
+            self._topicos.setdefault(campos[0], list(campos))
+            self._ids[0] = max(self._ids[0], campos[0])
+        elif op == OP_RENOMEAR_TOPICO:
+            linha = self._topicos.get(campos[0])
+            if linha is not None:
+                linha[1] = campos[1]
+        elif op == OP_REMOVER_TOPICO:
+            self._topicos.pop(campos[0], None)
+            self._blocos_postagens.pop(campos[0], None)
+            self._postagens_novas.pop(campos[0], None)
+        elif op == OP_POSTAGEM:
+            id_postagem, id_topico, posicao, autor, texto = campos
+            # O registro continua no diário mesmo se a postagem for removida
+            # depois, e é dele que sai a próxima posição até o snapshot seguinte.
+            self._avancar(self._proximas_postagens, id_topico, posicao)
+            if self.localizar_postagem(id_postagem) is not None:
+                return
+            self._postagens_novas.setdefault(id_topico, []).append((id_postagem, posicao, autor, texto))
+            self._local_postagens[id_postagem] = id_topico
+            self._ids[1] = max(self._ids[1], id_postagem)
+        elif op == OP_ATUALIZAR_POSTAGEM:
+            self._textos[campos[0]] = campos[1]
+        elif op == OP_REMOVER_POSTAGEM:
+            self._postagens_removidas.add(campos[0])
+        elif op == OP_RESPOSTA:
+            id_resposta, id_postagem, posicao, autor, conteudo, likes = campos
+            self._avancar(self._proximas_respostas, id_postagem, posicao)
+            if self.localizar_resposta(id_resposta) is not None:
+                return
+            self._respostas_novas.setdefault(id_postagem, []).append((id_resposta, posicao, autor, conteudo, likes))
+            self._local_respostas[id_resposta] = id_postagem
+            self._ids[2] = max(self._ids[2], id_resposta)
+        elif op == OP_LIKES:
+            self._likes[campos[0]] = campos[1]
+        elif op == OP_REMOVER_RESPOSTA:
+            self._respostas_removidas.add(campos[0])
+        elif op == OP_CURTIDA:
+            self._curtidas[tuple(campos)] = True
+        elif op == OP_DESCURTIDA:
+            self._curtidas[tuple(campos)] = False
+
+    @staticmethod
+    def _avancar(proximas, id_lista, posicao):
+        if proximas.get(id_lista, 0) <= posicao:
+            proximas[id_lista] = posicao + 1
+
+    def _novo_diario(self, caminho):
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(_CABECALHO_DIARIO.pack(MAGICO_DIARIO, self.geracao))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+        return open(caminho, "ab")
+
+    # --- leitura ---
+    def _ler_bloco(self, bloco, quantidade_campos):
+        pos, n = bloco
+        for _ in range(n):
+            linha, pos = _decodificar(self._mapa, pos, quantidade_campos)
+            yield linha
+
+    def _linhas_postagens(self, id_topico):
+        # (linha no formato de carregar_postagens, bloco de respostas no snapshot)
+        bloco = self._blocos_postagens.get(id_topico)
+        if bloco:
+            for id_postagem, posicao, autor, texto, off, n, *proxima in self._ler_bloco(bloco, self._campos_postagem):
+                if proxima:
+                    self._avancar(self._proximas_respostas, id_postagem, proxima[0] - 1)
+                if id_postagem not in self._postagens_removidas:
+                    yield (id_postagem, posicao, autor, self._textos.get(id_postagem, texto)), (off, n)
+        for id_postagem, posicao, autor, texto in self._postagens_novas.get(id_topico, ()):
+            if id_postagem not in self._postagens_removidas:
+                yield (id_postagem, posicao, autor, self._textos.get(id_postagem, texto)), None
+
+    def _linhas_respostas(self, id_postagem, bloco):
+        removidas, likes = self._respostas_removidas, self._likes
+        if bloco:
+            for id_resposta, posicao, autor, conteudo, quantidade in self._ler_bloco(bloco, 5):
+                if id_resposta not in removidas:
+                    yield id_resposta, posicao, autor, conteudo, likes.get(id_resposta, quantidade)
+        for id_resposta, posicao, autor, conteudo, quantidade in self._respostas_novas.get(id_postagem, ()):
+            if id_resposta not in removidas:
+                yield id_resposta, posicao, autor, conteudo, likes.get(id_resposta, quantidade)
+
+    def carregar_usuarios(self):
+        usuarios, self._usuarios = self._usuarios, []
+        return usuarios
+
+    def carregar_topicos(self):
+        topicos, self._topicos = self._topicos, {}
+        return [tuple(linha) for _, linha in sorted(topicos.items())]
+
+    def carregar_postagens(self, id_topico):
+        with self._trava:
+            linhas = []
+            for linha, bloco in self._linhas_postagens(id_topico):
+                if bloco:
+                    self._blocos_respostas[linha[0]] = bloco
+                linhas.append(linha)
+            self._blocos_postagens.pop(id_topico, None)
+            self._postagens_novas.pop(id_topico, None)
+            return linhas
+
+    def carregar_respostas(self, id_postagem):
+        with self._trava:
+            linhas = list(self._linhas_respostas(id_postagem, self._blocos_respostas.pop(id_postagem, None)))
+            self._respostas_novas.pop(id_postagem, None)
+            return linhas
+
+    def proxima_posicao_postagens(self, id_topico):
+        with self._trava:
+            return self._proximas_postagens.pop(id_topico, 0)
+
+    def proxima_posicao_respostas(self, id_postagem):
+        with self._trava:
+            return self._proximas_respostas.pop(id_postagem, 0)
+
+    def carregar_curtidas(self):
+        # Cada resposta curtida no snapshot guarda os índices (na seção de
+        # usuários) de quem curtiu num array('I'); a sobreposição vem por cima.
+        curtidas, self._curtidas = self._curtidas, {}
+        removidas, nomes = self._respostas_removidas, self._nomes_snapshot
+        linhas = []
+        pos, n = self._bloco_curtidas
+        for _ in range(n):
+            (id_resposta, quantidade), pos = _decodificar(self._mapa, pos, 2)
+            indices = array("I")
+            indices.frombytes(self._mapa[pos:pos + indices.itemsize * quantidade])
+            pos += indices.itemsize * quantidade
+            if id_resposta in removidas:
+                continue
+            for indice in indices:
+                if curtidas.get((id_resposta, nomes[indice]), True):
+                    linhas.append((nomes[indice], id_resposta))
+        for (id_resposta, nome_usuario), curtiu in curtidas.items():
+            if curtiu and id_resposta not in removidas:
+                linhas.append((nome_usuario, id_resposta))
+        self._bloco_curtidas, self._nomes_snapshot = (0, 0), []
+        return linhas
+
+    def _buscar_pai(self, indice, id_filho):
+        off, n = indice
+        if self._mapa is None or not 0 < id_filho < n:
+            return None
+        return _ID_PAI.unpack_from(self._mapa, off + id_filho * _ID_PAI.size)[0] or None
+
+    def localizar_postagem(self, id_postagem):
+        if id_postagem in self._local_postagens:
+            return self._local_postagens[id_postagem]
+        return self._buscar_pai(self._indice_postagens, id_postagem)
+
+    def localizar_resposta(self, id_resposta):
+        if id_resposta in self._local_respostas:
+            return self._local_respostas[id_resposta]
+        return self._buscar_pai(self._indice_respostas, id_resposta)
+
+    def maiores_ids(self):
+        return tuple(self._ids)
+
+    # --- escrita ---
+    def anexar(self, manager):
+        self._manager = manager
+
+    def _registrar(self, op, *campos):
+        payload = bytes((op,)) + _codificar(campos)
+        with self._trava:
+            self._diario.write(_MOLDURA.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._nao_confirmados += 1
+            if self._nao_confirmados >= self.tamanho_lote:
+                self._diario.flush()
+                self._nao_confirmados = 0
+            if (self._manager is not None and not self._gravando_snapshot
+                    and self._diario.tell() >= self.limite_diario):
+                self.gravar_snapshot(self._manager)
+
+    def salvar_usuario(self, usuario):
+        self._registrar(OP_USUARIO, usuario.nome, usuario.nome_usuario, usuario.senha, usuario.permissoes)
+
+    def salvar_topico(self, topico):
+        with self._trava:
+            self._ids[0] = max(self._ids[0], topico.id)
+            self._registrar(OP_TOPICO, topico.id, topico.titulo, topico.autor.nome_usuario, topico.tipo,
+                        topico.descricao)
+
+    def renomear_topico(self, topico):
+        self._registrar(OP_RENOMEAR_TOPICO, topico.id, topico.titulo)
+
+    def remover_topico(self, topico):
+        self._registrar(OP_REMOVER_TOPICO, topico.id)
+
+    def salvar_postagem(self, postagem):
+        with self._trava:
+            self._ids[1] = max(self._ids[1], postagem.id)
+            self._registrar(OP_POSTAGEM, postagem.id, postagem.topico.id, postagem.posicao,
+                        postagem.autor.nome_usuario, postagem.texto)
+
+    def atualizar_postagem(self, postagem):
+        self._registrar(OP_ATUALIZAR_POSTAGEM, postagem.id, postagem.texto)
+
+    def remover_postagem(self, postagem):
+        self._registrar(OP_REMOVER_POSTAGEM, postagem.id)
+
+    def salvar_resposta(self, resposta):
+        with self._trava:
+            self._ids[2] = max(self._ids[2], resposta.id)
+            self._registrar(OP_RESPOSTA, resposta.id, resposta.postagem.id, resposta.posicao,
+                        resposta.autor.nome_usuario, resposta.conteudo, resposta.quantidade_likes)
+
+    def atualizar_likes(self, resposta):
+        self._registrar(OP_LIKES, resposta.id, resposta.quantidade_likes)
+
+    def remover_resposta(self, resposta):
+        self._registrar(OP_REMOVER_RESPOSTA, resposta.id)
+
+    def salvar_curtida(self, nome_usuario, resposta):
+        self._registrar(OP_CURTIDA, resposta.id, nome_usuario)
+
+    def remover_curtida(self, nome_usuario, resposta):
+        self._registrar(OP_DESCURTIDA, resposta.id, nome_usuario)
+
+    def confirmar(self):
+        with self._trava:
+            self._diario.flush()
+            os.fsync(self._diario.fileno())
+            self._nao_confirmados = 0
+
+    def fechar(self):
+        with self._trava:
+            if self._diario.closed:
+                return
+            self.confirmar()
+            self._diario.close()
+            if self._mapa is not None:
+                self._mapa.close()
+                self._arquivo_snapshot.close()
+
+    # --- snapshot ---
+    def gravar_snapshot(self, manager):
+        with self._trava:
+            self._gravando_snapshot = True
+            try:
+                self._diario.flush()
+                blocos_respostas, proximas_respostas = self._escrever_snapshot(manager)
+                if self._mapa is not None:
+                    self._mapa.close()
+                    self._arquivo_snapshot.close()
+                self._diario.close()
+                self._abrir_snapshot()
+                self._usuarios, self._nomes_usuarios, self._topicos = [], set(), {}
+                self._bloco_curtidas, self._nomes_snapshot = (0, 0), []
+                # Tópicos já materializados não voltam a ser lidos do snapshot,
+                # mas postagens carregadas com respostas ainda preguiçosas, sim.
+                for topico in manager.topicos:
+                    if topico.postagens_carregadas:
+                        self._blocos_postagens.pop(topico.id, None)
+                self._blocos_respostas = blocos_respostas
+                self._proximas_respostas.update(proximas_respostas)
+                self._diario = self._novo_diario(self.caminho_diario)
+                self._nao_confirmados = 0
+            finally:
+                self._gravando_snapshot = False
+
+    def _escrever_snapshot(self, manager):
+        # Postagens e respostas com id acima dos maiores já registrados estão em
+        # memória mas com a escrita no diário ainda esperando a trava; ficam de
+        # fora do snapshot e entram pela reaplicação do diário novo.
+        ultimo_topico, ultima_postagem, ultima_resposta = self._ids
+        usuarios = list(manager.usuarios.values())
+        pais_postagens = array("Q", bytes(_ID_PAI.size * (ultima_postagem + 1)))
+        pais_respostas = array("Q", bytes(_ID_PAI.size * (ultima_resposta + 1)))
+        blocos_preguicosos = {}
+        proximas_preguicosas = {}
+        temporario = self.caminho_snapshot + ".tmp"
+
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(MAGICO_SNAPSHOT)
+            linhas_topicos = []
+            for topico in manager.topicos:
+                linhas_postagens = []
+                proxima_postagem = self._proxima_postagem_para_snapshot(topico)
+                for linha, respostas, bloco_antigo, proxima_resposta in self._postagens_para_snapshot(topico):
+                    id_postagem = linha[0]
+                    proxima_postagem = max(proxima_postagem, linha[1] + 1)
+                    if id_postagem > ultima_postagem:
+                        continue
+                    pais_postagens[id_postagem] = topico.id
+                    off_respostas = arquivo.tell()
+                    quantidade = 0
+                    for resposta in respostas:
+                        proxima_resposta = max(proxima_resposta, resposta[1] + 1)
+                        if resposta[0] > ultima_resposta:
+                            continue
+                        pais_respostas[resposta[0]] = id_postagem
+                        arquivo.write(_codificar(resposta))
+                        quantidade += 1
+                    if bloco_antigo is not None:
+                        blocos_preguicosos[id_postagem] = (off_respostas, quantidade)
+                        proximas_preguicosas[id_postagem] = proxima_resposta
+                    linhas_postagens.append(_codificar((*linha, off_respostas, quantidade, proxima_resposta)))
+                off_postagens = arquivo.tell()
+                arquivo.write(b"".join(linhas_postagens))
+                linhas_topicos.append(_codificar((topico.id, topico.titulo, topico.autor.nome_usuario, topico.tipo,
+                                                  topico.descricao, off_postagens, len(linhas_postagens),
+                                                  proxima_postagem)))
+
+            off_topicos = arquivo.tell()
+            arquivo.write(b"".join(linhas_topicos))
+            off_usuarios = arquivo.tell()
+            for usuario in usuarios:
+                arquivo.write(_codificar((usuario.nome, usuario.nome_usuario, usuario.senha, usuario.permissoes)))
+            off_idx_p = arquivo.tell()
+            arquivo.write(pais_postagens.tobytes())
+            off_idx_r = arquivo.tell()
+            arquivo.write(pais_respostas.tobytes())
+            off_curtidas = arquivo.tell()
+            n_curtidas = self._escrever_curtidas(arquivo, manager, usuarios, ultima_resposta)
+            arquivo.write(_RODAPE.pack(
+                self.geracao + 1, off_topicos, len(linhas_topicos), off_usuarios, len(usuarios),
+                off_idx_p, len(pais_postagens), off_idx_r, len(pais_respostas), off_curtidas, n_curtidas,
+                ultimo_topico, ultima_postagem, ultima_resposta, MAGICO_SNAPSHOT))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho_snapshot)
+        return blocos_preguicosos, proximas_preguicosas
+
+    def _escrever_curtidas(self, arquivo, manager, usuarios, ultima_resposta):
+        indices = {usuario.nome_usuario: i for i, usuario in enumerate(usuarios)}
+        quantidade = 0
+        for id_resposta, nomes in manager.curtidas.itens():
+            if id_resposta > ultima_resposta:
+                continue
+            quem_curtiu = array("I", (indices[nome] for nome in nomes if nome in indices))
+            arquivo.write(_codificar((id_resposta, len(quem_curtiu))))
+            arquivo.write(quem_curtiu.tobytes())
+            quantidade += 1
+        return quantidade
+
+    def _proxima_postagem_para_snapshot(self, topico):
+        if topico.postagens_carregadas:
+            return topico.postagens.proxima_posicao()
+        return self._proximas_postagens.get(topico.id, 0)
+
+    def _postagens_para_snapshot(self, topico):
+        # Threads nunca acessadas desde a partida são copiadas direto do snapshot
+        # anterior + sobreposição, sem materializar objetos. A próxima posição
+        # de respostas vem da lista em memória ou, se ainda não carregada, do
+        # snapshot anterior + diário (e é completada pelas posições escritas).
+        proximas = self._proximas_respostas
+        if not topico.postagens_carregadas:
+            for linha, bloco in self._linhas_postagens(topico.id):
+                yield linha, self._linhas_respostas(linha[0], bloco), None, proximas.get(linha[0], 0)
+            return
+        for postagem in topico.postagens:
+            linha = (postagem.id, postagem.posicao, postagem.autor.nome_usuario, postagem.texto)
+            if postagem.respostas_carregadas:
+                respostas = ((r.id, r.posicao, r.autor.nome_usuario, r.conteudo, r.quantidade_likes)
+                             for r in postagem.respostas)
+                yield linha, respostas, None, postagem.respostas.proxima_posicao()
+            else:
+                bloco = self._blocos_respostas.get(postagem.id)
+                yield (linha, self._linhas_respostas(postagem.id, bloco), bloco or (0, 0),
+                       proximas.get(postagem.id, 0))
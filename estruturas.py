@@ -0,0 +1,167 @@
+import random
+
+# === Skip list indexável ===
+# Skip list ordenada pela chave em que cada ligação guarda também sua largura
+# (quantas posições ela pula). Com isso, além de inserir e remover em O(log n),
+# dá para descobrir a posição de uma chave e acessar o item da posição i, também
+# em O(log n) esperado. As chaves precisam ser únicas e comparáveis entre si;
+# para rankings, use tuplas como (-pontos, id).
+_NIVEL_MAXIMO = 32
+_PROBABILIDADE = 0.25
+
+
+class _No:
+    __slots__ = ("chave", "valor", "proximos", "larguras")
+
+    def __init__(self, chave, valor, nivel):
+        self.chave = chave
+        self.valor = valor
+        self.proximos = [None] * nivel
+        # Largura da ligação em cada nível; só tem significado quando o
+        # próximo do mesmo nível existe.
+        self.larguras = [0] * nivel
+
+
+class SkipListIndexada:
+    def __init__(self, semente=None):
+        self._cabeca = _No(None, None, _NIVEL_MAXIMO)
+        self._nivel = 1
+        self._tamanho = 0
+        self._aleatorio = random.Random(semente)
+
+    def __len__(self):
+        return self._tamanho
+
+    def __iter__(self):
+        no = self._cabeca.proximos[0]
+        while no is not None:
+            yield no.chave, no.valor
+            no = no.proximos[0]
+
+    def __contains__(self, chave):
+        return self.posicao(chave) is not None
+
+    def _sortear_nivel(self):
+        nivel, sortear = 1, self._aleatorio.random
+        while nivel < _NIVEL_MAXIMO and sortear() < _PROBABILIDADE:
+            nivel += 1
+        return nivel
+
+    def _predecessores(self, chave):
+        # Para cada nível, o último nó com chave < `chave` e sua posição
+        # (a cabeça está na posição 0 e o primeiro item na 1).
+        anteriores = [self._cabeca] * _NIVEL_MAXIMO
+        posicoes = [0] * _NIVEL_MAXIMO
+        no, posicao = self._cabeca, 0
+        for nivel in range(self._nivel - 1, -1, -1):
+            proximo = no.proximos[nivel]
+            while proximo is not None and proximo.chave < chave:
+                posicao += no.larguras[nivel]
+                no, proximo = proximo, proximo.proximos[nivel]
+            anteriores[nivel] = no
+            posicoes[nivel] = posicao
+        return anteriores, posicoes
+
+    def inserir(self, chave, valor=None):
+        anteriores, posicoes = self._predecessores(chave)
+        seguinte = anteriores[0].proximos[0]
+        if seguinte is not None and seguinte.chave == chave:
+            raise KeyError(chave)
+
+        nivel_novo = self._sortear_nivel()
+        if nivel_novo > self._nivel:
+            self._nivel = nivel_novo
+        novo = _No(chave, valor, nivel_novo)
+        posicao_nova = posicoes[0] + 1
+        for nivel in range(nivel_novo):
+            anterior = anteriores[nivel]
+            distancia = posicao_nova - posicoes[nivel]
+            novo.proximos[nivel] = anterior.proximos[nivel]
+            novo.larguras[nivel] = anterior.larguras[nivel] - distancia + 1
+            anterior.proximos[nivel] = novo
+            anterior.larguras[nivel] = distancia
+        for nivel in range(nivel_novo, self._nivel):
+            anteriores[nivel].larguras[nivel] += 1
+        self._tamanho += 1
+
+    def carregar_ordenados(self, itens):
+        # Carga inicial em O(n): (chave, valor) já em ordem estritamente
+        # crescente de chave, numa lista vazia. Cada nó é ligado ao último nó
+        # de cada um dos seus níveis, sem busca.
+        if self._tamanho:
+            raise ValueError("carregar_ordenados exige uma lista vazia")
+        ultimos = [self._cabeca] * _NIVEL_MAXIMO
+        posicoes = [0] * _NIVEL_MAXIMO
+        posicao, anterior_chave = 0, None
+        for chave, valor in itens:
+            if posicao and not anterior_chave < chave:
+                raise ValueError("chaves fora de ordem ou repetidas")
+            posicao += 1
+            nivel_novo = self._sortear_nivel()
+            if nivel_novo > self._nivel:
+                self._nivel = nivel_novo
+            novo = _No(chave, valor, nivel_novo)
+            for nivel in range(nivel_novo):
+                ultimos[nivel].proximos[nivel] = novo
+                ultimos[nivel].larguras[nivel] = posicao - posicoes[nivel]
+                ultimos[nivel] = novo
+                posicoes[nivel] = posicao
+            anterior_chave = chave
+        self._tamanho = posicao
+
+    def remover(self, chave):
+        anteriores, _ = self._predecessores(chave)
+        alvo = anteriores[0].proximos[0]
+        if alvo is None or alvo.chave != chave:
+            raise KeyError(chave)
+
+        for nivel in range(self._nivel):
+            anterior = anteriores[nivel]
+            if anterior.proximos[nivel] is alvo:
+                anterior.proximos[nivel] = alvo.proximos[nivel]
+                anterior.larguras[nivel] += alvo.larguras[nivel] - 1
+            else:
+                anterior.larguras[nivel] -= 1
+        while self._nivel > 1 and self._cabeca.proximos[self._nivel - 1] is None:
+            self._nivel -= 1
+        self._tamanho -= 1
+        return alvo.valor
+
+    def posicao(self, chave):
+        # Posição (a partir de 0) da chave, ou None se ela não estiver na lista.
+        anteriores, posicoes = self._predecessores(chave)
+        seguinte = anteriores[0].proximos[0]
+        if seguinte is None or seguinte.chave != chave:
+            return None
+        return posicoes[0]
+
+    def _no_na_posicao(self, indice):
+        alvo = indice + 1
+        no, posicao = self._cabeca, 0
+        for nivel in range(self._nivel - 1, -1, -1):
+            proximo = no.proximos[nivel]
+            while proximo is not None and posicao + no.larguras[nivel] <= alvo:
+                posicao += no.larguras[nivel]
+                no, proximo = proximo, proximo.proximos[nivel]
+        return no
+
+    def obter(self, indice):
+        if not 0 <= indice < self._tamanho:
+            raise IndexError(indice)
+        no = self._no_na_posicao(indice)
+        return no.chave, no.valor
+
+    def fatia(self, inicio, quantidade):
+        # (chave, valor) das posições [inicio, inicio + quantidade), em ordem.
+        inicio = max(inicio, 0)
+        if inicio >= self._tamanho or quantidade <= 0:
+            return []
+        no = self._no_na_posicao(inicio)
+        itens = []
+        while no is not None and len(itens) < quantidade:
+            itens.append((no.chave, no.valor))
+            no = no.proximos[0]
+        return itens
+
+    def primeiros(self, quantidade):
+        return self.fatia(0, quantidade)
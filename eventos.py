@@ -0,0 +1,320 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+# === Eventos ===
+@dataclass(frozen=True)
+class Evento:
+    momento: float = field(default_factory=time.time, kw_only=True)
+
+    def mensagem(self) -> str:
+        return type(self).__name__
+
+    def como_dict(self) -> dict:
+        return {"tipo": type(self).__name__, **vars(self)}
+
+
+@dataclass(frozen=True)
+class UsuarioRegistrado(Evento):
+    nome_usuario: str
+
+    def mensagem(self):
+        return f"Usuário @{self.nome_usuario} registrado com sucesso."
+
+
+@dataclass(frozen=True)
+class TopicoCriado(Evento):
+    id_topico: int
+    titulo: str
+    nome_usuario: str
+
+    def mensagem(self):
+        return f"Tópico '{self.titulo}' criado por @{self.nome_usuario}."
+
+
+@dataclass(frozen=True)
+class TopicoRenomeado(Evento):
+    id_topico: int
+    titulo_anterior: str
+    titulo: str
+
+    def mensagem(self):
+        return f"Tópico '{self.titulo_anterior}' renomeado para '{self.titulo}'."
+
+
+@dataclass(frozen=True)
+class TopicoRemovido(Evento):
+    id_topico: int
+    titulo: str
+
+    def mensagem(self):
+        return f"Tópico '{self.titulo}' removido."
+
+
+@dataclass(frozen=True)
+class PostagemAdicionada(Evento):
+    id_postagem: int
+    titulo_topico: str
+    nome_usuario: str
+
+    def mensagem(self):
+        return f"Postagem adicionada ao tópico '{self.titulo_topico}' por @{self.nome_usuario}."
+
+
+@dataclass(frozen=True)
+class PostagemEditada(Evento):
+    id_postagem: int
+
+    def mensagem(self):
+        return f"Postagem #{self.id_postagem} editada."
+
+
+@dataclass(frozen=True)
+class PostagemRemovida(Evento):
+    id_postagem: int
+
+    def mensagem(self):
+        return f"Postagem #{self.id_postagem} removida."
+
+
+@dataclass(frozen=True)
+class RespostaAdicionada(Evento):
+    id_resposta: int
+    id_postagem: int
+    posicao_postagem: int
+    titulo_topico: str
+    nome_usuario: str
+
+    def mensagem(self):
+        return (f"Resposta adicionada por @{self.nome_usuario} à postagem "
+                f"#{self.posicao_postagem} em '{self.titulo_topico}'.")
+
+
+@dataclass(frozen=True)
+class RespostaRemovida(Evento):
+    id_resposta: int
+
+    def mensagem(self):
+        return f"Resposta #{self.id_resposta} removida."
+
+
+@dataclass(frozen=True)
+class DenunciaRegistrada(Evento):
+    tipo_conteudo: str
+    id_conteudo: Optional[int]
+    nome_autor: Optional[str] = None
+    nome_denunciante: Optional[str] = None
+
+    def mensagem(self):
+        if self.nome_autor is None:
+            return "Denúncia registrada."
+        return f"{self.tipo_conteudo.capitalize()} de @{self.nome_autor} denunciada."
+
+
+@dataclass(frozen=True)
+class ConteudoOcultado(Evento):
+    tipo_conteudo: str
+    id_conteudo: Optional[int]
+
+    def mensagem(self):
+        if self.tipo_conteudo == "topico":
+            return "Tópico ocultado após denúncias."
+        return f"{self.tipo_conteudo.capitalize()} ocultada após denúncias."
+
+
+@dataclass(frozen=True)
+class DuplicataSuspeita(Evento):
+    tipo_conteudo: str
+    id_conteudo: int
+    tipo_semelhante: str
+    id_semelhante: int
+    similaridade: float
+
+    def mensagem(self):
+        return (f"{self.tipo_conteudo.capitalize()} #{self.id_conteudo} parece cópia de "
+                f"{self.tipo_semelhante} #{self.id_semelhante} ({self.similaridade:.0%}).")
+
+
+@dataclass(frozen=True)
+class NotificacaoResposta(Evento):
+    nome_usuario: str
+    quantidade: int = 1
+
+    def mensagem(self):
+        if self.quantidade == 1:
+            return f"[NOTIFICAÇÃO] {self.nome_usuario}, seu tópico recebeu uma nova resposta!"
+        return f"[NOTIFICAÇÃO] {self.nome_usuario}, seu tópico recebeu {self.quantidade} novas respostas!"
+
+
+@dataclass(frozen=True)
+class AcaoPapel(Evento):
+    papel: str
+    acao: str
+    alvo: Optional[str] = None
+
+    def mensagem(self):
+        formato = _MENSAGENS_ACOES.get((self.papel, self.acao), "{papel}: {acao} {alvo}")
+        return formato.format(papel=self.papel, acao=self.acao, alvo=self.alvo)
+
+
+@dataclass(frozen=True)
+class FalhaOperacao(Evento):
+    operacao: str
+    motivo: str
+
+    def mensagem(self):
+        return self.motivo
+
+
+_MENSAGENS_ACOES = {
+    ("Convidado", "acesso_topico"): "Convidado: acesso somente leitura.",
+    ("UsuarioLogado", "comentar"): "Comentário realizado.",
+    ("UsuarioLogado", "excluir_comentario"): "Comentário '{alvo}' excluído.",
+    ("UsuarioLogado", "visualizar_links"): "Links visíveis para o usuário.",
+    ("Lojista", "criar_estabelecimento"): "Estabelecimento '{alvo}' criado.",
+    ("Moderador", "aprovar_topico"): "Tópico '{alvo}' aprovado.",
+    ("Moderador", "remover_postagem"): "Postagem '{alvo}' removida.",
+    ("Moderador", "remover_permissoes"): "Permissão '{alvo}' removida do usuário.",
+    ("Administrador", "aprovar_topico"): "Administrador aprovou o tópico: {alvo}",
+    ("Administrador", "remover_postagem"): "Administrador removeu a postagem: {alvo}",
+    ("Administrador", "conceder_permissoes"): "Permissão '{alvo}' concedida ao usuário.",
+    ("Administrador", "remover_permissoes"): "Permissão '{alvo}' removida do usuário.",
+}
+
+
+# === Sinks ===
+class SinkEventos(ABC):
+    @abstractmethod
+    def publicar(self, evento: Evento):
+        pass
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.descarregar()
+
+
+class SinkConsole(SinkEventos):
+    # Mantém a saída histórica do fórum: uma linha legível por evento.
+    def publicar(self, evento):
+        print(evento.mensagem())
+
+
+class SinkNulo(SinkEventos):
+    def publicar(self, evento):
+        pass
+
+
+class SinkMemoria(SinkEventos):
+    def __init__(self, capacidade: Optional[int] = None):
+        self._eventos = deque(maxlen=capacidade)
+
+    def publicar(self, evento):
+        self._eventos.append(evento)
+
+    @property
+    def eventos(self):
+        return list(self._eventos)
+
+    def drenar(self):
+        eventos = []
+        while self._eventos:
+            eventos.append(self._eventos.popleft())
+        return eventos
+
+    def limpar(self):
+        self._eventos.clear()
+
+
+class SinkArquivo(SinkEventos):
+    # Grava JSON Lines numa thread própria: publicar() só enfileira, e a escrita
+    # acontece em lotes de até `tamanho_lote` eventos ou a cada `intervalo` segundos.
+    def __init__(self, caminho: str, tamanho_lote: int = 1024, intervalo: float = 0.5):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self._pendentes = deque()
+        self._condicao = threading.Condition()
+        self._forcar = False
+        self._encerrar = False
+        self._ciclos_iniciados = 0
+        self._ciclos_concluidos = 0
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._executar, name="SinkArquivo", daemon=True)
+        self._thread.start()
+
+    def publicar(self, evento):
+        self._pendentes.append(evento)
+        if len(self._pendentes) == self.tamanho_lote:
+            with self._condicao:
+                self._condicao.notify()
+
+    def descarregar(self):
+        with self._condicao:
+            if self._encerrar:
+                return
+            alvo = self._ciclos_iniciados + 1
+            self._forcar = True
+            self._condicao.notify_all()
+            self._condicao.wait_for(lambda: self._ciclos_concluidos >= alvo)
+
+    def fechar(self):
+        with self._condicao:
+            if self._encerrar:
+                return
+            self._encerrar = True
+            self._condicao.notify_all()
+        self._thread.join()
+        self._arquivo.close()
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                self._condicao.wait_for(
+                    lambda: self._encerrar or self._forcar or len(self._pendentes) >= self.tamanho_lote,
+                    timeout=self.intervalo,
+                )
+                self._forcar = False
+                encerrar = self._encerrar
+                self._ciclos_iniciados += 1
+            self._gravar_pendentes()
+            with self._condicao:
+                self._ciclos_concluidos += 1
+                self._condicao.notify_all()
+            if encerrar:
+                return
+
+    def _gravar_pendentes(self):
+        pendentes = self._pendentes
+        if not pendentes:
+            return
+        while pendentes:
+            linhas = []
+            while pendentes and len(linhas) < self.tamanho_lote:
+                linhas.append(json.dumps(pendentes.popleft().como_dict(), ensure_ascii=False))
+            self._arquivo.write("\n".join(linhas) + "\n")
+        self._arquivo.flush()
+
+
+# === Sink global ===
+_sink_atual: SinkEventos = SinkConsole()
+
+
+def publicar(evento: Evento):
+    _sink_atual.publicar(evento)
+
+
+def sink_atual() -> SinkEventos:
+    return _sink_atual
+
+
+def definir_sink(sink: SinkEventos) -> SinkEventos:
+    global _sink_atual
+    anterior, _sink_atual = _sink_atual, sink
+    return anterior
@@ -0,0 +1,226 @@
+import heapq
+import threading
+import time
+import zlib
+from itertools import count
+
+# === Fila de moderação ===
+# Tópicos aguardando aprovação e conteúdo denunciado, por prioridade:
+#
+#   prioridade = peso_denuncias * denuncias + peso_idade * idade - peso_reputacao * reputacao
+#
+# Como a idade cresce igual para todos os itens, o termo "agora" é comum a
+# todas as prioridades e some na comparação: a chave do heap é
+# `peso_denuncias * denuncias - peso_reputacao * reputacao - peso_idade * criado_em`,
+# que só muda quando chega uma nova denúncia. Nesse caso o item é reinserido
+# com uma versão nova e a entrada antiga é descartada quando chega ao topo.
+#
+# Cada moderador tem a sua fatia (um heap); os itens de um tópico vão para o
+# moderador menos carregado entre os `moderadores` do tópico, e os de tópicos
+# sem moderador para uma fatia geral que todos consultam. Quem pega um item
+# recebe uma concessão com prazo: enquanto ela vale, o item não está em
+# nenhum heap e ninguém mais o recebe; vencida, o item volta para a fila.
+TOPICO_PENDENTE, CONTEUDO_DENUNCIADO = "topico", "denuncia"
+
+
+class ItemModeracao:
+    __slots__ = ("alvo", "tipo", "topico", "denuncias", "criado_em", "reputacao", "fatia", "versao",
+                 "moderador", "expira_em")
+
+    def __init__(self, alvo, tipo, topico, criado_em, reputacao):
+        self.alvo = alvo
+        self.tipo = tipo
+        self.topico = topico
+        self.denuncias = 0
+        self.criado_em = criado_em
+        self.reputacao = reputacao
+        self.fatia = None
+        self.versao = 0
+        self.moderador = None  # dono da concessão atual
+        self.expira_em = None
+
+    def __repr__(self):
+        return f"ItemModeracao({self.tipo}, denuncias={self.denuncias}, moderador={self.moderador})"
+
+
+class FilaModeracao:
+    def __init__(self, peso_denuncias: float = 10.0, peso_idade: float = 1 / 3600, peso_reputacao: float = 1.0,
+                 duracao_concessao: float = 300.0, relogio=time.monotonic):
+        self.peso_denuncias = peso_denuncias
+        self.peso_idade = peso_idade
+        self.peso_reputacao = peso_reputacao
+        self.duracao_concessao = duracao_concessao
+        self.relogio = relogio
+        self._itens = {}        # alvo -> ItemModeracao (na fila ou em concessão)
+        self._fatias = {}       # moderador (None = fatia geral) -> heap de (chave, seq, versao, item)
+        self._tamanhos = {}     # moderador -> itens válidos na fatia
+        self._concessoes = []   # heap de (expira_em, seq, versao, item)
+        self._removidos = set()  # moderadores que saíram: não recebem mais fatias
+        self._sequencia = count()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def pendentes(self, moderador=None):
+        # Itens esperando na fatia do moderador (ou na geral), sem concessões.
+        return self._tamanhos.get(moderador, 0)
+
+    # --- entrada ---
+    def adicionar_topico(self, topico, reputacao=0.0):
+        with self._trava:
+            return self._registrar(topico, TOPICO_PENDENTE, topico, reputacao, 0)
+
+    def denunciar(self, alvo, topico, reputacao=0.0):
+        # Denúncias repetidas do mesmo conteúdo somam no mesmo item.
+        with self._trava:
+            return self._registrar(alvo, CONTEUDO_DENUNCIADO, topico, reputacao, 1)
+
+    def _registrar(self, alvo, tipo, topico, reputacao, denuncias):
+        item = self._itens.get(alvo)
+        if item is None:
+            item = self._itens[alvo] = ItemModeracao(alvo, tipo, topico, self.relogio(), reputacao)
+            item.denuncias = denuncias
+            self._enfileirar(item, self._escolher_fatia(self._moderadores(topico), topico))
+            return item
+        item.denuncias += denuncias
+        if denuncias and item.moderador is None:
+            # Sobe de prioridade: reinsere com versão nova na mesma fatia.
+            self._tamanhos[item.fatia] -= 1
+            self._enfileirar(item, item.fatia)
+        return item
+
+    def _moderadores(self, topico):
+        return [m for m in getattr(topico, "moderadores", None) or () if m not in self._removidos]
+
+    def _reenfileirar(self, item):
+        # Volta para a fila na fatia que tinha, ou numa nova se o moderador
+        # dela foi removido enquanto o item estava em concessão.
+        fatia = item.fatia
+        if fatia is not None and fatia in self._removidos:
+            fatia = self._escolher_fatia(self._moderadores(item.topico), item.topico)
+        self._enfileirar(item, fatia)
+
+    def _escolher_fatia(self, moderadores, topico):
+        if not moderadores:
+            return None
+        # Menor fatia; empates desfeitos pelo título, para ser determinístico.
+        deslocamento = zlib.crc32(str(getattr(topico, "titulo", "")).encode("utf-8"))
+        return min((self._tamanhos.get(m, 0), (i - deslocamento) % len(moderadores), m)
+                   for i, m in enumerate(moderadores))[2]
+
+    def _chave(self, item):
+        return -(self.peso_denuncias * item.denuncias - self.peso_reputacao * item.reputacao
+                 - self.peso_idade * item.criado_em)
+
+    def _enfileirar(self, item, fatia):
+        item.versao += 1
+        item.fatia = fatia
+        heap = self._fatias.get(fatia)
+        if heap is None:
+            heap = self._fatias[fatia] = []
+        heapq.heappush(heap, (self._chave(item), next(self._sequencia), item.versao, item))
+        self._tamanhos[fatia] = self._tamanhos.get(fatia, 0) + 1
+
+    def _topo(self, fatia):
+        # Descarta entradas obsoletas e devolve a entrada válida do topo.
+        heap = self._fatias.get(fatia)
+        while heap:
+            entrada = heap[0]
+            item = entrada[3]
+            if entrada[2] == item.versao and item.moderador is None and self._itens.get(item.alvo) is item:
+                return entrada
+            heapq.heappop(heap)
+        return None
+
+    # --- concessões ---
+    def _recuperar_vencidas(self, agora):
+        concessoes = self._concessoes
+        while concessoes and concessoes[0][0] <= agora:
+            _, _, versao, item = heapq.heappop(concessoes)
+            if item.versao == versao and item.moderador is not None and self._itens.get(item.alvo) is item:
+                item.moderador = item.expira_em = None
+                self._reenfileirar(item)
+
+    def _conceder(self, item, moderador, duracao, agora):
+        item.moderador = moderador
+        item.expira_em = agora + (self.duracao_concessao if duracao is None else duracao)
+        item.versao += 1
+        heapq.heappush(self._concessoes, (item.expira_em, next(self._sequencia), item.versao, item))
+
+    def proximo(self, moderador, duracao=None):
+        # O item mais prioritário entre a fatia do moderador e a geral, já
+        # concedido a ele; None se não houver nada. O(log n).
+        with self._trava:
+            agora = self.relogio()
+            self._recuperar_vencidas(agora)
+            candidatos = [e for e in (self._topo(moderador), self._topo(None)) if e is not None]
+            if not candidatos:
+                return None
+            entrada = min(candidatos, key=lambda e: (e[0], e[1]))
+            item = entrada[3]
+            heapq.heappop(self._fatias[item.fatia])
+            self._tamanhos[item.fatia] -= 1
+            self._conceder(item, moderador, duracao, agora)
+            return item
+
+    def _tem_concessao(self, item, moderador):
+        return (item.moderador is moderador and self._itens.get(item.alvo) is item
+                and item.expira_em > self.relogio())
+
+    def renovar(self, item, moderador, duracao=None):
+        with self._trava:
+            if not self._tem_concessao(item, moderador):
+                return False
+            self._conceder(item, moderador, duracao, self.relogio())
+            return True
+
+    def devolver(self, item, moderador):
+        # Desiste do item antes do prazo: volta para a fila na mesma fatia.
+        with self._trava:
+            if not self._tem_concessao(item, moderador):
+                return False
+            item.moderador = item.expira_em = None
+            self._reenfileirar(item)
+            return True
+
+    def concluir(self, item, moderador):
+        # False se a concessão venceu (o item pode já estar com outro moderador).
+        with self._trava:
+            if not self._tem_concessao(item, moderador):
+                return False
+            del self._itens[item.alvo]
+            item.moderador = item.expira_em = None
+            item.versao += 1
+            return True
+
+    def descartar(self, alvo):
+        # O alvo deixou de precisar de moderação (removido ou decidido fora da
+        # fila): sai da fila ou da concessão; as entradas no heap ficam
+        # obsoletas. False se o alvo não estava na fila.
+        with self._trava:
+            item = self._itens.pop(alvo, None)
+            if item is None:
+                return False
+            if item.moderador is None:
+                self._tamanhos[item.fatia] -= 1
+            item.moderador = item.expira_em = None
+            item.versao += 1
+            return True
+
+    def remover_moderador(self, moderador):
+        # Redistribui a fatia de quem deixou de moderar; concessões em
+        # andamento seguem até concluir ou vencer e depois vão para outra
+        # fatia. O moderador não recebe itens novos até adicionar_moderador.
+        with self._trava:
+            self._removidos.add(moderador)
+            heap = self._fatias.pop(moderador, [])
+            self._tamanhos.pop(moderador, None)
+            for _, _, versao, item in heap:
+                if versao == item.versao and item.moderador is None and self._itens.get(item.alvo) is item:
+                    self._enfileirar(item, self._escolher_fatia(self._moderadores(item.topico), item.topico))
+
+    def adicionar_moderador(self, moderador):
+        # Desfaz remover_moderador.
+        with self._trava:
+            self._removidos.discard(moderador)
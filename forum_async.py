@@ -0,0 +1,171 @@
+import asyncio
+from functools import partial
+
+from forum_manager import ComunidadeCafeManager
+
+
+# === Fachada assíncrona ===
+def _executar_lote(lote):
+    resultados = []
+    for funcao, argumentos, _ in lote:
+        try:
+            resultados.append((True, funcao(*argumentos)))
+        except Exception as erro:
+            resultados.append((False, erro))
+    return resultados
+
+
+class ComunidadeCafeAsync:
+    # Toda chamada ao manager (e, portanto, ao repositório) roda no executor, nunca
+    # no laço de eventos. Escritas concorrentes são agrupadas: enquanto um lote
+    # roda numa thread, as escritas que chegam esperam na fila e seguem juntas no
+    # próximo, com um único salto para o executor por lote.
+    def __init__(self, manager=None, executor=None, tamanho_lote: int = 256, tamanho_pagina: int = 100):
+        self.manager = manager or ComunidadeCafeManager()
+        self.tamanho_lote = tamanho_lote
+        self.tamanho_pagina = tamanho_pagina
+        self._executor = executor
+        self._pendentes = []
+        self._descarga = None
+
+    # --- execução ---
+    async def _ler(self, funcao, *argumentos):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, funcao, *argumentos)
+
+    async def _escrever(self, funcao, *argumentos):
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._pendentes.append((funcao, argumentos, futuro))
+        if self._descarga is None:
+            self._descarga = loop.create_task(self._descarregar())
+        return await futuro
+
+    async def _descarregar(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pendentes:
+                # Cede a vez uma rodada para as corrotinas prontas enfileirarem.
+                await asyncio.sleep(0)
+                lote = self._pendentes[:self.tamanho_lote]
+                del self._pendentes[:self.tamanho_lote]
+                resultados = await loop.run_in_executor(self._executor, _executar_lote, lote)
+                for (_, _, futuro), (sucesso, valor) in zip(lote, resultados):
+                    if futuro.cancelled():
+                        continue
+                    if sucesso:
+                        futuro.set_result(valor)
+                    else:
+                        futuro.set_exception(valor)
+        finally:
+            self._descarga = None
+
+    async def _iterar(self, paginar, recentes):
+        # Uma página por ida ao executor; o cursor da página anterior continua
+        # de onde ela parou, então o custo não depende do tamanho da thread.
+        cursor = None
+        while True:
+            pagina = await self._ler(partial(paginar, limite=self.tamanho_pagina, cursor=cursor, recentes=recentes))
+            if pagina is None:
+                return
+            for item in pagina:
+                yield item
+            cursor = pagina.proximo_cursor
+            if cursor is None:
+                return
+
+    # --- escrita ---
+    async def registrar_usuario(self, nome, nome_usuario, senha, permissoes="padrão"):
+        return await self._escrever(self.manager.registrar_usuario, nome, nome_usuario, senha, permissoes)
+
+    async def criar_topico(self, titulo, nome_usuario, tipo, descricao):
+        return await self._escrever(self.manager.criar_topico, titulo, nome_usuario, tipo, descricao)
+
+    async def renomear_topico(self, titulo_atual, novo_titulo):
+        return await self._escrever(self.manager.renomear_topico, titulo_atual, novo_titulo)
+
+    async def remover_topico(self, titulo):
+        return await self._escrever(self.manager.remover_topico, titulo)
+
+    async def adicionar_postagem(self, titulo_topico, nome_usuario, texto):
+        return await self._escrever(self.manager.adicionar_postagem, titulo_topico, nome_usuario, texto)
+
+    async def responder_postagem(self, titulo_topico, index_postagem, nome_usuario, conteudo_resposta):
+        return await self._escrever(self.manager.responder_postagem, titulo_topico, index_postagem,
+                                    nome_usuario, conteudo_resposta)
+
+    async def responder_postagem_por_id(self, id_postagem, nome_usuario, conteudo_resposta):
+        return await self._escrever(self.manager.responder_postagem_por_id, id_postagem, nome_usuario,
+                                    conteudo_resposta)
+
+    async def curtir_resposta(self, id_resposta, nome_usuario):
+        return await self._escrever(self.manager.curtir_resposta, id_resposta, nome_usuario)
+
+    async def descurtir_resposta(self, id_resposta, nome_usuario):
+        return await self._escrever(self.manager.descurtir_resposta, id_resposta, nome_usuario)
+
+    async def denunciar_resposta(self, id_resposta, nome_usuario):
+        return await self._escrever(self.manager.denunciar_resposta, id_resposta, nome_usuario)
+
+    async def seguir_usuario(self, nome_usuario, nome_seguido):
+        return await self._escrever(self.manager.seguir_usuario, nome_usuario, nome_seguido)
+
+    async def deixar_de_seguir_usuario(self, nome_usuario, nome_seguido):
+        return await self._escrever(self.manager.deixar_de_seguir_usuario, nome_usuario, nome_seguido)
+
+    async def seguir_topico(self, nome_usuario, titulo_topico):
+        return await self._escrever(self.manager.seguir_topico, nome_usuario, titulo_topico)
+
+    async def deixar_de_seguir_topico(self, nome_usuario, titulo_topico):
+        return await self._escrever(self.manager.deixar_de_seguir_topico, nome_usuario, titulo_topico)
+
+    async def editar_postagem(self, id_postagem, novo_texto):
+        return await self._escrever(self.manager.editar_postagem, id_postagem, novo_texto)
+
+    async def remover_postagem(self, id_postagem):
+        return await self._escrever(self.manager.remover_postagem, id_postagem)
+
+    async def remover_resposta(self, id_resposta):
+        return await self._escrever(self.manager.remover_resposta, id_resposta)
+
+    async def confirmar(self):
+        # Entra na fila como qualquer escrita: confirma tudo o que veio antes.
+        return await self._escrever(self.manager.confirmar)
+
+    async def fechar(self):
+        await self.confirmar()
+        await self._ler(self.manager.fechar)
+
+    # --- leitura ---
+    async def obter_postagem(self, id_postagem):
+        return await self._ler(self.manager.obter_postagem, id_postagem)
+
+    async def obter_resposta(self, id_resposta):
+        return await self._ler(self.manager.obter_resposta, id_resposta)
+
+    async def top_respostas(self, id_postagem, k=10):
+        return await self._ler(self.manager.top_respostas, id_postagem, k)
+
+    async def top_respostas_do_topico(self, titulo_topico, k=10):
+        return await self._ler(self.manager.top_respostas_do_topico, titulo_topico, k)
+
+    async def posicao_da_resposta(self, id_resposta, no_topico=False):
+        return await self._ler(self.manager.posicao_da_resposta, id_resposta, no_topico)
+
+    async def pesquisar(self, consulta, limite=10, tipos=None):
+        return await self._ler(self.manager.pesquisar, consulta, limite, tipos)
+
+    async def curtidas_do_usuario(self, nome_usuario, ids_respostas):
+        return await self._ler(self.manager.curtidas_do_usuario, nome_usuario, ids_respostas)
+
+    async def paginar_linha_do_tempo(self, nome_usuario, limite=20, cursor=None):
+        return await self._ler(self.manager.paginar_linha_do_tempo, nome_usuario, limite, cursor)
+
+    def iterar_topicos(self, recentes=False):
+        return self._iterar(self.manager.paginar_topicos, recentes)
+
+    def iterar_postagens(self, titulo_topico, recentes=False):
+        return self._iterar(partial(self.manager.paginar_postagens, titulo_topico), recentes)
+
+    def iterar_respostas(self, id_postagem, recentes=False):
+        return self._iterar(partial(self.manager.paginar_respostas, id_postagem), recentes)
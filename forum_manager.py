@@ -1,9 +1,122 @@
+import base64
+import gc
+import struct
+import sys
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from itertools import count, islice
+
+from eventos import (
+    ConteudoOcultado, DenunciaRegistrada, DuplicataSuspeita, FalhaOperacao, PostagemAdicionada, PostagemEditada, PostagemRemovida,
+    RespostaAdicionada, RespostaRemovida, TopicoCriado, TopicoRemovido, TopicoRenomeado, UsuarioRegistrado,
+    publicar,
+)
+from antispam import REJEITAR, SINALIZAR, IndiceDuplicatas
+from busca import POSTAGEM, RESPOSTA, TOPICO, IndiceTextual, ResultadoBusca, texto_topico
+from curtidas import RegistroCurtidas
+from denuncias import LIMITADA, MSG_DENUNCIAS_EXCEDIDAS, OCULTADA, REPETIDA, RegistroDenuncias, registro_denuncias
+from estruturas import SkipListIndexada
+from fila_moderacao import FilaModeracao
+from limitador import ADICIONAR_POSTAGEM, CRIAR_TOPICO, RESPONDER_POSTAGEM, LimitadorEscrita, papel_de
+from repositorio import RepositorioMemoria
+from timeline import LinhaDoTempo
+
+
+# Travas compartilhadas por faixas de objetos: evita uma trava por resposta,
+# que são os objetos mais numerosos do fórum.
+_TRAVAS_FAIXAS = tuple(threading.RLock() for _ in range(64))
+
+def _trava_de(objeto):
+    return _TRAVAS_FAIXAS[(id(objeto) >> 4) % len(_TRAVAS_FAIXAS)]
+
+class ListaEstavel:
+    # Lista só de acréscimo: a posição de cada item nunca muda e a remoção
+    # deixa uma lacuna (None) em vez de deslocar o restante da thread.
+    __slots__ = ("_itens", "_removidos")
+
+    def __init__(self):
+        self._itens = []
+        self._removidos = 0
+
+    def append(self, item):
+        self._itens.append(item)
+        return len(self._itens) - 1
+
+    def inserir_em(self, posicao, item):
+        # Usado ao carregar do armazenamento: as lacunas de itens já removidos
+        # são recriadas para que as posições continuem as mesmas.
+        self.reservar(posicao)
+        self._itens.append(item)
+
+    def reservar(self, tamanho):
+        # Lacunas no fim, de itens removidos depois do último que restou: o
+        # próximo append continua de `tamanho` em vez de reusar as posições.
+        lacunas = tamanho - len(self._itens)
+        if lacunas > 0:
+            self._itens.extend([None] * lacunas)
+            self._removidos += lacunas
+
+    def remover(self, posicao):
+        if self._itens[posicao] is not None:
+            self._itens[posicao] = None
+            self._removidos += 1
+
+    def posicoes(self):
+        return ((i, item) for i, item in enumerate(self._itens) if item is not None)
+
+    def a_partir_de(self, posicao=None, recentes=False):
+        # (posição, item) a partir de `posicao`, inclusive, sem percorrer o que
+        # vem antes; sem posição, começa do início (ou do fim, se `recentes`).
+        itens = self._itens
+        if recentes:
+            inicio = len(itens) - 1 if posicao is None else min(posicao, len(itens) - 1)
+            faixa = range(inicio, -1, -1)
+        else:
+            faixa = range(posicao or 0, len(itens))
+        for i in faixa:
+            item = itens[i]
+            if item is not None:
+                yield i, item
+
+    def __getitem__(self, posicao):
+        item = self._itens[posicao]
+        if item is None:
+            raise IndexError("posição removida")
+        return item
+
+    def __iter__(self):
+        return (item for item in self._itens if item is not None)
+
+    def __reversed__(self):
+        return (item for item in reversed(self._itens) if item is not None)
+
+    def __len__(self):
+        return len(self._itens) - self._removidos
+
+    def proxima_posicao(self):
+        # Inclui as lacunas do fim: é o que reservar() recebe ao recarregar.
+        return len(self._itens)
+
+    def __contains__(self, item):
+        return item is not None and item in self._itens
+
+def _internar(valor):
+    return sys.intern(valor) if type(valor) is str else valor
+
+# === Modelos ===
+# Os modelos usam __slots__: sem __dict__ por instância, o que pesa sobretudo
+# nas respostas, de longe os objetos mais numerosos. O autor de cada item é uma
+# referência ao Usuario compartilhado (nunca uma cópia do nome), e valores muito
+# repetidos como nome de usuário, tipo e permissões são internados.
 class Usuario:
+    __slots__ = ("nome", "nome_usuario", "senha", "permissoes", "topicos_seguidos", "usuarios_seguidos")
+
     def __init__(self, nome, nome_usuario, senha, permissoes):
         self.nome = nome
-        self.nome_usuario = nome_usuario
+        self.nome_usuario = _internar(nome_usuario)
         self.senha = senha
-        self.permissoes = permissoes
+        self.permissoes = _internar(permissoes)
         self.topicos_seguidos = set()
         self.usuarios_seguidos = set()
 
@@ -13,38 +126,107 @@ class Usuario:
     def seguir_usuario(self, outro_usuario):
         self.usuarios_seguidos.add(outro_usuario)
 
+    def deixar_de_seguir_topico(self, topico):
+        self.topicos_seguidos.discard(topico)
+
+    def deixar_de_seguir_usuario(self, outro_usuario):
+        self.usuarios_seguidos.discard(outro_usuario)
+
     def curtir_resposta(self, resposta):
         resposta.curtir()
 
-    def denunciar_resposta(self, resposta):
-        resposta.denunciar()
+    def descurtir_resposta(self, resposta):
+        resposta.descurtir()
+
+    def denunciar_resposta(self, resposta, registro=None):
+        return resposta.denunciar(self, registro)
 
     def __str__(self):
         return f'@{self.nome_usuario}'
 
+def _chave_denuncia(resposta):
+    return ("resposta", resposta.id if resposta.id is not None else resposta)
+
 class Resposta:
-    def __init__(self, conteudo, autor):
+    __slots__ = ("id", "conteudo", "autor", "quantidade_likes", "postagem", "posicao", "oculta")
+
+    def __init__(self, conteudo, autor, id=None):
+        self.id = id
         self.conteudo = conteudo
         self.autor = autor
         self.quantidade_likes = 0
+        self.postagem = None
+        self.posicao = None
+        self.oculta = False
+
+    @property
+    def trava(self):
+        return _trava_de(self)
 
     def curtir(self):
-        self.quantidade_likes += 1
+        with self.trava:
+            self.quantidade_likes += 1
+
+    def descurtir(self):
+        with self.trava:
+            if self.quantidade_likes > 0:
+                self.quantidade_likes -= 1
 
-    def denunciar(self):
-        print(f"Resposta de {self.autor} denunciada.")
+    def denunciar(self, denunciante=None, registro=None):
+        # Devolve o resultado do registro; denúncias de quem passou do limite
+        # são recusadas e não contam, e a repetição de quem já denunciou esta
+        # resposta na janela é ignorada.
+        nome_denunciante = denunciante.nome_usuario if denunciante else None
+        registro = registro or registro_denuncias()
+        resultado = registro.registrar(_chave_denuncia(self), nome_denunciante)
+        if resultado == LIMITADA:
+            publicar(FalhaOperacao("denunciar", MSG_DENUNCIAS_EXCEDIDAS))
+            return resultado
+        if resultado == REPETIDA:
+            return resultado
+        publicar(DenunciaRegistrada("resposta", self.id, self.autor.nome_usuario, nome_denunciante))
+        if resultado == OCULTADA:
+            self.oculta = True
+            publicar(ConteudoOcultado("resposta", self.id))
+        return resultado
 
     def __str__(self):
         return f'Resposta({self.conteudo[:30]}...)'
 
 class Postagem:
-    def __init__(self, autor, texto):
+    __slots__ = ("id", "autor", "texto", "_respostas", "_carregar_respostas", "topico", "posicao")
+
+    def __init__(self, autor, texto, id=None):
+        self.id = id
         self.autor = autor
         self.texto = texto
-        self.respostas = []
+        self._respostas = ListaEstavel()
+        self._carregar_respostas = None
+        self.topico = None
+        self.posicao = None
+
+    @property
+    def respostas_carregadas(self):
+        return self._carregar_respostas is None
+
+    @property
+    def respostas(self):
+        if self._carregar_respostas is not None:
+            # A trava do tópico (e não a da faixa) evita inverter a ordem
+            # tópico -> faixa usada pelas operações do manager.
+            with self.topico.trava if self.topico is not None else _trava_de(self):
+                if self._carregar_respostas is not None:
+                    self._carregar_respostas(self)
+                    self._carregar_respostas = None
+        return self._respostas
 
     def adicionar_resposta(self, resposta):
-        self.respostas.append(resposta)
+        resposta.postagem = self
+        resposta.posicao = self.respostas.append(resposta)
+
+    def remover_resposta(self, resposta):
+        self.respostas.remover(resposta.posicao)
+        resposta.postagem = None
 
     def editar_postagem(self, novo_texto):
         self.texto = novo_texto
@@ -53,87 +235,1105 @@ class Postagem:
         return f'Postagem de {self.autor}: {self.texto[:40]}...'
 
 class Topico:
-    def __init__(self, titulo, autor, tipo, descricao):
+    __slots__ = ("id", "titulo", "autor", "tipo", "descricao", "_postagens", "_carregar_postagens", "posicao", "trava",
+                 "moderadores")
+
+    def __init__(self, titulo, autor, tipo, descricao, id=None):
+        self.id = id
         self.titulo = titulo
         self.autor = autor
-        self.tipo = tipo
+        self.tipo = _internar(tipo)
         self.descricao = descricao
-        self.postagens = []
+        self._postagens = ListaEstavel()
+        self._carregar_postagens = None
+        self.posicao = None
+        self.trava = threading.RLock()
+        self.moderadores = None  # lista criada por designar_moderador()
+
+    @property
+    def postagens_carregadas(self):
+        return self._carregar_postagens is None
+
+    @property
+    def postagens(self):
+        if self._carregar_postagens is not None:
+            with self.trava:
+                if self._carregar_postagens is not None:
+                    self._carregar_postagens(self)
+                    self._carregar_postagens = None
+        return self._postagens
 
     def adicionar_postagem(self, postagem):
-        self.postagens.append(postagem)
+        postagem.topico = self
+        postagem.posicao = self.postagens.append(postagem)
+
+    def remover_postagem(self, postagem):
+        self.postagens.remover(postagem.posicao)
+        postagem.topico = None
 
     def __str__(self):
         return f'Tópico: {self.titulo} ({self.tipo})'
 
+class IndiceTopicos:
+    def __init__(self):
+        self.por_id = {}
+        self.por_titulo = {}
+        self.por_autor = {}
+        self.por_tipo = {}
+
+    def adicionar(self, topico):
+        self.por_id[topico.id] = topico
+        self.por_titulo[topico.titulo] = topico
+        # dicts usados como conjuntos ordenados: remoção em O(1) e ordem de criação preservada
+        self.por_autor.setdefault(topico.autor.nome_usuario, {})[topico] = None
+        self.por_tipo.setdefault(topico.tipo, {})[topico] = None
+
+    def remover(self, topico):
+        self.por_id.pop(topico.id, None)
+        self.por_titulo.pop(topico.titulo, None)
+        self._remover_de(self.por_autor, topico.autor.nome_usuario, topico)
+        self._remover_de(self.por_tipo, topico.tipo, topico)
+
+    def renomear(self, topico, novo_titulo):
+        del self.por_titulo[topico.titulo]
+        topico.titulo = novo_titulo
+        self.por_titulo[novo_titulo] = topico
+
+    def buscar(self, titulo):
+        return self.por_titulo.get(titulo)
+
+    def do_autor(self, nome_usuario):
+        return list(self.por_autor.get(nome_usuario, ()))
+
+    def do_tipo(self, tipo):
+        return list(self.por_tipo.get(tipo, ()))
+
+    @staticmethod
+    def _remover_de(indice, chave, topico):
+        grupo = indice.get(chave)
+        if grupo is None:
+            return
+        grupo.pop(topico, None)
+        if not grupo:
+            del indice[chave]
+
+class RankingCurtidas:
+    # Respostas com pelo menos um like, em ordem de (-likes, id): uma skip list
+    # por postagem e outra agregando o tópico todo. Um like move a resposta em
+    # O(log n) nas duas; respostas sem likes ficam de fora, então threads sem
+    # likes não custam nada. Quem chama segura a trava do tópico.
+    def __init__(self):
+        self.por_postagem = {}
+        self.por_topico = {}
+
+    def atualizar(self, resposta, likes_anteriores):
+        self._mover(resposta, likes_anteriores, resposta.quantidade_likes)
+
+    def remover_resposta(self, resposta):
+        self._mover(resposta, resposta.quantidade_likes, 0)
+
+    def _mover(self, resposta, likes_anteriores, likes_atuais):
+        postagem = resposta.postagem
+        if postagem is None or postagem.topico is None:
+            return
+        for grupo, chave in ((self.por_postagem, postagem.id), (self.por_topico, postagem.topico.id)):
+            lista = grupo.get(chave)
+            if likes_anteriores > 0 and lista is not None:
+                lista.remover((-likes_anteriores, resposta.id))
+            if likes_atuais > 0:
+                if lista is None:
+                    lista = grupo[chave] = SkipListIndexada()
+                lista.inserir((-likes_atuais, resposta.id), resposta)
+            elif lista is not None and not lista:
+                del grupo[chave]
+
+    def remover_postagem(self, postagem):
+        lista = self.por_postagem.pop(postagem.id, None)
+        do_topico = self.por_topico.get(postagem.topico.id)
+        if lista is None or do_topico is None:
+            return
+        for chave, _ in lista:
+            do_topico.remover(chave)
+        if not do_topico:
+            del self.por_topico[postagem.topico.id]
+
+    def remover_topico(self, topico):
+        self.por_topico.pop(topico.id, None)
+        for postagem in topico._postagens:
+            self.por_postagem.pop(postagem.id, None)
+
+    def primeiras(self, grupo, chave, quantidade, visivel=None):
+        # Com `visivel`, as que não passam no filtro são puladas e o ranking
+        # segue adiante até completar `quantidade`.
+        lista = grupo.get(chave)
+        if not lista:
+            return []
+        if visivel is None:
+            return [resposta for _, resposta in lista.primeiros(quantidade)]
+        return list(islice((resposta for _, resposta in lista if visivel(resposta)), quantidade))
+
+    def posicao(self, grupo, chave, resposta):
+        lista = grupo.get(chave)
+        if not lista or resposta.quantidade_likes == 0:
+            return None
+        return lista.posicao((-resposta.quantidade_likes, resposta.id))
+
+class FalhaLote:
+    def __init__(self, indice, registro, motivo):
+        self.indice = indice
+        self.registro = registro
+        self.motivo = motivo
+
+    def __repr__(self):
+        return f'FalhaLote(#{self.indice}: {self.motivo})'
+
+class ResultadoLote:
+    def __init__(self):
+        self.inseridos = 0
+        self.falhas = []
+
+    @property
+    def total(self):
+        return self.inseridos + len(self.falhas)
+
+    def __repr__(self):
+        return f'ResultadoLote(inseridos={self.inseridos}, falhas={len(self.falhas)})'
+
+# === Paginação ===
+class Pagina:
+    def __init__(self, itens, proximo_cursor):
+        self.itens = itens
+        self.proximo_cursor = proximo_cursor
+
+    @property
+    def ultima(self):
+        return self.proximo_cursor is None
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+    def __repr__(self):
+        return f'Pagina(itens={len(self.itens)}, ultima={self.ultima})'
+
+# O cursor é opaco para quem lista: guarda a ordem e a posição estável (na
+# ListaEstavel) do primeiro item da próxima página; na linha do tempo, a
+# sequência de publicação do último item entregue. Como posições nunca mudam,
+# inserções e remoções entre uma página e outra não pulam nem repetem itens.
+_CURSOR = struct.Struct("<BQ")
+
+def _codificar_cursor(posicao, recentes):
+    return base64.urlsafe_b64encode(_CURSOR.pack(recentes, posicao)).decode("ascii")
+
+def _decodificar_cursor(cursor):
+    try:
+        recentes, posicao = _CURSOR.unpack(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError, struct.error):
+        return None
+    if recentes > 1:
+        return None
+    return posicao, bool(recentes)
+
+def _visivel(resposta):
+    return not resposta.oculta
+
+def _somente_itens(inicio):
+    return (item for _, item in inicio[0]) if inicio else iter(())
+
+def _campos(registro, nomes, padroes=(), anulaveis=()):
+    # Registros em lote podem vir como tuplas (ou listas) na ordem dos
+    # parâmetros do método equivalente ou como mapeamentos com os mesmos nomes.
+    # Todo campo precisa ser str (ou None, se estiver em `anulaveis`): um valor
+    # de outro tipo só estouraria no meio do lote, com parte dele já aplicada.
+    obrigatorios = len(nomes) - len(padroes)
+    if type(registro) is tuple and len(registro) == len(nomes):
+        valores = registro
+    elif isinstance(registro, Mapping):
+        valores = tuple(registro[n] for n in nomes[:obrigatorios]) + tuple(
+            registro.get(n, p) for n, p in zip(nomes[obrigatorios:], padroes))
+    elif isinstance(registro, (tuple, list)) and obrigatorios <= len(registro) <= len(nomes):
+        valores = tuple(registro) + padroes[len(padroes) - (len(nomes) - len(registro)):]
+    else:
+        raise ValueError("registro inválido")
+    for nome, valor in zip(nomes, valores):
+        if not isinstance(valor, str) and (valor is not None or nome not in anulaveis):
+            raise TypeError(f"campo inválido: {nome}")
+    return valores
+
+@contextmanager
+def _sem_coleta_de_lixo():
+    # Ingestão em lote cria milhões de objetos que nunca formam ciclos; sem isso
+    # o coletor geracional varre o heap inteiro repetidas vezes durante a carga.
+    estava_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if estava_ativo:
+            gc.enable()
+
+MSG_USUARIO_EXISTENTE = "Nome de usuário já existe."
+MSG_USUARIO_NAO_ENCONTRADO = "Usuário não encontrado."
+MSG_TOPICO_EXISTENTE = "Já existe um tópico com esse título."
+MSG_TOPICO_NAO_ENCONTRADO = "Tópico não encontrado."
+MSG_POSTAGEM_NAO_ENCONTRADA = "Postagem não encontrada."
+MSG_RESPOSTA_NAO_ENCONTRADA = "Resposta não encontrada."
+MSG_REGISTRO_INVALIDO = "Registro inválido."
+MSG_CURSOR_INVALIDO = "Cursor de paginação inválido."
+MSG_CONTEUDO_DUPLICADO = "Conteúdo muito parecido com uma publicação recente."
+MSG_LIMITE_EXCEDIDO = "Muitas publicações em pouco tempo; tente mais tarde."
+MSG_CONCESSAO_VENCIDA = "O prazo para moderar este item venceu."
+
 class ComunidadeCafeManager:
     _instancia = None
+    _trava_instancia = threading.Lock()
 
+    # Concorrência: o registro de usuários e o conjunto de tópicos têm uma trava
+    # cada; tudo dentro de uma thread (postagens, respostas, remoções) usa a
+    # trava do próprio tópico, então escritas em tópicos diferentes não se
+    # bloqueiam. Likes usam a trava por faixa da resposta. Os contadores de id
+    # (itertools.count) e as operações simples em dict já são atômicos no CPython.
     def __new__(cls):
         if cls._instancia is None:
-            cls._instancia = super(ComunidadeCafeManager, cls).__new__(cls)
-            cls._instancia._inicializar()
+            with cls._trava_instancia:
+                if cls._instancia is None:
+                    instancia = super(ComunidadeCafeManager, cls).__new__(cls)
+                    instancia._inicializar()
+                    cls._instancia = instancia
         return cls._instancia
 
-    def _inicializar(self):
+    def _inicializar(self, repositorio=None):
         self.usuarios = {}
-        self.topicos = []
+        self.topicos = ListaEstavel()
+        self.indice_topicos = IndiceTopicos()
+        self.postagens_por_id = {}
+        self.respostas_por_id = {}
+        self.indice_textual = IndiceTextual()
+        self.ranking_curtidas = RankingCurtidas()
+        self.curtidas = RegistroCurtidas()
+        self.denuncias = RegistroDenuncias()
+        # Respostas denunciadas esperam aqui pela decisão de um moderador.
+        self.fila_moderacao = FilaModeracao()
+        # Quase-duplicatas são sinalizadas com um evento ou, com REJEITAR,
+        # recusadas antes de qualquer mudança.
+        self.antispam = IndiceDuplicatas()
+        self.politica_spam = SINALIZAR
+        # Limite de escritas por usuário e operação; None desliga.
+        self.limitador = LimitadorEscrita()
+        self.linha_do_tempo = LinhaDoTempo()
+        self._trava_usuarios = threading.Lock()
+        self._trava_topicos = threading.RLock()
+        self._repositorio = repositorio or RepositorioMemoria()
+        ultimo_topico, ultima_postagem, ultima_resposta = self._repositorio.maiores_ids()
+        self._ids_topicos = count(ultimo_topico + 1)
+        self._ids_postagens = count(ultima_postagem + 1)
+        self._ids_respostas = count(ultima_resposta + 1)
+        self._carregar_do_repositorio()
+        self._repositorio.anexar(self)
+
+    def usar_repositorio(self, repositorio):
+        self._repositorio.fechar()
+        self._inicializar(repositorio)
+
+    def confirmar(self):
+        self._repositorio.confirmar()
+
+    def gravar_snapshot(self):
+        self._repositorio.gravar_snapshot(self)
+
+    def fechar(self):
+        self._repositorio.fechar()
+
+    # --- carregamento a partir do repositório ---
+    def _carregar_do_repositorio(self):
+        repositorio = self._repositorio
+        for nome, nome_usuario, senha, permissoes in repositorio.carregar_usuarios():
+            self.usuarios[nome_usuario] = Usuario(nome, nome_usuario, senha, permissoes)
+        for nome_usuario, id_resposta in repositorio.carregar_curtidas():
+            self.curtidas.adicionar(nome_usuario, id_resposta)
+
+        # Só os cabeçalhos dos tópicos ficam em memória; postagens e respostas
+        # são lidas na primeira vez que alguém acessa a thread.
+        for id_topico, titulo, nome_usuario, tipo, descricao in repositorio.carregar_topicos():
+            topico = Topico(titulo, self.usuarios[nome_usuario], tipo, descricao, id=id_topico)
+            topico._carregar_postagens = self._carregar_postagens
+            topico.posicao = self.topicos.append(topico)
+            self.indice_topicos.adicionar(topico)
+            self.indice_textual.indexar(TOPICO, id_topico, texto_topico(topico))
+
+    def _carregar_postagens(self, topico):
+        repositorio = self._repositorio
+        for id_postagem, posicao, nome_usuario, texto in repositorio.carregar_postagens(topico.id):
+            postagem = Postagem(self.usuarios[nome_usuario], texto, id=id_postagem)
+            postagem.topico = topico
+            postagem.posicao = posicao
+            postagem._carregar_respostas = self._carregar_respostas
+            topico._postagens.inserir_em(posicao, postagem)
+            self.postagens_por_id[id_postagem] = postagem
+            self.indice_textual.indexar(POSTAGEM, id_postagem, texto)
+        topico._postagens.reservar(repositorio.proxima_posicao_postagens(topico.id))
+
+    def _carregar_respostas(self, postagem):
+        repositorio = self._repositorio
+        for id_resposta, posicao, nome_usuario, conteudo, likes in repositorio.carregar_respostas(postagem.id):
+            resposta = Resposta(conteudo, self.usuarios[nome_usuario], id=id_resposta)
+            resposta.quantidade_likes = likes
+            resposta.postagem = postagem
+            resposta.posicao = posicao
+            postagem._respostas.inserir_em(posicao, resposta)
+            self.respostas_por_id[id_resposta] = resposta
+            self.indice_textual.indexar(RESPOSTA, id_resposta, conteudo)
+            if likes:
+                self.ranking_curtidas.atualizar(resposta, 0)
+        postagem._respostas.reservar(repositorio.proxima_posicao_respostas(postagem.id))
 
     def registrar_usuario(self, nome, nome_usuario, senha, permissoes="padrão"):
-        if nome_usuario not in self.usuarios:
+        with self._trava_usuarios:
+            if nome_usuario in self.usuarios:
+                publicar(FalhaOperacao("registrar_usuario", MSG_USUARIO_EXISTENTE))
+                return
+
             usuario = Usuario(nome, nome_usuario, senha, permissoes)
             self.usuarios[nome_usuario] = usuario
-            print(f"Usuário @{nome_usuario} registrado com sucesso.")
-        else:
-            print("Nome de usuário já existe.")
+            self._repositorio.salvar_usuario(usuario)
+        publicar(UsuarioRegistrado(nome_usuario))
+        return usuario
+
+    def registrar_usuarios_em_lote(self, registros):
+        resultado = ResultadoLote()
+        usuarios = self.usuarios
+        repositorio = self._repositorio
+        salvar = repositorio.salvar_usuario
+        nomes = ("nome", "nome_usuario", "senha", "permissoes")
+        with self._trava_usuarios, _sem_coleta_de_lixo():
+            for indice, registro in enumerate(registros):
+                try:
+                    nome, nome_usuario, senha, permissoes = _campos(registro, nomes, ("padrão",))
+                except (TypeError, ValueError, KeyError):
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_REGISTRO_INVALIDO))
+                    continue
+
+                if nome_usuario in usuarios:
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_USUARIO_EXISTENTE))
+                    continue
+
+                usuario = usuarios[nome_usuario] = Usuario(nome, nome_usuario, senha, permissoes)
+                salvar(usuario)
+                resultado.inseridos += 1
+        repositorio.confirmar()
+        return resultado
 
     def criar_topico(self, titulo, nome_usuario, tipo, descricao):
         if nome_usuario not in self.usuarios:
-            print("Usuário não encontrado.")
+            publicar(FalhaOperacao("criar_topico", MSG_USUARIO_NAO_ENCONTRADO))
             return
 
         autor = self.usuarios[nome_usuario]
-        topico = Topico(titulo, autor, tipo, descricao)
-        self.topicos.append(topico)
-        print(f"Tópico '{titulo}' criado por @{nome_usuario}.")
+        if not self._dentro_do_limite("criar_topico", CRIAR_TOPICO, autor):
+            return
+
+        with self._trava_topicos:
+            if self.indice_topicos.buscar(titulo):
+                publicar(FalhaOperacao("criar_topico", MSG_TOPICO_EXISTENTE))
+                return
+
+            topico = Topico(titulo, autor, tipo, descricao, id=next(self._ids_topicos))
+            topico.posicao = self.topicos.append(topico)
+            self.indice_topicos.adicionar(topico)
+            self.indice_textual.indexar(TOPICO, topico.id, texto_topico(topico))
+            self._repositorio.salvar_topico(topico)
+        publicar(TopicoCriado(topico.id, titulo, nome_usuario))
+        return topico
+
+    def criar_topicos_em_lote(self, registros):
+        resultado = ResultadoLote()
+        usuarios = self.usuarios
+        indice_topicos = self.indice_topicos
+        repositorio = self._repositorio
+        salvar = repositorio.salvar_topico
+        indexar = self.indice_textual.indexar
+        nomes = ("titulo", "nome_usuario", "tipo", "descricao")
+        with self._trava_topicos, _sem_coleta_de_lixo():
+            for indice, registro in enumerate(registros):
+                try:
+                    titulo, nome_usuario, tipo, descricao = _campos(registro, nomes, anulaveis=("tipo", "descricao"))
+                except (TypeError, ValueError, KeyError):
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_REGISTRO_INVALIDO))
+                    continue
+
+                autor = usuarios.get(nome_usuario)
+                if autor is None:
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_USUARIO_NAO_ENCONTRADO))
+                    continue
+
+                if titulo in indice_topicos.por_titulo:
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_TOPICO_EXISTENTE))
+                    continue
+
+                topico = Topico(titulo, autor, tipo, descricao, id=next(self._ids_topicos))
+                topico.posicao = self.topicos.append(topico)
+                indice_topicos.adicionar(topico)
+                indexar(TOPICO, topico.id, texto_topico(topico))
+                salvar(topico)
+                resultado.inseridos += 1
+        repositorio.confirmar()
+        return resultado
+
+    def renomear_topico(self, titulo_atual, novo_titulo):
+        with self._trava_topicos:
+            topico = self.indice_topicos.buscar(titulo_atual)
+            if not topico:
+                publicar(FalhaOperacao("renomear_topico", MSG_TOPICO_NAO_ENCONTRADO))
+                return
+
+            if self.indice_topicos.buscar(novo_titulo):
+                publicar(FalhaOperacao("renomear_topico", MSG_TOPICO_EXISTENTE))
+                return
+
+            texto_anterior = texto_topico(topico)
+            self.indice_topicos.renomear(topico, novo_titulo)
+            self.indice_textual.reindexar(TOPICO, topico.id, texto_anterior, texto_topico(topico))
+            self._repositorio.renomear_topico(topico)
+        publicar(TopicoRenomeado(topico.id, titulo_atual, novo_titulo))
         return topico
 
+    def remover_topico(self, titulo):
+        with self._trava_topicos:
+            topico = self.indice_topicos.buscar(titulo)
+            if not topico:
+                publicar(FalhaOperacao("remover_topico", MSG_TOPICO_NAO_ENCONTRADO))
+                return
+
+            with topico.trava:
+                self.indice_topicos.remover(topico)
+                self.topicos.remover(topico.posicao)
+                self.indice_textual.remover(TOPICO, topico.id, texto_topico(topico))
+                self.ranking_curtidas.remover_topico(topico)
+                for seguidor in self.linha_do_tempo.remover_origem(topico):
+                    seguidor.deixar_de_seguir_topico(topico)
+                for postagem in topico._postagens:
+                    self._desindexar_postagem(postagem)
+                self._repositorio.remover_topico(topico)
+        publicar(TopicoRemovido(topico.id, titulo))
+        return topico
+
+    def topicos_do_autor(self, nome_usuario):
+        return self.indice_topicos.do_autor(nome_usuario)
+
+    def topicos_do_tipo(self, tipo):
+        return self.indice_topicos.do_tipo(tipo)
+
+    def obter_postagem(self, id_postagem):
+        postagem = self.postagens_por_id.get(id_postagem)
+        if postagem is None and self._repositorio.carregamento_preguicoso:
+            topico = self.indice_topicos.por_id.get(self._repositorio.localizar_postagem(id_postagem))
+            if topico is not None:
+                topico.postagens  # dispara o carregamento preguiçoso da thread
+                postagem = self.postagens_por_id.get(id_postagem)
+        return postagem
+
+    def obter_resposta(self, id_resposta):
+        resposta = self.respostas_por_id.get(id_resposta)
+        if resposta is None and self._repositorio.carregamento_preguicoso:
+            postagem = self.obter_postagem(self._repositorio.localizar_resposta(id_resposta))
+            if postagem is not None:
+                postagem.respostas  # dispara o carregamento preguiçoso das respostas
+                resposta = self.respostas_por_id.get(id_resposta)
+        return resposta
+
     def adicionar_postagem(self, titulo_topico, nome_usuario, texto):
-        topico = next((t for t in self.topicos if t.titulo == titulo_topico), None)
+        topico = self.indice_topicos.buscar(titulo_topico)
         if not topico:
-            print("Tópico não encontrado.")
+            publicar(FalhaOperacao("adicionar_postagem", MSG_TOPICO_NAO_ENCONTRADO))
             return
 
         if nome_usuario not in self.usuarios:
-            print("Usuário não encontrado.")
+            publicar(FalhaOperacao("adicionar_postagem", MSG_USUARIO_NAO_ENCONTRADO))
             return
 
         autor = self.usuarios[nome_usuario]
-        postagem = Postagem(autor, texto)
-        topico.adicionar_postagem(postagem)
-        print(f"Postagem adicionada ao tópico '{titulo_topico}' por @{nome_usuario}.")
+        if not self._dentro_do_limite("adicionar_postagem", ADICIONAR_POSTAGEM, autor):
+            return
+
+        duplicata = self._checar_duplicata("adicionar_postagem", texto)
+        if duplicata is None:
+            return
+
+        postagem = Postagem(autor, texto, id=next(self._ids_postagens))
+        with topico.trava:
+            if not self._topico_ativo(topico):
+                publicar(FalhaOperacao("adicionar_postagem", MSG_TOPICO_NAO_ENCONTRADO))
+                return
+
+            topico.adicionar_postagem(postagem)
+            self.postagens_por_id[postagem.id] = postagem
+            self.indice_textual.indexar(POSTAGEM, postagem.id, texto)
+            self._repositorio.salvar_postagem(postagem)
+        self.linha_do_tempo.distribuir(postagem, (autor, topico), autor)
+        publicar(PostagemAdicionada(postagem.id, titulo_topico, nome_usuario))
+        self._registrar_duplicata(POSTAGEM, postagem.id, *duplicata)
         return postagem
 
+    def adicionar_postagens_em_lote(self, registros):
+        # Mesmas regras de adicionar_postagem (tópico ativo sob a trava dele,
+        # quase-duplicatas pela política atual, distribuição na linha do
+        # tempo), com as falhas reunidas no resultado em vez de publicadas.
+        # Carga/migração: não passa pelo limitador de escrita nem publica
+        # PostagemAdicionada por postagem.
+        resultado = ResultadoLote()
+        usuarios = self.usuarios
+        por_titulo = self.indice_topicos.por_titulo
+        postagens_por_id = self.postagens_por_id
+        ids_postagens = self._ids_postagens
+        repositorio = self._repositorio
+        salvar = repositorio.salvar_postagem
+        indexar = self.indice_textual.indexar
+        antispam, rejeitar = self.antispam, self.politica_spam == REJEITAR
+        distribuir = self.linha_do_tempo.distribuir
+        nomes = ("titulo_topico", "nome_usuario", "texto")
+        with _sem_coleta_de_lixo():
+            for indice, registro in enumerate(registros):
+                try:
+                    titulo_topico, nome_usuario, texto = _campos(registro, nomes)
+                except (TypeError, ValueError, KeyError):
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_REGISTRO_INVALIDO))
+                    continue
+
+                topico = por_titulo.get(titulo_topico)
+                if topico is None:
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_TOPICO_NAO_ENCONTRADO))
+                    continue
+
+                autor = usuarios.get(nome_usuario)
+                if autor is None:
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_USUARIO_NAO_ENCONTRADO))
+                    continue
+
+                assinatura = antispam.assinatura(texto)
+                semelhante = antispam.semelhante(assinatura)
+                if semelhante is not None and rejeitar:
+                    antispam.renovar(semelhante[0])
+                    resultado.falhas.append(FalhaLote(indice, registro, MSG_CONTEUDO_DUPLICADO))
+                    continue
+
+                postagem = Postagem(autor, texto, id=next(ids_postagens))
+                with topico.trava:
+                    if not self._topico_ativo(topico):
+                        resultado.falhas.append(FalhaLote(indice, registro, MSG_TOPICO_NAO_ENCONTRADO))
+                        continue
+                    topico.adicionar_postagem(postagem)
+                    postagens_por_id[postagem.id] = postagem
+                    indexar(POSTAGEM, postagem.id, texto)
+                    salvar(postagem)
+                distribuir(postagem, (autor, topico), autor)
+                self._registrar_duplicata(POSTAGEM, postagem.id, assinatura, semelhante)
+                resultado.inseridos += 1
+        repositorio.confirmar()
+        return resultado
+
     def responder_postagem(self, titulo_topico, index_postagem, nome_usuario, conteudo_resposta):
-        topico = next((t for t in self.topicos if t.titulo == titulo_topico), None)
+        topico = self.indice_topicos.buscar(titulo_topico)
         if not topico:
-            print("Tópico não encontrado.")
+            publicar(FalhaOperacao("responder_postagem", MSG_TOPICO_NAO_ENCONTRADO))
             return
 
         if nome_usuario not in self.usuarios:
-            print("Usuário não encontrado.")
+            publicar(FalhaOperacao("responder_postagem", MSG_USUARIO_NAO_ENCONTRADO))
             return
 
         try:
             postagem = topico.postagens[index_postagem]
         except IndexError:
-            print("Postagem não encontrada.")
+            publicar(FalhaOperacao("responder_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return
+
+        return self._responder("responder_postagem", postagem, nome_usuario, conteudo_resposta)
+
+    def responder_postagem_por_id(self, id_postagem, nome_usuario, conteudo_resposta):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("responder_postagem_por_id", MSG_POSTAGEM_NAO_ENCONTRADA))
             return
 
+        if nome_usuario not in self.usuarios:
+            publicar(FalhaOperacao("responder_postagem_por_id", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        return self._responder("responder_postagem_por_id", postagem, nome_usuario, conteudo_resposta)
+
+    def _responder(self, operacao, postagem, nome_usuario, conteudo_resposta):
         autor = self.usuarios[nome_usuario]
-        resposta = Resposta(conteudo_resposta, autor)
-        postagem.adicionar_resposta(resposta)
-        print(f"Resposta adicionada por @{nome_usuario} à postagem #{index_postagem} em '{titulo_topico}'.")
+        if not self._dentro_do_limite(operacao, RESPONDER_POSTAGEM, autor):
+            return
+
+        duplicata = self._checar_duplicata(operacao, conteudo_resposta)
+        if duplicata is None:
+            return
+
+        resposta = Resposta(conteudo_resposta, autor, id=next(self._ids_respostas))
+        topico = postagem.topico
+        with self._trava_da_thread(topico):
+            # remover_topico não desliga as postagens do tópico; é o índice de
+            # tópicos, sob a mesma trava, que diz se a thread ainda existe.
+            if topico is None or postagem.topico is not topico or not self._topico_ativo(topico):
+                publicar(FalhaOperacao(operacao, MSG_POSTAGEM_NAO_ENCONTRADA))
+                return
+
+            postagem.adicionar_resposta(resposta)
+            self.respostas_por_id[resposta.id] = resposta
+            self.indice_textual.indexar(RESPOSTA, resposta.id, conteudo_resposta)
+            self._repositorio.salvar_resposta(resposta)
+        self.linha_do_tempo.distribuir(resposta, (autor, topico), autor)
+        publicar(RespostaAdicionada(resposta.id, postagem.id, postagem.posicao, topico.titulo, nome_usuario))
+        self._registrar_duplicata(RESPOSTA, resposta.id, *duplicata)
+        return resposta
+
+    def _dentro_do_limite(self, operacao, tipo_escrita, autor):
+        limitador = self.limitador
+        if limitador is None or limitador.permitir(autor.nome_usuario, tipo_escrita, papel_de(autor)):
+            return True
+        publicar(FalhaOperacao(operacao, MSG_LIMITE_EXCEDIDO))
+        return False
+
+    # --- quase-duplicatas ---
+    def _checar_duplicata(self, operacao, texto, chave=None):
+        # (assinatura, semelhante ou None); None se a política recusar o texto.
+        # `chave` é a do próprio conteúdo numa edição, que não conta como cópia.
+        assinatura = self.antispam.assinatura(texto)
+        semelhante = self.antispam.semelhante(assinatura, chave)
+        if semelhante is not None and self.politica_spam == REJEITAR:
+            self.antispam.renovar(semelhante[0])
+            publicar(FalhaOperacao(operacao, MSG_CONTEUDO_DUPLICADO))
+            return
+        return assinatura, semelhante
+
+    def _registrar_duplicata(self, tipo, id_conteudo, assinatura, semelhante):
+        # Numa edição, a assinatura do texto anterior sai do índice.
+        self.antispam.remover((tipo, id_conteudo))
+        if semelhante is None:
+            self.antispam.adicionar((tipo, id_conteudo), assinatura)
+            return
+        (tipo_semelhante, id_semelhante), similaridade = semelhante
+        self.antispam.renovar((tipo_semelhante, id_semelhante))
+        publicar(DuplicataSuspeita(tipo, id_conteudo, tipo_semelhante, id_semelhante, similaridade))
+
+    def curtir_resposta(self, id_resposta, nome_usuario):
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("curtir_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+
+        if nome_usuario not in self.usuarios:
+            publicar(FalhaOperacao("curtir_resposta", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        postagem = resposta.postagem
+        with self._trava_da_thread(postagem.topico if postagem else None):
+            if postagem is None or resposta.postagem is not postagem:
+                publicar(FalhaOperacao("curtir_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+                return
+
+            # Um like por usuário e resposta: curtir de novo não muda nada.
+            if not self.curtidas.adicionar(nome_usuario, id_resposta):
+                return resposta
+            likes_anteriores = resposta.quantidade_likes
+            self.usuarios[nome_usuario].curtir_resposta(resposta)
+            self.ranking_curtidas.atualizar(resposta, likes_anteriores)
+            self._repositorio.salvar_curtida(nome_usuario, resposta)
+            self._repositorio.atualizar_likes(resposta)
+        return resposta
+
+    def descurtir_resposta(self, id_resposta, nome_usuario):
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("descurtir_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+
+        if nome_usuario not in self.usuarios:
+            publicar(FalhaOperacao("descurtir_resposta", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        postagem = resposta.postagem
+        with self._trava_da_thread(postagem.topico if postagem else None):
+            if postagem is None or resposta.postagem is not postagem:
+                publicar(FalhaOperacao("descurtir_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+                return
+
+            if not self.curtidas.remover(nome_usuario, id_resposta):
+                return resposta
+            likes_anteriores = resposta.quantidade_likes
+            self.usuarios[nome_usuario].descurtir_resposta(resposta)
+            self.ranking_curtidas.atualizar(resposta, likes_anteriores)
+            self._repositorio.remover_curtida(nome_usuario, resposta)
+            self._repositorio.atualizar_likes(resposta)
+        return resposta
+
+    def curtidas_do_usuario(self, nome_usuario, ids_respostas):
+        # Para renderizar uma página: [True/False] indicando, na ordem dos ids,
+        # quais respostas o usuário já curtiu.
+        return self.curtidas.curtidas_em(nome_usuario, list(ids_respostas))
+
+    def denunciar_resposta(self, id_resposta, nome_usuario):
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("denunciar_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+
+        if nome_usuario not in self.usuarios:
+            publicar(FalhaOperacao("denunciar_resposta", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        resultado = self.usuarios[nome_usuario].denunciar_resposta(resposta, self.denuncias)
+        if resultado == LIMITADA:
+            return
+        postagem = resposta.postagem
+        if resultado != REPETIDA and postagem is not None:
+            # Cada denúncia contada sobe a prioridade do item na fila.
+            self.fila_moderacao.denunciar(resposta, postagem.topico)
+        return resposta
+
+    def reexibir_resposta(self, id_resposta):
+        # Um moderador desfaz a ocultação automática; a contagem recomeça.
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("reexibir_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+        self.denuncias.reexibir(_chave_denuncia(resposta))
+        self.fila_moderacao.descartar(resposta)
+        resposta.oculta = False
+        return resposta
+
+    # --- fila de moderação ---
+    def designar_moderador(self, titulo, moderador):
+        # As denúncias do tópico passam a ir para a fatia dos seus moderadores.
+        topico = self.indice_topicos.buscar(titulo)
+        if not topico:
+            publicar(FalhaOperacao("designar_moderador", MSG_TOPICO_NAO_ENCONTRADO))
+            return
+        with topico.trava:
+            if topico.moderadores is None:
+                topico.moderadores = []
+            if moderador not in topico.moderadores:
+                topico.moderadores.append(moderador)
+        self.fila_moderacao.adicionar_moderador(moderador)
+        return topico
+
+    def proxima_moderacao(self, moderador, duracao=None):
+        # O item fica com o moderador até concluir_moderacao() ou o prazo vencer.
+        return self.fila_moderacao.proximo(moderador, duracao)
+
+    def concluir_moderacao(self, item, moderador, remover=False):
+        # Remove a resposta ou a mantém, reexibindo-a se estava oculta.
+        if not self.fila_moderacao.concluir(item, moderador):
+            publicar(FalhaOperacao("concluir_moderacao", MSG_CONCESSAO_VENCIDA))
+            return
+        if remover:
+            return self.remover_resposta(item.alvo.id)
+        return self.reexibir_resposta(item.alvo.id)
+
+    def editar_postagem(self, id_postagem, novo_texto):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("editar_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return
+
+        duplicata = self._checar_duplicata("editar_postagem", novo_texto, (POSTAGEM, id_postagem))
+        if duplicata is None:
+            return
+
+        topico = postagem.topico
+        with self._trava_da_thread(topico):
+            if topico is None or postagem.topico is not topico:
+                publicar(FalhaOperacao("editar_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
+                return
+
+            texto_anterior = postagem.texto
+            postagem.editar_postagem(novo_texto)
+            self.indice_textual.reindexar(POSTAGEM, id_postagem, texto_anterior, novo_texto)
+            self._repositorio.atualizar_postagem(postagem)
+        publicar(PostagemEditada(id_postagem))
+        self._registrar_duplicata(POSTAGEM, id_postagem, *duplicata)
+        return postagem
+
+    def remover_postagem(self, id_postagem):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("remover_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return
+
+        topico = postagem.topico
+        with self._trava_da_thread(topico):
+            if topico is None or postagem.topico is not topico:
+                publicar(FalhaOperacao("remover_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
+                return
+
+            self.ranking_curtidas.remover_postagem(postagem)
+            topico.remover_postagem(postagem)
+            self._desindexar_postagem(postagem)
+            self._repositorio.remover_postagem(postagem)
+        publicar(PostagemRemovida(id_postagem))
+        return postagem
+
+    def remover_resposta(self, id_resposta):
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("remover_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+
+        postagem = resposta.postagem
+        with self._trava_da_thread(postagem.topico if postagem else None):
+            if postagem is None or resposta.postagem is not postagem:
+                publicar(FalhaOperacao("remover_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+                return
+
+            self.respostas_por_id.pop(id_resposta, None)
+            self.indice_textual.remover(RESPOSTA, id_resposta, resposta.conteudo)
+            self.ranking_curtidas.remover_resposta(resposta)
+            self.curtidas.remover_resposta(id_resposta)
+            self.denuncias.esquecer(_chave_denuncia(resposta))
+            self.fila_moderacao.descartar(resposta)
+            self.antispam.remover((RESPOSTA, id_resposta))
+            postagem.remover_resposta(resposta)
+            self._repositorio.remover_resposta(resposta)
+        publicar(RespostaRemovida(id_resposta))
+        return resposta
+
+    def _topico_ativo(self, topico):
+        return self.indice_topicos.por_id.get(topico.id) is topico
+
+    def _trava_da_thread(self, topico):
+        # Sem tópico (postagem já removida) a operação vai falhar logo em
+        # seguida; a trava por faixa só mantém o bloco `with` uniforme.
+        return topico.trava if topico is not None else _trava_de(self)
+
+    def _desindexar_postagem(self, postagem):
+        self.postagens_por_id.pop(postagem.id, None)
+        self.indice_textual.remover(POSTAGEM, postagem.id, postagem.texto)
+        self.antispam.remover((POSTAGEM, postagem.id))
+        # Threads ainda não carregadas do repositório não têm nada indexado; as
+        # curtidas das respostas delas ficam no registro, mas ids nunca são
+        # reaproveitados, então não são confundidas com as de outra resposta.
+        for resposta in postagem._respostas:
+            self.respostas_por_id.pop(resposta.id, None)
+            self.indice_textual.remover(RESPOSTA, resposta.id, resposta.conteudo)
+            self.curtidas.remover_resposta(resposta.id)
+            self.denuncias.esquecer(_chave_denuncia(resposta))
+            self.fila_moderacao.descartar(resposta)
+            self.antispam.remover((RESPOSTA, resposta.id))
+
+    # --- seguir e linha do tempo ---
+    def seguir_usuario(self, nome_usuario, nome_seguido):
+        usuario, seguido = self.usuarios.get(nome_usuario), self.usuarios.get(nome_seguido)
+        if usuario is None or seguido is None:
+            publicar(FalhaOperacao("seguir_usuario", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        usuario.seguir_usuario(seguido)
+        self.linha_do_tempo.seguir(usuario, seguido)
+        return seguido
+
+    def deixar_de_seguir_usuario(self, nome_usuario, nome_seguido):
+        usuario, seguido = self.usuarios.get(nome_usuario), self.usuarios.get(nome_seguido)
+        if usuario is None or seguido is None:
+            publicar(FalhaOperacao("deixar_de_seguir_usuario", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        usuario.deixar_de_seguir_usuario(seguido)
+        self.linha_do_tempo.deixar_de_seguir(usuario, seguido)
+        return seguido
+
+    def seguir_topico(self, nome_usuario, titulo_topico):
+        return self._seguir_topico("seguir_topico", nome_usuario, titulo_topico, True)
+
+    def deixar_de_seguir_topico(self, nome_usuario, titulo_topico):
+        return self._seguir_topico("deixar_de_seguir_topico", nome_usuario, titulo_topico, False)
+
+    def _seguir_topico(self, operacao, nome_usuario, titulo_topico, seguir):
+        usuario = self.usuarios.get(nome_usuario)
+        if usuario is None:
+            publicar(FalhaOperacao(operacao, MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        topico = self.indice_topicos.buscar(titulo_topico)
+        if not topico:
+            publicar(FalhaOperacao(operacao, MSG_TOPICO_NAO_ENCONTRADO))
+            return
+
+        # Sob a trava do tópico para não seguir um tópico sendo removido.
+        with topico.trava:
+            if not self._topico_ativo(topico):
+                publicar(FalhaOperacao(operacao, MSG_TOPICO_NAO_ENCONTRADO))
+                return
+
+            if seguir:
+                usuario.seguir_topico(topico)
+                self.linha_do_tempo.seguir(usuario, topico)
+            else:
+                usuario.deixar_de_seguir_topico(topico)
+                self.linha_do_tempo.deixar_de_seguir(usuario, topico)
+        return topico
+
+    def paginar_linha_do_tempo(self, nome_usuario, limite=20, cursor=None):
+        # Postagens e respostas recentes dos usuários e tópicos seguidos, da
+        # mais nova para a mais antiga. Só entra o que foi publicado depois de
+        # seguir; carga em lote e o histórico anterior à partida ficam de fora.
+        if limite < 1:
+            raise ValueError("limite deve ser positivo")
+        usuario = self.usuarios.get(nome_usuario)
+        if usuario is None:
+            publicar(FalhaOperacao("paginar_linha_do_tempo", MSG_USUARIO_NAO_ENCONTRADO))
+            return
+
+        antes = None
+        if cursor is not None:
+            decodificado = _decodificar_cursor(cursor)
+            if decodificado is None:
+                publicar(FalhaOperacao("paginar_linha_do_tempo", MSG_CURSOR_INVALIDO))
+                return
+            antes = decodificado[0]
+        itens, antes = self.linha_do_tempo.pagina(usuario, limite, antes, self._publicacao_ativa)
+        return Pagina(itens, None if antes is None else _codificar_cursor(antes, True))
+
+    def _publicacao_ativa(self, item):
+        if type(item) is Resposta:
+            return self.respostas_por_id.get(item.id) is item and _visivel(item)
+        return self.postagens_por_id.get(item.id) is item
+
+    # --- ranking de curtidas ---
+    def top_respostas(self, id_postagem, k=10):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("top_respostas", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return
+        with self._trava_da_thread(postagem.topico):
+            postagem.respostas  # garante que os likes da thread estão no ranking
+            return self.ranking_curtidas.primeiras(self.ranking_curtidas.por_postagem, id_postagem, k, _visivel)
+
+    def top_respostas_do_topico(self, titulo_topico, k=10):
+        topico = self.indice_topicos.buscar(titulo_topico)
+        if not topico:
+            publicar(FalhaOperacao("top_respostas_do_topico", MSG_TOPICO_NAO_ENCONTRADO))
+            return
+        with topico.trava:
+            # Num repositório preguiçoso, o agregado só fica completo com todas
+            # as respostas do tópico carregadas; depois disso, só o ranking é lido.
+            for postagem in topico.postagens:
+                postagem.respostas
+            return self.ranking_curtidas.primeiras(self.ranking_curtidas.por_topico, topico.id, k, _visivel)
+
+    def posicao_da_resposta(self, id_resposta, no_topico=False):
+        # Posição (a partir de 1) no ranking da postagem ou do tópico; None se
+        # a resposta ainda não tem likes.
+        resposta = self.obter_resposta(id_resposta)
+        if not resposta:
+            publicar(FalhaOperacao("posicao_da_resposta", MSG_RESPOSTA_NAO_ENCONTRADA))
+            return
+        postagem = resposta.postagem
+        topico = postagem.topico if postagem else None
+        if topico is None:
+            return None
+        with topico.trava:
+            if no_topico:
+                posicao = self.ranking_curtidas.posicao(self.ranking_curtidas.por_topico, topico.id, resposta)
+            else:
+                posicao = self.ranking_curtidas.posicao(self.ranking_curtidas.por_postagem, postagem.id, resposta)
+        return None if posicao is None else posicao + 1
+
+    # --- busca textual ---
+    def pesquisar(self, consulta, limite=10, tipos=None):
+        # Threads ainda não carregadas de um repositório preguiçoso entram no
+        # índice quando são acessadas pela primeira vez. Respostas ocultas
+        # continuam indexadas (podem ser reexibidas) e são puladas aqui; se
+        # isso deixar a página curta, a busca é refeita pedindo mais.
+        if limite < 1:
+            raise ValueError("limite deve ser positivo")
+        pedidos = limite
+        while True:
+            encontrados = self.indice_textual.buscar(consulta, pedidos, tipos)
+            resultados = []
+            for pontuacao, tipo, id_documento in encontrados:
+                if tipo == TOPICO:
+                    objeto = self.indice_topicos.por_id.get(id_documento)
+                elif tipo == POSTAGEM:
+                    objeto = self.postagens_por_id.get(id_documento)
+                else:
+                    objeto = self.respostas_por_id.get(id_documento)
+                    if objeto is not None and not _visivel(objeto):
+                        continue
+                if objeto is not None:
+                    resultados.append(ResultadoBusca(tipo, objeto, pontuacao))
+                    if len(resultados) == limite:
+                        return resultados
+            if len(encontrados) < pedidos:
+                return resultados
+            pedidos *= 2
+
+    # --- paginação ---
+    def paginar_topicos(self, limite=20, cursor=None, recentes=False):
+        return self._paginar("paginar_topicos", self.topicos, limite, cursor, recentes)
+
+    def paginar_postagens(self, titulo_topico, limite=20, cursor=None, recentes=False):
+        topico = self.indice_topicos.buscar(titulo_topico)
+        if not topico:
+            publicar(FalhaOperacao("paginar_postagens", MSG_TOPICO_NAO_ENCONTRADO))
+            return
+        return self._paginar("paginar_postagens", topico.postagens, limite, cursor, recentes)
+
+    def paginar_respostas(self, id_postagem, limite=20, cursor=None, recentes=False):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("paginar_respostas", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return
+        return self._paginar("paginar_respostas", postagem.respostas, limite, cursor, recentes, _visivel)
+
+    def iterar_topicos(self, cursor=None, recentes=False):
+        inicio = self._a_partir_do_cursor("iterar_topicos", self.topicos, cursor, recentes)
+        return _somente_itens(inicio)
+
+    def iterar_postagens(self, titulo_topico, cursor=None, recentes=False):
+        topico = self.indice_topicos.buscar(titulo_topico)
+        if not topico:
+            publicar(FalhaOperacao("iterar_postagens", MSG_TOPICO_NAO_ENCONTRADO))
+            return _somente_itens(None)
+        inicio = self._a_partir_do_cursor("iterar_postagens", topico.postagens, cursor, recentes)
+        return _somente_itens(inicio)
+
+    def iterar_respostas(self, id_postagem, cursor=None, recentes=False):
+        postagem = self.obter_postagem(id_postagem)
+        if not postagem:
+            publicar(FalhaOperacao("iterar_respostas", MSG_POSTAGEM_NAO_ENCONTRADA))
+            return _somente_itens(None)
+        inicio = self._a_partir_do_cursor("iterar_respostas", postagem.respostas, cursor, recentes)
+        return filter(_visivel, _somente_itens(inicio))
+
+    def _a_partir_do_cursor(self, operacao, lista, cursor, recentes):
+        # A ordem gravada no cursor prevalece sobre `recentes`.
+        posicao = None
+        if cursor is not None:
+            decodificado = _decodificar_cursor(cursor)
+            if decodificado is None:
+                publicar(FalhaOperacao(operacao, MSG_CURSOR_INVALIDO))
+                return
+            posicao, recentes = decodificado
+        return lista.a_partir_de(posicao, recentes), recentes
+
+    def _paginar(self, operacao, lista, limite, cursor, recentes, visivel=None):
+        if limite < 1:
+            raise ValueError("limite deve ser positivo")
+        inicio = self._a_partir_do_cursor(operacao, lista, cursor, recentes)
+        if inicio is None:
+            return
+        itens, recentes = inicio
+        pagina = []
+        for posicao, item in itens:
+            if visivel is not None and not visivel(item):
+                continue
+            if len(pagina) == limite:
+                return Pagina(pagina, _codificar_cursor(posicao, recentes))
+            pagina.append(item)
+        return Pagina(pagina, None)
 
     def exibir_topicos(self):
         print("=== Tópicos ===")
@@ -141,27 +1341,27 @@ class ComunidadeCafeManager:
             print(t)
 
     def exibir_postagens_do_topico(self, titulo_topico):
-        topico = next((t for t in self.topicos if t.titulo == titulo_topico), None)
+        topico = self.indice_topicos.buscar(titulo_topico)
         if not topico:
-            print("Tópico não encontrado.")
+            publicar(FalhaOperacao("exibir_postagens_do_topico", MSG_TOPICO_NAO_ENCONTRADO))
             return
 
         print(f"--- Postagens em '{titulo_topico}' ---")
-        for i, p in enumerate(topico.postagens):
+        for i, p in topico.postagens.posicoes():
             print(f"[{i}] {p}")
 
     def exibir_respostas_da_postagem(self, titulo_topico, index_postagem):
-        topico = next((t for t in self.topicos if t.titulo == titulo_topico), None)
+        topico = self.indice_topicos.buscar(titulo_topico)
         if not topico:
-            print("Tópico não encontrado.")
+            publicar(FalhaOperacao("exibir_respostas_da_postagem", MSG_TOPICO_NAO_ENCONTRADO))
             return
 
         try:
             postagem = topico.postagens[index_postagem]
         except IndexError:
-            print("Postagem não encontrada.")
+            publicar(FalhaOperacao("exibir_respostas_da_postagem", MSG_POSTAGEM_NAO_ENCONTRADA))
             return
 
         print(f"--- Respostas da postagem #{index_postagem} em '{titulo_topico}' ---")
-        for r in postagem.respostas:
+        for r in filter(_visivel, postagem.respostas):
             print(f"- {r}")
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+# === Limite de escritas por usuário ===
+# Um balde de fichas por (usuário, operação): cabem `capacidade` fichas, que
+# voltam à taxa de `por_segundo`, e cada escrita gasta uma. O balde não é
+# atualizado por relógio: a reposição é calculada na hora da consulta a
+# partir do instante da última, então cada verificação custa O(1).
+#
+# Os limites dependem do papel, com os mesmos nomes dos decorators de
+# decorator.py; papéis ou operações sem limite configurado passam direto.
+#
+# Um balde que já se encheu de novo é igual a um balde novo, então pode ser
+# descartado sem mudar nenhuma decisão: os baldes ficam em ordem de uso e os
+# mais antigos saem assim que estiverem cheios. Acima de `maximo_baldes`, o
+# mais antigo sai mesmo sem estar cheio, e a memória fica limitada pelos
+# usuários ativos.
+CONVIDADO, LOGADO, LOJISTA, MODERADOR, ADMINISTRADOR = (
+    "UsuarioConvidado", "UsuarioLogado", "Lojista", "Moderador", "Administrador")
+CRIAR_TOPICO, ADICIONAR_POSTAGEM, RESPONDER_POSTAGEM = "criar_topico", "adicionar_postagem", "responder_postagem"
+
+
+class Limite:
+    __slots__ = ("capacidade", "por_segundo")
+
+    def __init__(self, capacidade, por_segundo):
+        self.capacidade = capacidade
+        self.por_segundo = por_segundo
+
+    def __repr__(self):
+        return f"Limite({self.capacidade}, {self.por_segundo:g}/s)"
+
+
+LIMITES_PADRAO = {
+    CONVIDADO: {CRIAR_TOPICO: Limite(1, 1 / 600), ADICIONAR_POSTAGEM: Limite(3, 1 / 120),
+                RESPONDER_POSTAGEM: Limite(5, 1 / 60)},
+    LOGADO: {CRIAR_TOPICO: Limite(5, 1 / 300), ADICIONAR_POSTAGEM: Limite(20, 1 / 15),
+             RESPONDER_POSTAGEM: Limite(30, 1 / 5)},
+    LOJISTA: {CRIAR_TOPICO: Limite(10, 1 / 120), ADICIONAR_POSTAGEM: Limite(40, 1 / 10),
+              RESPONDER_POSTAGEM: Limite(30, 1 / 5)},
+    MODERADOR: {CRIAR_TOPICO: Limite(30, 1 / 30), ADICIONAR_POSTAGEM: Limite(100, 1),
+                RESPONDER_POSTAGEM: Limite(100, 1)},
+    ADMINISTRADOR: {},
+}
+
+# Permissões do Usuario do manager que correspondem a um papel; as demais
+# (inclusive "padrão") são UsuarioLogado.
+_PAPEIS_POR_PERMISSAO = {
+    "convidado": CONVIDADO, "lojista": LOJISTA, "moderador": MODERADOR,
+    "admin": ADMINISTRADOR, "administrador": ADMINISTRADOR,
+}
+
+
+def papel_de(usuario):
+    # Decorators (e moderacao.Moderador) são reconhecidos pelo nome da classe
+    # mais externa; o Usuario do manager, pelas permissões.
+    nome = type(usuario).__name__
+    if nome in LIMITES_PADRAO:
+        return nome
+    return _PAPEIS_POR_PERMISSAO.get(getattr(usuario, "permissoes", None), LOGADO)
+
+
+class LimitadorEscrita:
+    def __init__(self, limites=None, maximo_baldes: int = 100_000, relogio=time.monotonic):
+        self.limites = LIMITES_PADRAO if limites is None else limites
+        self.maximo_baldes = maximo_baldes
+        self.relogio = relogio
+        self._baldes = OrderedDict()  # (nome_usuario, operacao) -> [fichas, instante, cheio_em]
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._baldes)
+
+    def permitir(self, nome_usuario, operacao, papel=LOGADO, custo=1):
+        limite = self.limites.get(papel, {}).get(operacao)
+        if limite is None:
+            return True
+        chave = (nome_usuario, operacao)
+        with self._trava:
+            agora = self.relogio()
+            balde = self._baldes.get(chave)
+            if balde is None:
+                fichas = limite.capacidade
+                balde = self._baldes[chave] = [0, 0, 0]
+            else:
+                fichas = min(limite.capacidade, balde[0] + (agora - balde[1]) * limite.por_segundo)
+                self._baldes.move_to_end(chave)
+            permitido = fichas >= custo
+            if permitido:
+                fichas -= custo
+            balde[0], balde[1] = fichas, agora
+            balde[2] = agora + (limite.capacidade - fichas) / limite.por_segundo
+            self._descartar(agora)
+            return permitido
+
+    def _descartar(self, agora):
+        baldes = self._baldes
+        while baldes:
+            balde = next(iter(baldes.values()))
+            if balde[2] > agora and len(baldes) <= self.maximo_baldes:
+                return
+            baldes.popitem(last=False)
@@ -1,26 +1,157 @@
+import asyncio
+import inspect
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
+from eventos import FalhaOperacao, publicar
+
+# === Observer ===
+# Observadores ficam num WeakKeyDictionary (observador -> filtro): vincular e
+# desvincular são O(1) e um moderador que ninguém mais referencia é coletado e
+# sai sozinho do registro. Cada atualizar() roda isolado: uma exceção vira
+# FalhaOperacao e os demais observadores continuam sendo notificados.
+SINCRONO, THREADS, ASYNCIO = "sincrono", "threads", "asyncio"
+_TAMANHO_LOTE = 256  # observadores por tarefa no pool de threads
+
+_executor = None
+_trava_executor = threading.Lock()
+
+
+def executor_observadores():
+    global _executor
+    if _executor is None:
+        with _trava_executor:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="Observadores")
+    return _executor
+
+
 class Observador:
-    def atualizar(self):
+    __slots__ = ("__weakref__",)
+
+    def aceita(self, evento):
+        # Filtro do próprio observador: False descarta o evento sem chamar atualizar().
+        return True
+
+    def atualizar(self, evento=None):
         pass
 
-class SujeitoObserver:
-    def __init__(self):
-        self.observers: List[Observador] = []
 
-    def vincular(self, observer: Observador):
-        self.observers.append(observer)
+def _falha(observador, erro):
+    publicar(FalhaOperacao("atualizar", f"{type(observador).__name__}: {erro}"))
+
+
+def _entregar_lote(inscricoes, evento):
+    entregues = 0
+    for referencia, filtro in inscricoes:
+        observador = referencia()
+        if observador is None:
+            continue
+        try:
+            if (filtro is None or filtro(evento)) and observador.aceita(evento):
+                observador.atualizar(evento)
+                entregues += 1
+        except Exception as erro:
+            _falha(observador, erro)
+    return entregues
+
+
+_ASSINCRONOS = {}  # tipo do observador -> atualizar() é corrotina?
 
-    def desvincular(self, observer: Observador):
-        self.observers.remove(observer)
 
-    def notificar(self):
-        for observer in self.observers:
-            observer.atualizar()
+def _assincrono(observador):
+    tipo = type(observador)
+    assincrono = _ASSINCRONOS.get(tipo)
+    if assincrono is None:
+        assincrono = _ASSINCRONOS[tipo] = inspect.iscoroutinefunction(tipo.atualizar)
+    return assincrono
+
+
+class SujeitoObserver:
+    __slots__ = ("observers", "despacho", "_trava", "_inscricoes")
+
+    def __init__(self, despacho=SINCRONO):
+        self.observers = weakref.WeakKeyDictionary()
+        self.despacho = despacho
+        self._trava = threading.Lock()
+        # Cópia de (weakref, filtro) usada para notificar, refeita só quando o
+        # registro muda: copiar o WeakKeyDictionary custa mais que a entrega.
+        # Observadores coletados depois da cópia só viram referências mortas.
+        self._inscricoes = None
+
+    def vincular(self, observer: Observador, filtro=None):
+        # `filtro(evento) -> bool` é guardado com referência forte: não deve
+        # referenciar o observador, senão ele nunca é coletado.
+        with self._trava:
+            self.observers[observer] = filtro
+            self._inscricoes = None
+
+    def desvincular(self, observer: Observador):
+        with self._trava:
+            if observer in self.observers:
+                del self.observers[observer]
+                self._inscricoes = None
+
+    def _obter_inscricoes(self):
+        inscricoes = self._inscricoes
+        if inscricoes is None:
+            with self._trava:
+                inscricoes = self._inscricoes = [(weakref.ref(o), f) for o, f in self.observers.items()]
+        return inscricoes
+
+    def notificar(self, evento=None):
+        # SINCRONO devolve quantos observadores foram notificados; THREADS, uma
+        # lista de futures (cada uma com a contagem do seu lote); ASYNCIO, uma
+        # task no laço em execução.
+        if self.despacho == ASYNCIO:
+            return asyncio.get_running_loop().create_task(self.notificar_async(evento))
+        inscricoes = self._obter_inscricoes()
+        if self.despacho == THREADS:
+            executor = executor_observadores()
+            return [executor.submit(_entregar_lote, inscricoes[i:i + _TAMANHO_LOTE], evento)
+                    for i in range(0, len(inscricoes), _TAMANHO_LOTE)]
+        return _entregar_lote(inscricoes, evento)
+
+    async def notificar_async(self, evento=None):
+        # atualizar() pode ser uma corrotina; as síncronas rodam direto no laço.
+        entregues, corrotinas = 0, []
+        for referencia, filtro in self._obter_inscricoes():
+            observador = referencia()
+            if observador is None:
+                continue
+            try:
+                if (filtro is None or filtro(evento)) and observador.aceita(evento):
+                    if _assincrono(observador):
+                        corrotinas.append((observador, observador.atualizar(evento)))
+                    else:
+                        observador.atualizar(evento)
+                        entregues += 1
+            except Exception as erro:
+                _falha(observador, erro)
+        resultados = await asyncio.gather(*(c for _, c in corrotinas), return_exceptions=True)
+        for (observador, _), resultado in zip(corrotinas, resultados):
+            if isinstance(resultado, Exception):
+                _falha(observador, resultado)
+            else:
+                entregues += 1
+        return entregues
+
+
+class AlteracaoTopico:
+    __slots__ = ("topico", "acao")
+
+    def __init__(self, topico, acao):
+        self.topico = topico
+        self.acao = acao
 
 
 # Classes principais
 class Usuario:
+    __slots__ = ("nome", "nome_usuario", "senha", "permissoes", "idade", "ranking", "qtd_likes", "profissao",
+                 "cidade", "qtd_comentarios", "tipo_usuario", "descricao")
+
     def __init__(self, nome, nome_usuario, senha, permissoes, idade, ranking, qtd_likes, profissao, cidade, qtd_comentarios, tipo_usuario, descricao):
         self.nome = nome
         self.nome_usuario = nome_usuario
@@ -47,21 +178,49 @@ class Usuario:
 
 
 class Moderador(Usuario, Observador):
+    __slots__ = ("idModerador", "estadoTopicosModerados", "apenasTopicosModerados")
+
     def __init__(self, *args, idModerador=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.idModerador = idModerador
         self.estadoTopicosModerados: Dict[str, str] = {}
+        self.apenasTopicosModerados = False  # ligado por moderarTopico()
 
     def removerPostagem(self, topico, usuario): pass
-    def aprovarTopico(self, topico): pass
     def removerResposta(self, topico, usuario): pass
     def obterEstadoTopico(self, topico): return self.estadoTopicosModerados.get(topico.titulo, "Desconhecido")
 
-    def atualizar(self):
+    def aprovarTopico(self, topico):
+        topico.aprovado = True
+        self.estadoTopicosModerados[topico.titulo] = "Aprovado"
+
+    def moderarTopico(self, topico):
+        # A partir daqui, só recebe eventos dos tópicos que modera.
+        self.estadoTopicosModerados.setdefault(topico.titulo, "Em moderação")
+        self.apenasTopicosModerados = True
+        topico.vincular(self)
+
+    def pegarDenuncia(self, forum, duracao=None):
+        # Próximo item da fila de moderação do fórum, reservado para este moderador.
+        return forum.proxima_moderacao(self, duracao)
+
+    def resolverDenuncia(self, forum, item, remover=False):
+        return forum.concluir_moderacao(item, self, remover)
+
+    def aceita(self, evento):
+        # Vinculado só com vincular(), recebe tudo, como antes.
+        if not self.apenasTopicosModerados:
+            return True
+        topico = getattr(evento, "topico", None)
+        return topico is None or topico.titulo in self.estadoTopicosModerados
+
+    def atualizar(self, evento=None):
         print(f"Moderador {self.nome_usuario} foi notificado de uma alteração.")
 
 
 class Topico(SujeitoObserver):
+    __slots__ = ("titulo", "autor", "data_criacao", "tipo", "descricao", "quantidade_posts", "aprovado", "moderadores")
+
     def __init__(self, titulo, autor: str, data_criacao: int, tipo, descricao):
         super().__init__()
         self.titulo = titulo
@@ -75,12 +234,12 @@ class Topico(SujeitoObserver):
 
     def criarTopico(self, usuario: Usuario):
         print(f"Topico '{self.titulo}' criado por {usuario.nome_usuario}")
-        self.notificar()
+        self.notificar(AlteracaoTopico(self, "criado"))
 
     def editar(self, usuario: Usuario, string: str):
         self.descricao = string
         print(f"Topico '{self.titulo}' editado por {usuario.nome_usuario}")
-        self.notificar()
+        self.notificar(AlteracaoTopico(self, "editado"))
 
     def acessarPostagem(self, postagem): pass
     def compartilhar(self, usuario: Usuario, id): pass
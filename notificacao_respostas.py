@@ -1,4 +1,136 @@
+import atexit
+import threading
+import time
+from collections import deque
+
+from eventos import FalhaOperacao, NotificacaoResposta, publicar
+
+
+# === Entrega de notificações em segundo plano ===
+class DespachanteEncerrado(RuntimeError):
+    pass
+
+
+class DespachanteNotificacoes:
+    # Quem responde só enfileira; `trabalhadores` threads entregam. Enquanto um
+    # destinatário espera na fila, novas respostas para ele só somam na mesma
+    # entrada, e cada entrada espera `janela` segundos antes de sair: mil
+    # respostas rápidas viram poucos resumos ("recebeu 12 novas respostas"). A
+    # fila guarda no máximo `capacidade` destinatários; cheia, quem enfileira
+    # espera (ou desiste após `timeout`), em vez de a memória crescer sem limite.
+    # As threads são daemon; ao sair do programa, um gancho de atexit chama
+    # fechar() para que os resumos pendentes sejam entregues, não perdidos.
+    def __init__(self, trabalhadores: int = 2, capacidade: int = 10_000, janela: float = 0.05):
+        self.trabalhadores = trabalhadores
+        self.capacidade = capacidade
+        self.janela = janela
+        self._pendentes = {}  # Usuario -> [quantidade, prazo]
+        self._fila = deque()  # destinatários na ordem em que ficaram pendentes
+        self._em_entrega = 0
+        self._encerrar = False
+        self._condicao = threading.Condition()
+        self._threads = []
+
+    def enfileirar(self, usuario, quantidade=1, timeout=None):
+        with self._condicao:
+            if self._encerrar:
+                raise DespachanteEncerrado("Despachante de notificações encerrado.")
+            if usuario not in self._pendentes:
+                livre = self._condicao.wait_for(
+                    lambda: usuario in self._pendentes or len(self._fila) < self.capacidade, timeout)
+                if not livre:
+                    return False
+            pendente = self._pendentes.get(usuario)
+            if pendente is not None:
+                pendente[0] += quantidade
+                return True
+            self._pendentes[usuario] = [quantidade, time.monotonic() + self.janela]
+            self._fila.append(usuario)
+            if not self._threads:
+                self._iniciar()
+            self._condicao.notify_all()
+            return True
+
+    def _iniciar(self):
+        atexit.register(self.fechar)
+        for i in range(self.trabalhadores):
+            thread = threading.Thread(target=self._executar, name=f"Notificacoes-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _proximo(self):
+        # Chamado com a condição adquirida; None quando é para encerrar.
+        while True:
+            if self._fila:
+                espera = self._pendentes[self._fila[0]][1] - time.monotonic()
+                if espera <= 0 or self._encerrar:
+                    usuario = self._fila.popleft()
+                    quantidade, _ = self._pendentes.pop(usuario)
+                    self._em_entrega += 1
+                    self._condicao.notify_all()  # libera quem espera vaga na fila
+                    return usuario, quantidade
+            elif self._encerrar:
+                return None
+            else:
+                espera = None
+            self._condicao.wait(espera)
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                proximo = self._proximo()
+            if proximo is None:
+                return
+            usuario, quantidade = proximo
+            try:
+                usuario.notificar(quantidade)
+            except Exception as erro:
+                publicar(FalhaOperacao("notificar", str(erro)))
+            with self._condicao:
+                self._em_entrega -= 1
+                self._condicao.notify_all()
+
+    def pendentes(self):
+        with self._condicao:
+            return len(self._fila)
+
+    def aguardar(self, timeout=None):
+        # Espera a fila esvaziar e as entregas em andamento terminarem.
+        with self._condicao:
+            return self._condicao.wait_for(lambda: not self._fila and not self._em_entrega, timeout)
+
+    def fechar(self):
+        # Entrega o que está pendente sem esperar a janela e para as threads.
+        with self._condicao:
+            self._encerrar = True
+            self._condicao.notify_all()
+        for thread in self._threads:
+            thread.join()
+        atexit.unregister(self.fechar)
+
+
+_despachante = None
+_trava_despachante = threading.Lock()
+
+
+def despachante_atual():
+    global _despachante
+    if _despachante is None:
+        with _trava_despachante:
+            if _despachante is None:
+                _despachante = DespachanteNotificacoes()
+    return _despachante
+
+
+def definir_despachante(despachante):
+    global _despachante
+    anterior, _despachante = _despachante, despachante
+    return anterior
+
+
 class Resposta:
+    __slots__ = ("autor", "descricao")
+
     def __init__(self, autor, descricao):
         self.autor = autor
         self.descricao = descricao
@@ -8,14 +140,16 @@ class Resposta:
 
 
 class Usuario:
+    __slots__ = ("nome", "nome_usuario", "postagens", "respostas")
+
     def __init__(self, nome, nome_usuario):
         self.nome = nome
         self.nome_usuario = nome_usuario
         self.postagens = []
         self.respostas = []
 
-    def notificar(self):
-        print(f"[NOTIFICAÇÃO] {self.nome_usuario}, seu tópico recebeu uma nova resposta!")
+    def notificar(self, quantidade=1):
+        publicar(NotificacaoResposta(self.nome_usuario, quantidade))
 
     def registrarResposta(self, resposta):
         self.respostas.append(resposta)
@@ -25,6 +159,8 @@ class Usuario:
 
 
 class Postagem:
+    __slots__ = ("autor", "data_criacao", "descricao", "respostas")
+
     def __init__(self, autor, data_criacao, descricao):
         self.autor = autor
         self.data_criacao = data_criacao
@@ -32,14 +168,21 @@ class Postagem:
         self.respostas = []
 
     def gerarResposta(self, usuario, texto):
+        # A resposta é registrada por inteiro antes de notificar; com o
+        # despachante encerrado, a notificação é entregue aqui mesmo.
         resposta = Resposta(usuario, texto)
         self.respostas.append(resposta)
-        self.autor.notificar()
         usuario.registrarResposta(resposta)
+        try:
+            despachante_atual().enfileirar(self.autor)
+        except DespachanteEncerrado:
+            self.autor.notificar()
         return resposta
 
 
 class Topico(Postagem):
+    __slots__ = ("titulo",)
+
     def __init__(self, titulo, autor, data_criacao, descricao):
         super().__init__(autor, data_criacao, descricao)
         self.titulo = titulo
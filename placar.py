@@ -0,0 +1,100 @@
+import threading
+
+from estruturas import SkipListIndexada
+
+# === Placar de usuários ===
+# Usuários em ordem de nota para uma EstrategiaRankeamento qualquer, numa skip
+# list indexada com chave (-nota, nome): maiores notas primeiro e empates
+# pelo nome. A posição de um usuário, o top-k e a vizinhança saem da largura
+# das ligações da skip list, em O(log n) (mais k para listar k usuários).
+#
+# Usuários acompanhados avisam o placar quando as entradas da nota mudam
+# (strategy.Usuario faz isso em adicionar_avaliacao, remover_comentario etc.),
+# e só esse usuário é recalculado e reposicionado.
+
+
+class Placar:
+    def __init__(self, estrategia, semente=None):
+        self.estrategia = estrategia
+        self._lista = SkipListIndexada(semente)
+        self._chaves = {}  # nome -> chave atual na skip list
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._lista)
+
+    def __contains__(self, usuario):
+        return usuario.nome in self._chaves
+
+    def acompanhar(self, usuario):
+        # Entra no placar e passa a ser reposicionado a cada mudança.
+        usuario.acompanhar_placar(self)
+        return self.atualizar(usuario)
+
+    def carregar(self, usuarios):
+        # Acompanha vários usuários de uma vez. Com o placar vazio, as chaves
+        # são ordenadas e a skip list é montada em O(n) depois da ordenação,
+        # em vez de n inserções de O(log n).
+        usuarios = list(usuarios)
+        with self._trava:
+            vazio = not self._lista
+            if vazio:
+                chaves = {usuario.nome: (-self.estrategia.calcular(usuario), usuario.nome) for usuario in usuarios}
+                if len(chaves) != len(usuarios):
+                    raise ValueError("nomes de usuário repetidos")
+                por_nome = {usuario.nome: usuario for usuario in usuarios}
+                self._lista.carregar_ordenados((chave, por_nome[chave[1]]) for chave in sorted(chaves.values()))
+                self._chaves = chaves
+        for usuario in usuarios:
+            if vazio:
+                usuario.acompanhar_placar(self)
+            else:
+                self.acompanhar(usuario)
+
+    def deixar_de_acompanhar(self, usuario):
+        usuario.deixar_placar(self)
+        self.remover(usuario)
+
+    def atualizar(self, usuario):
+        nota = self.estrategia.calcular(usuario)
+        chave = (-nota, usuario.nome)
+        with self._trava:
+            anterior = self._chaves.get(usuario.nome)
+            if anterior == chave:
+                return nota
+            if anterior is not None:
+                self._lista.remover(anterior)
+            self._lista.inserir(chave, usuario)
+            self._chaves[usuario.nome] = chave
+        return nota
+
+    def remover(self, usuario):
+        with self._trava:
+            chave = self._chaves.pop(usuario.nome, None)
+            if chave is not None:
+                self._lista.remover(chave)
+
+    def posicao(self, usuario):
+        # Posição no placar a partir de 1, ou None se o usuário não estiver nele.
+        with self._trava:
+            chave = self._chaves.get(usuario.nome)
+            return self._lista.posicao(chave) + 1 if chave is not None else None
+
+    def primeiros(self, quantidade=100):
+        # [(posição, usuário, nota)] dos `quantidade` primeiros.
+        with self._trava:
+            return _com_posicoes(self._lista.primeiros(quantidade), 1)
+
+    def ao_redor(self, usuario, raio=5):
+        # Até `raio` usuários acima e abaixo, com o próprio usuário no meio.
+        with self._trava:
+            chave = self._chaves.get(usuario.nome)
+            if chave is None:
+                return []
+            posicao = self._lista.posicao(chave)
+            inicio = max(0, posicao - raio)
+            return _com_posicoes(self._lista.fatia(inicio, posicao + raio + 1 - inicio), inicio + 1)
+
+
+def _com_posicoes(itens, primeira):
+    return [(posicao, usuario, -chave[0]) for posicao, (chave, usuario) in enumerate(itens, primeira)]
@@ -0,0 +1,166 @@
+import heapq
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+from strategy import ColunasUsuarios, EstrategiaRankeamento, RankComposto
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional, como em strategy
+    np = None
+
+# === Rank em vários processos ===
+# As colunas de ColunasUsuarios são copiadas uma vez para blocos de
+# multiprocessing.shared_memory e a população é dividida em fatias contíguas.
+# Cada processo do pool abre os blocos pelo nome, monta ColunasUsuarios sobre
+# memoryviews da sua fatia (sem copiar nem serializar objetos Usuario), roda
+# calcular_lote e escreve as notas num bloco de saída compartilhado. Para o
+# top-k não há bloco de saída: cada fatia devolve só as suas k melhores, e o
+# processo principal intercala essas listas já ordenadas.
+#
+# Entradas pequenas (menos de `minimo_paralelo` usuários) ou um único processo
+# rodam em série: abrir os blocos e despachar as fatias custa mais que o ganho.
+# Estratégias sem calcular_lote sobre colunas (que precisam dos objetos
+# Usuario, e não chegam aos processos), ou RankComposto com alguma parte
+# assim, rodam em série. RankComposto com normalização usa os
+# parâmetros guardados (os mesmos em todas as fatias); sem eles, é ajustado na
+# população inteira antes, em série.
+
+_COLUNAS = (("comentarios", "q"), ("topicos", "q"), ("soma_avaliacoes", "d"),
+            ("qtd_avaliacoes", "q"), ("meses_ativo", "q"))
+_BYTES = 8  # todas as colunas e as notas têm 8 bytes por valor
+
+
+class RankeadorParalelo:
+    def __init__(self, processos=None, minimo_paralelo=500_000, fatias_por_processo=2):
+        self.processos = processos or os.cpu_count() or 1
+        self.minimo_paralelo = minimo_paralelo
+        self.fatias_por_processo = fatias_por_processo
+        self._executor = None
+        self._trava = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+    def fechar(self):
+        with self._trava:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def em_paralelo(self, colunas, estrategia=None):
+        if estrategia is not None and _precisa_dos_usuarios(estrategia):
+            return False
+        return self.processos > 1 and len(colunas) >= max(self.minimo_paralelo, 1)
+
+    def calcular(self, estrategia, colunas):
+        # Mesmas notas, na mesma ordem, que estrategia.calcular_lote(colunas)
+        # (para RankComposto já ajustado, com os parâmetros guardados).
+        if not self.em_paralelo(colunas, estrategia):
+            return _calcular_lote(estrategia, colunas)
+        return self._executar(estrategia, colunas, None)
+
+    def ranquear(self, estrategia, colunas, quantidade=100):
+        # [(índice na coluna, nota)] dos `quantidade` maiores, empates pelo
+        # menor índice.
+        if not self.em_paralelo(colunas, estrategia):
+            return _primeiros(_calcular_lote(estrategia, colunas), quantidade, 0)
+        listas = self._executar(estrategia, colunas, quantidade)
+        return list(islice(heapq.merge(*listas, key=lambda par: (-par[1], par[0])), quantidade))
+
+    def _executar(self, estrategia, colunas, quantidade):
+        tamanho = len(colunas)
+        if isinstance(estrategia, RankComposto) and estrategia.parametros is None:
+            estrategia.ajustar(colunas)
+        blocos = []
+        try:
+            for nome, tipo in _COLUNAS:
+                bloco = shared_memory.SharedMemory(create=True, size=tamanho * _BYTES)
+                blocos.append(bloco)
+                bloco.buf[:tamanho * _BYTES] = memoryview(getattr(colunas, nome)).cast("B")
+            if quantidade is None:
+                saida = shared_memory.SharedMemory(create=True, size=tamanho * _BYTES)
+                blocos.append(saida)
+
+            nomes = [bloco.name for bloco in blocos]
+            fatias = self.processos * self.fatias_por_processo
+            limites = [tamanho * i // fatias for i in range(fatias + 1)]
+            executor = self._pool()
+            tarefas = [executor.submit(_calcular_fatia, estrategia, nomes, inicio, fim, quantidade)
+                       for inicio, fim in zip(limites, limites[1:]) if fim > inicio]
+            listas = [tarefa.result() for tarefa in tarefas]
+            if quantidade is not None:
+                return listas
+
+            notas = array("d")
+            notas.frombytes(saida.buf[:tamanho * _BYTES])
+            return np.frombuffer(notas, dtype=np.float64) if np is not None else notas
+        finally:
+            for bloco in blocos:
+                bloco.close()
+                bloco.unlink()
+
+    def _pool(self):
+        with self._trava:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processos)
+            return self._executor
+
+
+def _precisa_dos_usuarios(estrategia):
+    if isinstance(estrategia, RankComposto):
+        return any(_precisa_dos_usuarios(parte) for parte, _ in estrategia.partes)
+    return type(estrategia).calcular_lote is EstrategiaRankeamento.calcular_lote
+
+
+def _calcular_lote(estrategia, colunas):
+    # RankComposto só é ajustado aqui se ainda não tiver parâmetros.
+    if isinstance(estrategia, RankComposto):
+        return estrategia.calcular_lote(colunas, reajustar=estrategia.parametros is None)
+    return estrategia.calcular_lote(colunas)
+
+
+def _calcular_fatia(estrategia, nomes, inicio, fim, quantidade):
+    # Roda num processo do pool: abre os blocos, calcula a fatia
+    # [inicio, fim) e grava as notas no bloco de saída ou devolve o top da
+    # fatia.
+    blocos = [shared_memory.SharedMemory(nome) for nome in nomes]
+    visoes = []
+    try:
+        for bloco, (_, tipo) in zip(blocos, _COLUNAS):
+            visoes.append(bloco.buf[inicio * _BYTES:fim * _BYTES].cast(tipo))
+        notas = _calcular_lote(estrategia, ColunasUsuarios.sem_copia(*visoes))
+        if quantidade is not None:
+            return _primeiros(notas, quantidade, inicio)
+        blocos[-1].buf[inicio * _BYTES:fim * _BYTES] = memoryview(notas).cast("B")
+    finally:
+        # Views abertas sobre o bloco impedem close().
+        for visao in visoes:
+            visao.release()
+        for bloco in blocos:
+            bloco.close()
+
+
+def _primeiros(notas, quantidade, deslocamento):
+    # As `quantidade` maiores notas de uma fatia, com o índice global.
+    tamanho = len(notas)
+    quantidade = min(quantidade, tamanho)
+    if not quantidade:
+        return []
+    if np is not None:
+        notas = np.asarray(notas)
+        limite = np.partition(notas, tamanho - quantidade)[tamanho - quantidade]
+        maiores = np.flatnonzero(notas > limite)
+        iguais = np.flatnonzero(notas == limite)[:quantidade - len(maiores)]
+        escolhidos = np.concatenate((maiores, iguais))
+        escolhidos = escolhidos[np.lexsort((escolhidos, -notas[escolhidos]))]
+        return [(int(i) + deslocamento, float(notas[i])) for i in escolhidos]
+    melhores = heapq.nlargest(quantidade, zip(notas, range(0, -tamanho, -1)))
+    return [(deslocamento - negativo, nota) for nota, negativo in melhores]
@@ -0,0 +1,390 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+from eventos import FalhaOperacao, publicar
+
+MSG_ESCRITA_REJEITADA = "Escrita rejeitada pelo banco; o registro ficou só em memória."
+
+
+# === Interface Repositorio ===
+class Repositorio(ABC):
+    # Linhas devolvidas pelos métodos carregar_*:
+    #   usuários:  (nome, nome_usuario, senha, permissoes)
+    #   tópicos:   (id, titulo, nome_usuario, tipo, descricao)
+    #   postagens: (id, posicao, nome_usuario, texto)
+    #   respostas: (id, posicao, nome_usuario, conteudo, quantidade_likes)
+    #   curtidas:  (nome_usuario, id_resposta)
+    carregamento_preguicoso = False
+
+    @abstractmethod
+    def carregar_usuarios(self): pass
+
+    @abstractmethod
+    def carregar_topicos(self): pass
+
+    @abstractmethod
+    def carregar_postagens(self, id_topico): pass
+
+    @abstractmethod
+    def carregar_respostas(self, id_postagem): pass
+
+    @abstractmethod
+    def carregar_curtidas(self): pass
+
+    @abstractmethod
+    def localizar_postagem(self, id_postagem): pass
+
+    @abstractmethod
+    def localizar_resposta(self, id_resposta): pass
+
+    @abstractmethod
+    def maiores_ids(self): pass
+
+    @abstractmethod
+    def salvar_usuario(self, usuario): pass
+
+    @abstractmethod
+    def salvar_topico(self, topico): pass
+
+    @abstractmethod
+    def renomear_topico(self, topico): pass
+
+    @abstractmethod
+    def remover_topico(self, topico): pass
+
+    @abstractmethod
+    def salvar_postagem(self, postagem): pass
+
+    @abstractmethod
+    def atualizar_postagem(self, postagem): pass
+
+    @abstractmethod
+    def remover_postagem(self, postagem): pass
+
+    @abstractmethod
+    def salvar_resposta(self, resposta): pass
+
+    @abstractmethod
+    def atualizar_likes(self, resposta): pass
+
+    @abstractmethod
+    def remover_resposta(self, resposta): pass
+
+    @abstractmethod
+    def salvar_curtida(self, nome_usuario, resposta): pass
+
+    @abstractmethod
+    def remover_curtida(self, nome_usuario, resposta): pass
+
+    def proxima_posicao_postagens(self, id_topico):
+        # Posição da próxima postagem do tópico, contando as do fim da thread
+        # que já foram removidas; 0 quando o repositório não guarda isso.
+        return 0
+
+    def proxima_posicao_respostas(self, id_postagem):
+        return 0
+
+    def anexar(self, manager):
+        # Chamado pelo manager ao adotar o repositório. As chamadas salvar_*,
+        # remover_* e atualizar_* sempre acontecem depois da mutação em memória.
+        pass
+
+    def gravar_snapshot(self, manager):
+        pass
+
+    def confirmar(self):
+        pass
+
+    def fechar(self):
+        self.confirmar()
+
+
+# === Repositório em memória (padrão) ===
+class RepositorioMemoria(Repositorio):
+    # O estado vive só nos objetos do manager; nada a persistir ou carregar.
+    def carregar_usuarios(self): return ()
+    def carregar_topicos(self): return ()
+    def carregar_postagens(self, id_topico): return ()
+    def carregar_respostas(self, id_postagem): return ()
+    def carregar_curtidas(self): return ()
+    def localizar_postagem(self, id_postagem): return None
+    def localizar_resposta(self, id_resposta): return None
+    def maiores_ids(self): return (0, 0, 0)
+    def salvar_usuario(self, usuario): pass
+    def salvar_topico(self, topico): pass
+    def renomear_topico(self, topico): pass
+    def remover_topico(self, topico): pass
+    def salvar_postagem(self, postagem): pass
+    def atualizar_postagem(self, postagem): pass
+    def remover_postagem(self, postagem): pass
+    def salvar_resposta(self, resposta): pass
+    def atualizar_likes(self, resposta): pass
+    def remover_resposta(self, resposta): pass
+    def salvar_curtida(self, nome_usuario, resposta): pass
+    def remover_curtida(self, nome_usuario, resposta): pass
+
+
+# === Repositório SQLite ===
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    nome_usuario TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    senha TEXT NOT NULL,
+    permissoes TEXT
+);
+CREATE TABLE IF NOT EXISTS topicos (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT NOT NULL UNIQUE,
+    autor TEXT NOT NULL,
+    tipo TEXT,
+    descricao TEXT,
+    proxima_posicao INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postagens (
+    id INTEGER PRIMARY KEY,
+    id_topico INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    autor TEXT NOT NULL,
+    texto TEXT,
+    proxima_posicao INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS postagens_por_topico ON postagens (id_topico, posicao);
+CREATE TABLE IF NOT EXISTS respostas (
+    id INTEGER PRIMARY KEY,
+    id_postagem INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    autor TEXT NOT NULL,
+    conteudo TEXT,
+    likes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS respostas_por_postagem ON respostas (id_postagem, posicao);
+CREATE TABLE IF NOT EXISTS curtidas (
+    id_resposta INTEGER NOT NULL,
+    nome_usuario TEXT NOT NULL,
+    PRIMARY KEY (id_resposta, nome_usuario)
+) WITHOUT ROWID;
+"""
+
+# proxima_posicao só cresce: remover a última postagem (ou resposta) não a faz
+# voltar, e a posição não é reaproveitada depois de reiniciar.
+_GATILHOS = """
+CREATE TRIGGER IF NOT EXISTS proxima_posicao_postagens AFTER INSERT ON postagens BEGIN
+    UPDATE topicos SET proxima_posicao = NEW.posicao + 1
+    WHERE id = NEW.id_topico AND proxima_posicao <= NEW.posicao;
+END;
+CREATE TRIGGER IF NOT EXISTS proxima_posicao_respostas AFTER INSERT ON respostas BEGIN
+    UPDATE postagens SET proxima_posicao = NEW.posicao + 1
+    WHERE id = NEW.id_postagem AND proxima_posicao <= NEW.posicao;
+END;
+"""
+
+SQL_INSERIR_USUARIO = "INSERT INTO usuarios (nome_usuario, nome, senha, permissoes) VALUES (?, ?, ?, ?)"
+SQL_INSERIR_TOPICO = "INSERT INTO topicos (id, titulo, autor, tipo, descricao) VALUES (?, ?, ?, ?, ?)"
+SQL_RENOMEAR_TOPICO = "UPDATE topicos SET titulo = ? WHERE id = ?"
+SQL_REMOVER_TOPICO = "DELETE FROM topicos WHERE id = ?"
+SQL_REMOVER_CURTIDAS_DO_TOPICO = (
+    "DELETE FROM curtidas WHERE id_resposta IN (SELECT id FROM respostas WHERE id_postagem IN"
+    " (SELECT id FROM postagens WHERE id_topico = ?))")
+SQL_REMOVER_RESPOSTAS_DO_TOPICO = (
+    "DELETE FROM respostas WHERE id_postagem IN (SELECT id FROM postagens WHERE id_topico = ?)")
+SQL_REMOVER_POSTAGENS_DO_TOPICO = "DELETE FROM postagens WHERE id_topico = ?"
+SQL_INSERIR_POSTAGEM = "INSERT INTO postagens (id, id_topico, posicao, autor, texto) VALUES (?, ?, ?, ?, ?)"
+SQL_ATUALIZAR_POSTAGEM = "UPDATE postagens SET texto = ? WHERE id = ?"
+SQL_REMOVER_POSTAGEM = "DELETE FROM postagens WHERE id = ?"
+SQL_REMOVER_CURTIDAS_DA_POSTAGEM = (
+    "DELETE FROM curtidas WHERE id_resposta IN (SELECT id FROM respostas WHERE id_postagem = ?)")
+SQL_REMOVER_RESPOSTAS_DA_POSTAGEM = "DELETE FROM respostas WHERE id_postagem = ?"
+SQL_INSERIR_RESPOSTA = (
+    "INSERT INTO respostas (id, id_postagem, posicao, autor, conteudo, likes) VALUES (?, ?, ?, ?, ?, ?)")
+SQL_ATUALIZAR_LIKES = "UPDATE respostas SET likes = ? WHERE id = ?"
+SQL_REMOVER_RESPOSTA = "DELETE FROM respostas WHERE id = ?"
+SQL_REMOVER_CURTIDAS_DA_RESPOSTA = "DELETE FROM curtidas WHERE id_resposta = ?"
+SQL_INSERIR_CURTIDA = "INSERT OR IGNORE INTO curtidas (id_resposta, nome_usuario) VALUES (?, ?)"
+SQL_REMOVER_CURTIDA = "DELETE FROM curtidas WHERE id_resposta = ? AND nome_usuario = ?"
+
+
+# Erros causados pelos valores de uma linha, e não pelo banco.
+_ERROS_DE_LINHA = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+
+class RepositorioSQLite(Repositorio):
+    # Escritas ficam num buffer e são gravadas numa única transação a cada
+    # `tamanho_lote` operações (ou em confirmar()/fechar()). Sequências da mesma
+    # instrução viram um executemany, reaproveitando a instrução já compilada.
+    carregamento_preguicoso = True
+
+    def __init__(self, caminho: str, tamanho_lote: int = 1000):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self._pendentes = []
+        # (sql, parâmetros, erro) das escritas que o banco recusou.
+        self.rejeitadas = []
+        self._trava = threading.RLock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, cached_statements=64)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(_ESQUEMA)
+        self._migrar()
+        self._conexao.executescript(_GATILHOS)
+
+    def _migrar(self):
+        # Bancos criados antes de proxima_posicao: a coluna começa logo depois
+        # da maior posição gravada (o que já foi apagado do fim não há como saber).
+        for tabela, filhos, chave in (("topicos", "postagens", "id_topico"), ("postagens", "respostas", "id_postagem")):
+            colunas = [linha[1] for linha in self._conexao.execute(f"PRAGMA table_info({tabela})")]
+            if "proxima_posicao" in colunas:
+                continue
+            with self._conexao:
+                self._conexao.execute(
+                    f"ALTER TABLE {tabela} ADD COLUMN proxima_posicao INTEGER NOT NULL DEFAULT 0")
+                self._conexao.execute(
+                    f"UPDATE {tabela} SET proxima_posicao ="
+                    f" (SELECT COALESCE(MAX(posicao) + 1, 0) FROM {filhos} WHERE {chave} = {tabela}.id)")
+
+    # --- leitura ---
+    def _consultar(self, sql, parametros=()):
+        with self._trava:
+            self.confirmar()
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def carregar_usuarios(self):
+        return self._consultar("SELECT nome, nome_usuario, senha, permissoes FROM usuarios")
+
+    def carregar_topicos(self):
+        return self._consultar("SELECT id, titulo, autor, tipo, descricao FROM topicos ORDER BY id")
+
+    def carregar_postagens(self, id_topico):
+        return self._consultar(
+            "SELECT id, posicao, autor, texto FROM postagens WHERE id_topico = ? ORDER BY posicao", (id_topico,))
+
+    def carregar_respostas(self, id_postagem):
+        return self._consultar(
+            "SELECT id, posicao, autor, conteudo, likes FROM respostas WHERE id_postagem = ? ORDER BY posicao",
+            (id_postagem,))
+
+    def proxima_posicao_postagens(self, id_topico):
+        linhas = self._consultar("SELECT proxima_posicao FROM topicos WHERE id = ?", (id_topico,))
+        return linhas[0][0] if linhas else 0
+
+    def proxima_posicao_respostas(self, id_postagem):
+        linhas = self._consultar("SELECT proxima_posicao FROM postagens WHERE id = ?", (id_postagem,))
+        return linhas[0][0] if linhas else 0
+
+    def carregar_curtidas(self):
+        return self._consultar("SELECT nome_usuario, id_resposta FROM curtidas")
+
+    def localizar_postagem(self, id_postagem):
+        linhas = self._consultar("SELECT id_topico FROM postagens WHERE id = ?", (id_postagem,))
+        return linhas[0][0] if linhas else None
+
+    def localizar_resposta(self, id_resposta):
+        linhas = self._consultar("SELECT id_postagem FROM respostas WHERE id = ?", (id_resposta,))
+        return linhas[0][0] if linhas else None
+
+    def maiores_ids(self):
+        linha = self._consultar(
+            "SELECT (SELECT COALESCE(MAX(id), 0) FROM topicos),"
+            " (SELECT COALESCE(MAX(id), 0) FROM postagens),"
+            " (SELECT COALESCE(MAX(id), 0) FROM respostas)")[0]
+        return tuple(linha)
+
+    # --- escrita ---
+    def _enfileirar(self, sql, parametros):
+        with self._trava:
+            self._pendentes.append((sql, parametros))
+            if len(self._pendentes) >= self.tamanho_lote:
+                self.confirmar()
+
+    def salvar_usuario(self, usuario):
+        self._enfileirar(SQL_INSERIR_USUARIO,
+                         (usuario.nome_usuario, usuario.nome, usuario.senha, usuario.permissoes))
+
+    def salvar_topico(self, topico):
+        self._enfileirar(SQL_INSERIR_TOPICO,
+                         (topico.id, topico.titulo, topico.autor.nome_usuario, topico.tipo, topico.descricao))
+
+    def renomear_topico(self, topico):
+        self._enfileirar(SQL_RENOMEAR_TOPICO, (topico.titulo, topico.id))
+
+    def remover_topico(self, topico):
+        self._enfileirar(SQL_REMOVER_CURTIDAS_DO_TOPICO, (topico.id,))
+        self._enfileirar(SQL_REMOVER_RESPOSTAS_DO_TOPICO, (topico.id,))
+        self._enfileirar(SQL_REMOVER_POSTAGENS_DO_TOPICO, (topico.id,))
+        self._enfileirar(SQL_REMOVER_TOPICO, (topico.id,))
+
+    def salvar_postagem(self, postagem):
+        self._enfileirar(SQL_INSERIR_POSTAGEM, (
+            postagem.id, postagem.topico.id, postagem.posicao, postagem.autor.nome_usuario, postagem.texto))
+
+    def atualizar_postagem(self, postagem):
+        self._enfileirar(SQL_ATUALIZAR_POSTAGEM, (postagem.texto, postagem.id))
+
+    def remover_postagem(self, postagem):
+        self._enfileirar(SQL_REMOVER_CURTIDAS_DA_POSTAGEM, (postagem.id,))
+        self._enfileirar(SQL_REMOVER_RESPOSTAS_DA_POSTAGEM, (postagem.id,))
+        self._enfileirar(SQL_REMOVER_POSTAGEM, (postagem.id,))
+
+    def salvar_resposta(self, resposta):
+        self._enfileirar(SQL_INSERIR_RESPOSTA, (
+            resposta.id, resposta.postagem.id, resposta.posicao, resposta.autor.nome_usuario,
+            resposta.conteudo, resposta.quantidade_likes))
+
+    def atualizar_likes(self, resposta):
+        self._enfileirar(SQL_ATUALIZAR_LIKES, (resposta.quantidade_likes, resposta.id))
+
+    def remover_resposta(self, resposta):
+        self._enfileirar(SQL_REMOVER_CURTIDAS_DA_RESPOSTA, (resposta.id,))
+        self._enfileirar(SQL_REMOVER_RESPOSTA, (resposta.id,))
+
+    def salvar_curtida(self, nome_usuario, resposta):
+        self._enfileirar(SQL_INSERIR_CURTIDA, (resposta.id, nome_usuario))
+
+    def remover_curtida(self, nome_usuario, resposta):
+        self._enfileirar(SQL_REMOVER_CURTIDA, (resposta.id, nome_usuario))
+
+    def confirmar(self):
+        with self._trava:
+            if not self._pendentes:
+                return
+            pendentes, self._pendentes = self._pendentes, []
+            try:
+                try:
+                    self._confirmar_em_lote(pendentes)
+                except _ERROS_DE_LINHA:
+                    # Uma linha ruim desfaz a transação inteira; refaz uma a
+                    # uma para gravar as boas e reportar só as rejeitadas.
+                    self._confirmar_uma_a_uma(pendentes)
+            except sqlite3.Error:
+                # Falha do banco (travado, disco cheio): o lote volta para o
+                # buffer e é tentado de novo no próximo confirmar().
+                self._pendentes[:0] = pendentes
+                raise
+
+    def _confirmar_em_lote(self, pendentes):
+        with self._conexao:
+            inicio = 0
+            while inicio < len(pendentes):
+                sql = pendentes[inicio][0]
+                fim = inicio + 1
+                while fim < len(pendentes) and pendentes[fim][0] == sql:
+                    fim += 1
+                self._conexao.executemany(sql, [p for _, p in pendentes[inicio:fim]])
+                inicio = fim
+
+    def _confirmar_uma_a_uma(self, pendentes):
+        rejeitadas = []
+        with self._conexao:
+            for sql, parametros in pendentes:
+                try:
+                    self._conexao.execute(sql, parametros)
+                except _ERROS_DE_LINHA as erro:
+                    rejeitadas.append((sql, parametros, erro))
+        self.rejeitadas.extend(rejeitadas)
+        for sql, parametros, erro in rejeitadas:
+            publicar(FalhaOperacao("confirmar", f"{MSG_ESCRITA_REJEITADA} ({erro}: {parametros!r})"))
+
+    def fechar(self):
+        with self._trava:
+            self.confirmar()
+            self._conexao.close()
@@ -1,36 +1,406 @@
+import math
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from array import array
+from collections.abc import MutableSequence
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, calcular_lote usa laços em Python
+    np = None
+
+#  Visão colunar dos usuários 
+# Uma coluna por atributo usado nos ranks, na ordem dos usuários, em arrays
+# compactos (8 bytes por valor). Com NumPy, as colunas viram ndarrays sem
+# cópia. A soma das avaliações vem do agregado de cada usuário (soma
+# sequencial, ver Agregado), então a média em lote é bit a bit igual à de
+# calcular().
+class ColunasUsuarios:
+    __slots__ = ("comentarios", "topicos", "soma_avaliacoes", "qtd_avaliacoes", "meses_ativo", "usuarios")
+
+    def __init__(self, comentarios, topicos, soma_avaliacoes, qtd_avaliacoes, meses_ativo, usuarios=None):
+        self.comentarios = array("q", comentarios)
+        self.topicos = array("q", topicos)
+        self.soma_avaliacoes = array("d", soma_avaliacoes)
+        self.qtd_avaliacoes = array("q", qtd_avaliacoes)
+        self.meses_ativo = array("q", meses_ativo)
+        self.usuarios = usuarios
+        if len({len(self.comentarios), len(self.topicos), len(self.soma_avaliacoes),
+                len(self.qtd_avaliacoes), len(self.meses_ativo)}) > 1:
+            raise ValueError("As colunas devem ter o mesmo tamanho.")
+
+    @classmethod
+    def de_usuarios(cls, usuarios):
+        usuarios = list(usuarios)
+        return cls((u.agregado_comentarios.quantidade for u in usuarios),
+                   (u.agregado_topicos.quantidade for u in usuarios),
+                   (u.agregado_avaliacoes.soma for u in usuarios),
+                   (u.agregado_avaliacoes.quantidade for u in usuarios),
+                   (u.meses_ativo for u in usuarios), usuarios)
+
+    @classmethod
+    def sem_copia(cls, comentarios, topicos, soma_avaliacoes, qtd_avaliacoes, meses_ativo):
+        # Colunas sobre buffers já no formato certo (memoryview, memória
+        # compartilhada), sem copiar nem validar.
+        colunas = cls.__new__(cls)
+        colunas.comentarios, colunas.topicos = comentarios, topicos
+        colunas.soma_avaliacoes, colunas.qtd_avaliacoes = soma_avaliacoes, qtd_avaliacoes
+        colunas.meses_ativo, colunas.usuarios = meses_ativo, None
+        return colunas
+
+    def __len__(self):
+        return len(self.comentarios)
+
+    def numpy(self, nome):
+        return np.frombuffer(getattr(self, nome), dtype=np.float64 if nome == "soma_avaliacoes" else np.int64)
 
 #  Interface Strategy 
+# calcular_lote devolve as notas de todos os usuários das colunas, na mesma
+# ordem e idênticas às de calcular(): um ndarray float64 com NumPy, senão um
+# array('d').
 class EstrategiaRankeamento(ABC):
     @abstractmethod
     def calcular(self, usuario) -> float:
         pass
 
+    def calcular_lote(self, colunas: ColunasUsuarios):
+        # Estratégias sem versão em lote usam calcular() em cada usuário.
+        if colunas.usuarios is None:
+            raise ValueError(f"{type(self).__name__} precisa dos objetos Usuario para calcular em lote.")
+        notas = array("d", map(self.calcular, colunas.usuarios))
+        return np.frombuffer(notas, dtype=np.float64) if np is not None else notas
+
 # Estratégias Concretas 
 class RankPorParticipacao(EstrategiaRankeamento):
     def calcular(self, usuario) -> float:
-        return len(usuario.comentarios) * 1.5 + len(usuario.topicos) * 2
+        return usuario.agregado_comentarios.quantidade * 1.5 + usuario.agregado_topicos.quantidade * 2
+
+    def calcular_lote(self, colunas):
+        if np is not None:
+            return colunas.numpy("comentarios") * 1.5 + colunas.numpy("topicos") * 2
+        return array("d", [c * 1.5 + t * 2 for c, t in zip(colunas.comentarios, colunas.topicos)])
 
 class RankPorAvaliacoes(EstrategiaRankeamento):
     def calcular(self, usuario) -> float:
-        if not usuario.avaliacoes:
+        avaliacoes = usuario.agregado_avaliacoes
+        if not avaliacoes.quantidade:
             return 0.0
-        return sum(usuario.avaliacoes) / len(usuario.avaliacoes)
+        return avaliacoes.soma / avaliacoes.quantidade
+
+    def calcular_lote(self, colunas):
+        if np is not None:
+            soma, quantidade = colunas.numpy("soma_avaliacoes"), colunas.numpy("qtd_avaliacoes")
+            notas = np.zeros(len(colunas))
+            np.divide(soma, quantidade, out=notas, where=quantidade != 0)
+            return notas
+        return array("d", [s / n if n else 0.0 for s, n in zip(colunas.soma_avaliacoes, colunas.qtd_avaliacoes)])
 
 class RankPorTempoNoSistema(EstrategiaRankeamento):
     def calcular(self, usuario) -> float:
         return usuario.meses_ativo * 0.8
 
+    def calcular_lote(self, colunas):
+        if np is not None:
+            return colunas.numpy("meses_ativo") * 0.8
+        return array("d", [m * 0.8 for m in colunas.meses_ativo])
+
+#  Estratégia composta 
+# Soma ponderada de outras estratégias, cada parte normalizada pela população:
+# "minmax" leva a nota para [0, 1] e "zscore" para desvios-padrão em torno da
+# média. Os parâmetros da normalização (deslocamento e escala de cada parte)
+# saem de ajustar() ou do último calcular_lote() e ficam guardados, para que
+# calcular() de um usuário devolva exatamente a nota que ele teria no lote.
+class RankComposto(EstrategiaRankeamento):
+    NORMALIZACOES = (None, "minmax", "zscore")
+
+    def __init__(self, partes, normalizacao=None):
+        self.partes = [(estrategia, float(peso)) for estrategia, peso in partes]
+        if not self.partes:
+            raise ValueError("RankComposto precisa de pelo menos uma estratégia.")
+        if normalizacao not in self.NORMALIZACOES:
+            raise ValueError(f"Normalização desconhecida: {normalizacao!r}.")
+        self.normalizacao = normalizacao
+        self.parametros = [(0.0, 1.0)] * len(self.partes) if normalizacao is None else None
+
+    def ajustar(self, colunas: ColunasUsuarios):
+        self.calcular_lote(colunas)
+        return self.parametros
+
+    def calcular(self, usuario) -> float:
+        if self.parametros is None:
+            raise ValueError("Chame ajustar() ou calcular_lote() antes de calcular com normalização.")
+        nota = 0.0
+        for (estrategia, peso), (deslocamento, escala) in zip(self.partes, self.parametros):
+            nota += peso * ((estrategia.calcular(usuario) - deslocamento) / escala)
+        return nota
+
+    def calcular_lote(self, colunas, reajustar=True):
+        # Todas as partes leem as mesmas colunas, extraídas uma vez. Com NumPy
+        # a combinação é acumulada no lugar num único buffer auxiliar. Com
+        # reajustar=False, usa os parâmetros já guardados (um pedaço da
+        # população não deve redefinir a normalização).
+        lotes = [estrategia.calcular_lote(colunas) for estrategia, _ in self.partes]
+        if self.normalizacao is not None and reajustar:
+            self.parametros = [self._parametros(notas) for notas in lotes]
+        elif self.parametros is None:
+            raise ValueError("Chame ajustar() antes de calcular sem reajustar.")
+        if np is not None:
+            total, auxiliar = np.zeros(len(colunas)), np.empty(len(colunas))
+            for notas, (_, peso), (deslocamento, escala) in zip(lotes, self.partes, self.parametros):
+                np.subtract(notas, deslocamento, out=auxiliar)
+                auxiliar /= escala
+                auxiliar *= peso
+                total += auxiliar
+            return total
+        total = [0.0] * len(colunas)
+        for notas, (_, peso), (deslocamento, escala) in zip(lotes, self.partes, self.parametros):
+            total = [nota + peso * ((valor - deslocamento) / escala) for nota, valor in zip(total, notas)]
+        return array("d", total)
+
+    def _parametros(self, notas):
+        if not len(notas):
+            return 0.0, 1.0
+        if self.normalizacao == "minmax":
+            if np is not None:
+                minimo, maximo = float(np.min(notas)), float(np.max(notas))
+            else:
+                minimo, maximo = min(notas), max(notas)
+            return minimo, (maximo - minimo) or 1.0
+        if np is not None:
+            media, desvio = float(np.mean(notas)), float(np.std(notas))
+        else:
+            media = math.fsum(notas) / len(notas)
+            desvio = math.sqrt(math.fsum((nota - media) ** 2 for nota in notas) / len(notas))
+        return media, desvio or 1.0
+
+#  Agregados 
+# Quantidade, soma, soma dos quadrados e instante da última mudança, mantidos
+# a cada inclusão ou remoção para que as estratégias leiam tudo em O(1).
+# Comentários e tópicos entram com valor 1; avaliações, com a nota.
+#
+# A soma é sequencial: cada valor somado ao total, na ordem de chegada. Ela
+# é fixada aqui e não delegada ao sum() do interpretador, que passou a usar
+# soma compensada no Python 3.12; assim o rank não muda com a versão do Python.
+class Agregado:
+    __slots__ = ("quantidade", "soma", "soma_quadrados", "atualizado_em")
+
+    def __init__(self, valores: Iterable[float] = ()):
+        self.quantidade = 0
+        self.soma = 0
+        self.soma_quadrados = 0
+        self.atualizado_em = None
+        for valor in valores:
+            self.adicionar(valor)
+
+    def adicionar(self, valor=1):
+        self.quantidade += 1
+        self.soma += valor
+        self.soma_quadrados += valor * valor
+        self.atualizado_em = time.time()
+
+    def remover(self, valor=1):
+        if not self.quantidade:
+            raise ValueError("Agregado vazio.")
+        self.quantidade -= 1
+        if self.quantidade:
+            self.soma -= valor
+            self.soma_quadrados -= valor * valor
+        else:
+            self.soma = self.soma_quadrados = 0
+        self.atualizado_em = time.time()
+
+    @property
+    def media(self) -> float:
+        return self.soma / self.quantidade if self.quantidade else 0.0
+
+    @property
+    def variancia(self) -> float:
+        if not self.quantidade:
+            return 0.0
+        media = self.soma / self.quantidade
+        return max(0.0, self.soma_quadrados / self.quantidade - media * media)
+
+#  Histórico como lista 
+# comentarios/topicos/avaliacoes continuam se comportando como as listas de
+# antes (append, remove, del, +=, comparação com listas), mas toda alteração
+# passa pelo usuário: append e remove viram adicionar_*/remover_*, e as demais
+# mudam a lista e refazem o agregado, como a atribuição inteira.
+_SINGULAR = {"comentarios": "comentario", "topicos": "topico", "avaliacoes": "avaliacao"}
+
+class HistoricoUsuario(MutableSequence):
+    __slots__ = ("_usuario", "_campo")
+
+    def __init__(self, usuario, campo):
+        self._usuario = usuario
+        self._campo = campo
+
+    def _lista(self):
+        return getattr(self._usuario, "_" + self._campo)
+
+    def __len__(self):
+        return len(self._lista() or ())
+
+    def __getitem__(self, indice):
+        return (self._lista() or [])[indice]
+
+    def append(self, valor):
+        getattr(self._usuario, "adicionar_" + _SINGULAR[self._campo])(valor)
+
+    def remove(self, valor):
+        getattr(self._usuario, "remover_" + _SINGULAR[self._campo])(valor)
+
+    def clear(self):
+        setattr(self._usuario, self._campo, [])
+
+    def insert(self, indice, valor):
+        self._alterar(lambda itens: itens.insert(indice, valor))
+
+    def __setitem__(self, indice, valor):
+        self._alterar(lambda itens: itens.__setitem__(indice, valor))
+
+    def __delitem__(self, indice):
+        self._alterar(lambda itens: itens.__delitem__(indice))
+
+    def _alterar(self, operacao):
+        itens = self._lista()
+        if itens is None:
+            raise IndexError("histórico descartado: só append, remove e clear atualizam os agregados")
+        itens = list(itens)
+        operacao(itens)
+        setattr(self._usuario, self._campo, itens)
+
+    def __eq__(self, outro):
+        if isinstance(outro, (list, tuple, HistoricoUsuario)):
+            return list(self) == list(outro)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
 #  Contexto 
+# Com manter_historico=False (ou depois de descartar_historico()), só os
+# agregados são guardados e comentarios/topicos/avaliacoes ficam vazios.
+# Toda mudança que altera uma nota avisa os placares (placar.py) que
+# acompanham o usuário.
 class Usuario:
-    def __init__(self, nome: str):
+    def __init__(self, nome: str, manter_historico: bool = True):
         self.nome = nome
-        self.comentarios: List[str] = []
-        self.topicos: List[str] = []
-        self.avaliacoes: List[float] = []
-        self.meses_ativo: int = 0
+        self._placares = []
+        self._meses_ativo = 0
         self._estrategia: EstrategiaRankeamento = None
+        self.agregado_comentarios = Agregado()
+        self.agregado_topicos = Agregado()
+        self.agregado_avaliacoes = Agregado()
+        self._comentarios = [] if manter_historico else None
+        self._topicos = [] if manter_historico else None
+        self._avaliacoes = [] if manter_historico else None
+
+    def acompanhar_placar(self, placar):
+        if placar not in self._placares:
+            self._placares.append(placar)
+
+    def deixar_placar(self, placar):
+        if placar in self._placares:
+            self._placares.remove(placar)
+
+    def _mudou(self):
+        for placar in self._placares:
+            placar.atualizar(self)
+
+    @property
+    def meses_ativo(self) -> int:
+        return self._meses_ativo
+
+    @meses_ativo.setter
+    def meses_ativo(self, meses: int):
+        self._meses_ativo = meses
+        self._mudou()
+
+    @property
+    def mantem_historico(self) -> bool:
+        return self._comentarios is not None
+
+    def descartar_historico(self):
+        self._comentarios = self._topicos = self._avaliacoes = None
+
+    # Atribuir a sequência inteira, como quando eram listas, refaz o agregado.
+    @property
+    def comentarios(self):
+        return HistoricoUsuario(self, "comentarios")
+
+    @comentarios.setter
+    def comentarios(self, comentarios):
+        self._substituir("comentarios", comentarios)
+
+    @property
+    def topicos(self):
+        return HistoricoUsuario(self, "topicos")
+
+    @topicos.setter
+    def topicos(self, topicos):
+        self._substituir("topicos", topicos)
+
+    @property
+    def avaliacoes(self):
+        return HistoricoUsuario(self, "avaliacoes")
+
+    @avaliacoes.setter
+    def avaliacoes(self, avaliacoes):
+        self._substituir("avaliacoes", avaliacoes)
+
+    def _substituir(self, campo, valores):
+        if isinstance(valores, HistoricoUsuario) and valores._usuario is self and valores._campo == campo:
+            return  # `usuario.avaliacoes += [...]`: a vista já aplicou a mudança
+        valores = list(valores)
+        setattr(self, "agregado_" + campo, Agregado(valores if campo == "avaliacoes" else [1] * len(valores)))
+        if self.mantem_historico:
+            setattr(self, "_" + campo, valores)
+        self._mudou()
+
+    def adicionar_comentario(self, comentario: str):
+        if self._comentarios is not None:
+            self._comentarios.append(comentario)
+        self.agregado_comentarios.adicionar()
+        self._mudou()
+
+    def remover_comentario(self, comentario: str):
+        if self._comentarios is not None:
+            self._comentarios.remove(comentario)
+        self.agregado_comentarios.remover()
+        self._mudou()
+
+    def adicionar_topico(self, topico: str):
+        if self._topicos is not None:
+            self._topicos.append(topico)
+        self.agregado_topicos.adicionar()
+        self._mudou()
+
+    def remover_topico(self, topico: str):
+        if self._topicos is not None:
+            self._topicos.remove(topico)
+        self.agregado_topicos.remover()
+        self._mudou()
+
+    def adicionar_avaliacao(self, nota: float):
+        if self._avaliacoes is not None:
+            self._avaliacoes.append(nota)
+        self.agregado_avaliacoes.adicionar(nota)
+        self._mudou()
+
+    def remover_avaliacao(self, nota: float):
+        if self._avaliacoes is None:
+            self.agregado_avaliacoes.remover(nota)
+            self._mudou()
+            return
+        self._avaliacoes.remove(nota)
+        # Com o histórico, a soma é refeita na ordem original: subtrair acumula
+        # erro de arredondamento e a média deixaria de ser a da soma sequencial.
+        self.agregado_avaliacoes = Agregado(self._avaliacoes)
+        self.agregado_avaliacoes.atualizado_em = time.time()
+        self._mudou()
 
     def set_estrategia_rankeamento(self, estrategia: EstrategiaRankeamento):
         self._estrategia = estrategia
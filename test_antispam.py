@@ -0,0 +1,79 @@
+import unittest
+
+from antispam import IndiceDuplicatas
+
+SPAM = "Compre agora o melhor café do Brasil com 50% de desconto no site www.cafebarato.com!!!"
+VARIACAO = "COMPRE JÁ o melhor cafe do brasil com 50% desconto no site www.cafebarato.com"
+LEGITIMA = "Alguém sabe qual a melhor moagem para prensa francesa? Uso grãos de torra média."
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TestIndiceDuplicatas(unittest.TestCase):
+    def setUp(self):
+        self.relogio = Relogio()
+        self.indice = IndiceDuplicatas(capacidade=3, ttl=60, relogio=self.relogio)
+
+    def adicionar(self, chave, texto):
+        self.indice.adicionar(chave, self.indice.assinatura(texto))
+
+    def semelhante(self, texto):
+        return self.indice.semelhante(self.indice.assinatura(texto))
+
+    def test_encontra_variacao_e_ignora_texto_diferente(self):
+        self.adicionar("spam", SPAM)
+        chave, similaridade = self.semelhante(VARIACAO)
+        self.assertEqual(chave, "spam")
+        self.assertGreaterEqual(similaridade, self.indice.limiar)
+        self.assertIsNone(self.semelhante(LEGITIMA))
+
+    def test_textos_curtos_nao_tem_assinatura(self):
+        self.assertIsNone(self.indice.assinatura("Obrigado!"))
+        self.indice.adicionar("curto", None)
+        self.assertEqual(len(self.indice), 0)
+        self.assertIsNone(self.indice.semelhante(None))
+
+    def test_expira_por_tempo_e_renovacao_adia(self):
+        self.adicionar("spam", SPAM)
+        self.adicionar("legitima", LEGITIMA)
+        self.relogio.agora = 50.0
+        self.indice.renovar("spam")
+        self.relogio.agora = 70.0
+        self.assertEqual(self.semelhante(VARIACAO)[0], "spam")
+        self.assertEqual(len(self.indice), 1)
+        self.relogio.agora = 111.0
+        self.assertIsNone(self.semelhante(VARIACAO))
+        self.assertEqual(len(self.indice), 0)
+
+    def test_capacidade_descarta_as_mais_antigas(self):
+        self.adicionar("spam", SPAM)
+        for i in range(3):
+            self.adicionar(i, f"{LEGITIMA} Outra pergunta número {i}: " + "xyz" * (i + 5) * 7)
+        self.assertEqual(len(self.indice), 3)
+        self.assertIsNone(self.semelhante(VARIACAO))
+        self.assertFalse(any("spam" in chaves for balde in self.indice._baldes for chaves in balde.values()))
+
+    def test_readicionar_substitui_a_assinatura(self):
+        self.adicionar("chave", SPAM)
+        self.adicionar("chave", LEGITIMA)
+        self.assertIsNone(self.semelhante(VARIACAO))
+        self.assertEqual(len(self.indice), 1)
+
+    def test_remover_e_ignorar_a_propria_chave(self):
+        self.adicionar("chave", SPAM)
+        self.assertIsNone(self.indice.semelhante(self.indice.assinatura(VARIACAO), ignorar="chave"))
+        self.indice.remover("chave")
+        self.indice.remover("chave")
+        self.assertIsNone(self.semelhante(VARIACAO))
+        self.assertEqual(len(self.indice), 0)
+        self.assertFalse(any(balde for balde in self.indice._baldes))
+
+
+if __name__ == "__main__":
+    unittest.main()
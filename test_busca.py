@@ -0,0 +1,117 @@
+import unittest
+
+from busca import POSTAGEM, RESPOSTA, TOPICO, IndiceTextual, tokenizar
+from test_forum_manager import ForumTestCase
+
+
+class TestTokenizacao(unittest.TestCase):
+    def test_remove_acentos_caixa_e_palavras_vazias(self):
+        self.assertEqual(tokenizar("O Café da Manhã é ÓTIMO"), ["cafe", "manha", "otimo"])
+
+
+class TestIndiceTextual(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceTextual()
+        self.indice.indexar(POSTAGEM, 1, "Cold brew de café gelado")
+        self.indice.indexar(POSTAGEM, 2, "Café coado no filtro de papel")
+        self.indice.indexar(RESPOSTA, 1, "Cold brew cold brew: vale a pena o cold brew")
+
+    def test_ranking_bm25(self):
+        resultados = self.indice.buscar("cold brew")
+        self.assertEqual([(tipo, id) for _, tipo, id in resultados], [(RESPOSTA, 1), (POSTAGEM, 1)])
+        self.assertGreater(resultados[0][0], resultados[1][0])
+
+    def test_filtro_por_tipo_e_limite(self):
+        self.assertEqual([id for _, _, id in self.indice.buscar("café", tipos=[POSTAGEM])], [1, 2])
+        self.assertEqual(len(self.indice.buscar("cafe cold", limite=1)), 1)
+
+    def test_remover_e_reindexar(self):
+        self.indice.remover(POSTAGEM, 1, "Cold brew de café gelado")
+        self.assertEqual([id for _, _, id in self.indice.buscar("gelado")], [])
+        self.indice.reindexar(POSTAGEM, 2, "Café coado no filtro de papel", "Prensa francesa")
+        self.assertEqual([id for _, _, id in self.indice.buscar("prensa")], [2])
+        self.assertEqual(self.indice.buscar("filtro"), [])
+
+    def test_maxscore_igual_a_busca_exaustiva(self):
+        indice = IndiceTextual()
+        for i in range(500):
+            indice.indexar(POSTAGEM, i, "cafe " * (i % 7 + 1) + ("raro " if i % 50 == 0 else "") + f"extra{i % 3}")
+        exaustivo = IndiceTextual()
+        exaustivo._postings, exaustivo._comprimentos = indice._postings, indice._comprimentos
+        exaustivo._total_termos = indice._total_termos
+        podado = indice.buscar("raro cafe", limite=5)
+        # Com limite grande não há poda: todas as notas são calculadas.
+        completo = exaustivo.buscar("raro cafe", limite=10_000)[:5]
+        self.assertEqual(podado, completo)
+
+
+    def test_campeoes_para_termos_muito_comuns(self):
+        indice = IndiceTextual(limite_varredura=50, campeoes=20)
+        for i in range(300):
+            # Mesmo comprimento em todos: o peso só depende da frequência do termo.
+            indice.indexar(POSTAGEM, i, " ".join(["cafe"] * (i % 10 + 1) + ["x"] * (10 - i % 10)))
+        self.assertIn("cafe", indice._campeoes)
+        exaustivo = IndiceTextual(limite_varredura=10_000)
+        exaustivo._postings, exaustivo._comprimentos = indice._postings, indice._comprimentos
+        exaustivo._total_termos = indice._total_termos
+        # Há empates entre documentos; o que importa é recuperar as mesmas notas.
+        self.assertEqual([nota for nota, _, _ in indice.buscar("cafe", limite=5)],
+                         [nota for nota, _, _ in exaustivo.buscar("cafe", limite=5)])
+
+        for i in range(290):
+            indice.remover(POSTAGEM, i, " ".join(["cafe"] * (i % 10 + 1) + ["x"] * (10 - i % 10)))
+        self.assertNotIn("cafe", indice._campeoes)
+        self.assertEqual(len(indice.buscar("cafe", limite=50)), 10)
+
+    def test_campeoes_descartam_documentos_removidos(self):
+        indice = IndiceTextual(limite_varredura=50, campeoes=20)
+        texto = lambda i: " ".join(["cafe"] * (i % 10 + 1) + ["x"] * (10 - i % 10))
+        for i in range(300):
+            indice.indexar(POSTAGEM, i, texto(i))
+        removidos = [i for i in range(300) if i % 10 >= 8]
+        for i in removidos[::2]:
+            indice.reindexar(POSTAGEM, i, texto(i), texto(i))
+        for i in removidos:
+            indice.remover(POSTAGEM, i, texto(i))
+            campeoes = indice._campeoes["cafe"]
+            self.assertNotIn(i << 2 | 1, campeoes.pesos)
+            self.assertLessEqual(campeoes.obsoletos, 5)
+            self.assertEqual(len(campeoes.pesos) + campeoes.obsoletos, len(campeoes.heap))
+        # Sem os documentos removidos ocupando vagas, os melhores que sobraram
+        # (frequência 8) voltam a ser encontrados.
+        self.assertEqual([nota for nota, _, _ in indice.buscar("cafe", limite=5)],
+                         [indice.buscar("cafe", limite=300)[0][0]] * 5)
+        self.assertEqual({(id_ % 10) for _, _, id_ in indice.buscar("cafe", limite=5)}, {7})
+
+
+class TestBuscaNoManager(ForumTestCase):
+    def test_indexacao_incremental(self):
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Onde tomar cold brew?")
+        # Mesmos termos, texto mais longo: BM25 favorece a postagem mais curta.
+        resposta = self.manager.responder_postagem_por_id(postagem.id, "alice", "O melhor cold brew é no centro")
+
+        self.assertEqual([r.objeto for r in self.manager.pesquisar("cold brew")], [postagem, resposta])
+        self.assertEqual([r.objeto for r in self.manager.pesquisar("cafes", tipos=[TOPICO])], [self.topico])
+
+    def test_editar_postagem_reindexa(self):
+        postagem = self.manager.adicionar_postagem("Moagem", "bruno", "Moagem fina para espresso")
+        self.manager.editar_postagem(postagem.id, "Moagem grossa para prensa")
+        self.assertEqual(postagem.texto, "Moagem grossa para prensa")
+        self.assertEqual(self.manager.pesquisar("espresso"), [])
+        self.assertEqual([r.objeto for r in self.manager.pesquisar("prensa")], [postagem])
+
+    def test_remocoes_saem_do_indice(self):
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Torra clara")
+        self.manager.responder_postagem_por_id(postagem.id, "alice", "Torra média")
+        self.manager.remover_postagem(postagem.id)
+        self.assertEqual(self.manager.pesquisar("torra"), [])
+        self.manager.remover_topico("Moagem")
+        self.assertEqual(self.manager.pesquisar("moagem"), [])
+
+    def test_renomear_reindexa_topico(self):
+        self.manager.renomear_topico("Cafés do Sul", "Torrefações do Sul")
+        self.assertEqual([r.objeto for r in self.manager.pesquisar("torrefacoes")], [self.topico])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import sys
+import tempfile
+import threading
+import unittest
+
+from diario import RepositorioDiario
+from eventos import SinkMemoria, definir_sink
+from forum_manager import ComunidadeCafeManager
+
+THREADS = 8
+OPERACOES = 300
+
+
+def executar_em_paralelo(alvo, quantidade=THREADS):
+    # Todas as threads começam juntas para maximizar a disputa.
+    largada = threading.Barrier(quantidade)
+    erros = []
+
+    def correr(indice):
+        largada.wait()
+        try:
+            alvo(indice)
+        except Exception as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=correr, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise erros[0]
+
+
+class ConcorrenciaTestCase(unittest.TestCase):
+    def setUp(self):
+        # Trocas de thread frequentes expõem janelas de leitura-e-escrita.
+        self._intervalo_anterior = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+        ComunidadeCafeManager._instancia = None
+
+    def tearDown(self):
+        sys.setswitchinterval(self._intervalo_anterior)
+        definir_sink(self._sink_anterior)
+        ComunidadeCafeManager._instancia = None
+
+    def popular(self, manager):
+        # Rajadas de escrita de propósito: o limite por usuário tem testes próprios.
+        manager.limitador = None
+        for i in range(THREADS):
+            manager.registrar_usuario(f"Usuário {i}", f"u{i}", "123")
+            manager.criar_topico(f"Tópico {i}", f"u{i}", "Discussão", "")
+        return manager.adicionar_postagem("Tópico 0", "u0", "Qual o melhor grão?")
+
+
+class TestConcorrencia(ConcorrenciaTestCase):
+    def test_singleton_criado_uma_unica_vez(self):
+        instancias = []
+        executar_em_paralelo(lambda i: instancias.append(ComunidadeCafeManager()))
+        self.assertEqual(len({id(instancia) for instancia in instancias}), 1)
+
+    def test_nomes_de_usuario_nao_duplicam(self):
+        manager = ComunidadeCafeManager()
+        sucessos = []
+
+        def registrar(indice):
+            for n in range(OPERACOES // 10):
+                if manager.registrar_usuario(f"Pessoa {indice}", f"pessoa{n}", "123"):
+                    sucessos.append(n)
+
+        executar_em_paralelo(registrar)
+        self.assertEqual(sorted(sucessos), list(range(OPERACOES // 10)))
+        self.assertEqual(len(manager.usuarios), OPERACOES // 10)
+
+    def test_respostas_na_mesma_postagem_nao_se_perdem(self):
+        manager = ComunidadeCafeManager()
+        postagem = self.popular(manager)
+
+        def responder(indice):
+            for n in range(OPERACOES):
+                manager.responder_postagem_por_id(postagem.id, f"u{indice}", f"resposta {n}")
+
+        executar_em_paralelo(responder)
+        respostas = list(postagem.respostas)
+        self.assertEqual(len(respostas), THREADS * OPERACOES)
+        self.assertEqual(sorted(r.posicao for r in respostas), list(range(THREADS * OPERACOES)))
+        self.assertEqual(len({r.id for r in respostas}), THREADS * OPERACOES)
+
+    def test_curtidas_concorrentes_nao_se_perdem(self):
+        manager = ComunidadeCafeManager()
+        postagem = self.popular(manager)
+        resposta = manager.responder_postagem_por_id(postagem.id, "u1", "Catuaí!")
+        fas = [f"fa{n}" for n in range(THREADS * OPERACOES)]
+        for nome_usuario in fas:
+            manager.registrar_usuario(nome_usuario, nome_usuario, "123")
+
+        # Cada thread curte com o seu bloco de usuários e com o da vizinha: todo
+        # like é tentado duas vezes ao mesmo tempo e só um pode contar.
+        def curtir(indice):
+            for n in range(indice * OPERACOES, (indice + 2) * OPERACOES):
+                manager.curtir_resposta(resposta.id, fas[n % len(fas)])
+
+        executar_em_paralelo(curtir)
+        self.assertEqual(resposta.quantidade_likes, THREADS * OPERACOES)
+        self.assertEqual(len(manager.curtidas), THREADS * OPERACOES)
+
+    def test_postagens_em_topicos_diferentes(self):
+        manager = ComunidadeCafeManager()
+        self.popular(manager)
+
+        def postar(indice):
+            for n in range(OPERACOES):
+                manager.adicionar_postagem(f"Tópico {indice}", f"u{indice}", f"postagem {n}")
+
+        executar_em_paralelo(postar)
+        for i, topico in enumerate(manager.topicos):
+            esperado = OPERACOES + (1 if i == 0 else 0)
+            self.assertEqual(len(topico.postagens), esperado)
+        self.assertEqual(len(manager.postagens_por_id), THREADS * OPERACOES + 1)
+
+    def test_resposta_a_postagem_removida_falha(self):
+        manager = ComunidadeCafeManager()
+        postagem = self.popular(manager)
+        respostas = []
+
+        def agir(indice):
+            if indice == 0:
+                manager.remover_postagem(postagem.id)
+            else:
+                for n in range(OPERACOES // 10):
+                    respostas.append(manager.responder_postagem_por_id(postagem.id, f"u{indice}", f"r{n}"))
+
+        executar_em_paralelo(agir)
+        # Toda resposta aceita ficou indexada apenas se a postagem ainda existia.
+        self.assertEqual(postagem.topico, None)
+        for resposta in filter(None, respostas):
+            self.assertNotIn(resposta.id, manager.respostas_por_id)
+
+
+class TestConcorrenciaDiario(ConcorrenciaTestCase):
+    def test_snapshots_durante_escritas_concorrentes(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            manager = ComunidadeCafeManager()
+            # Diário pequeno força vários snapshots automáticos no meio da carga.
+            manager.usar_repositorio(RepositorioDiario(pasta, limite_diario=16 * 1024))
+            postagem = self.popular(manager)
+            resposta = manager.responder_postagem_por_id(postagem.id, "u0", "Bourbon")
+
+            def escrever(indice):
+                for n in range(OPERACOES // 3):
+                    manager.adicionar_postagem(f"Tópico {indice}", f"u{indice}", f"postagem {n}")
+                    manager.responder_postagem_por_id(postagem.id, f"u{indice}", f"resposta {n}")
+                    manager.curtir_resposta(resposta.id, f"u{indice}")
+
+            executar_em_paralelo(escrever)
+            esperado = [(t.titulo, [(p.id, p.texto, sorted((r.id, r.quantidade_likes) for r in p.respostas))
+                                    for p in t.postagens]) for t in manager.topicos]
+            manager.fechar()
+
+            ComunidadeCafeManager._instancia = None
+            reaberto = ComunidadeCafeManager()
+            reaberto.usar_repositorio(RepositorioDiario(pasta))
+            obtido = [(t.titulo, [(p.id, p.texto, sorted((r.id, r.quantidade_likes) for r in p.respostas))
+                                  for p in t.postagens]) for t in reaberto.topicos]
+            reaberto.fechar()
+            self.assertEqual(obtido, esperado)
+            self.assertEqual(len(reaberto.usuarios), THREADS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from curtidas import ConjuntoCompacto, RegistroCurtidas
+
+
+class TestConjuntoCompacto(unittest.TestCase):
+    def verificar(self, conjunto, referencia):
+        self.assertEqual(len(conjunto), len(referencia))
+        self.assertEqual(list(conjunto), sorted(referencia))
+
+    def test_operacoes_aleatorias_batem_com_set(self):
+        aleatorio = random.Random(3)
+        conjunto, referencia = ConjuntoCompacto(), set()
+        for _ in range(20_000):
+            valor = aleatorio.randrange(300_000)
+            if aleatorio.random() < 0.3:
+                self.assertEqual(conjunto.remover(valor), valor in referencia)
+                referencia.discard(valor)
+            else:
+                self.assertEqual(conjunto.adicionar(valor), valor not in referencia)
+                referencia.add(valor)
+        self.verificar(conjunto, referencia)
+        for valor in range(0, 300_000, 997):
+            self.assertEqual(valor in conjunto, valor in referencia)
+
+    def test_conteiner_denso_vira_bitmap(self):
+        valores = set(range(70_000, 80_000))
+        conjunto = ConjuntoCompacto(valores)
+        self.verificar(conjunto, valores)
+        # Um bitmap de 8 KiB por 65536 valores possíveis, mais um array('H') para o resto.
+        self.assertLess(conjunto.tamanho_em_bytes(), 8192 + 2 * 10_000)
+        for valor in (70_000, 75_000, 79_999):
+            self.assertTrue(conjunto.remover(valor))
+            self.assertFalse(conjunto.remover(valor))
+            valores.discard(valor)
+        self.verificar(conjunto, valores)
+
+
+class TestRegistroCurtidas(unittest.TestCase):
+    def test_curtida_idempotente_e_consulta_em_lote(self):
+        registro = RegistroCurtidas()
+        self.assertTrue(registro.adicionar("alice", 10))
+        self.assertFalse(registro.adicionar("alice", 10))
+        registro.adicionar("bruno", 10)
+        registro.adicionar("alice", 12)
+        self.assertEqual(len(registro), 3)
+        self.assertEqual(registro.curtidas_em("alice", [10, 11, 12]), [True, False, True])
+        self.assertEqual(registro.curtidas_em("carla", [10, 12]), [False, False])
+        self.assertEqual(sorted(registro.usuarios_que_curtiram(10)), ["alice", "bruno"])
+
+        self.assertTrue(registro.remover("alice", 10))
+        self.assertFalse(registro.remover("alice", 10))
+        registro.remover_resposta(12)
+        self.assertEqual(registro.curtidas_em("alice", [10, 12]), [False, False])
+        self.assertEqual(list(registro.itens()), [(10, ["bruno"])])
+        self.assertEqual(len(registro), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
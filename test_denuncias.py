@@ -0,0 +1,126 @@
+import gc
+import io
+import unittest
+import weakref
+from contextlib import redirect_stdout
+
+from adapter import Noticia, TopicoAdapter
+from denuncias import ACEITA, LIMITADA, OCULTADA, REPETIDA, ContadorJanela, RegistroDenuncias
+from eventos import ConteudoOcultado, DenunciaRegistrada, FalhaOperacao, SinkMemoria, definir_sink
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TestContadorJanela(unittest.TestCase):
+    def test_baldes_antigos_saem_da_janela(self):
+        contador = ContadorJanela(4)
+        contador.somar(0)
+        contador.somar(1, 2)
+        contador.somar(3)
+        self.assertEqual(contador.total(3), 4)
+        self.assertEqual(contador.total(4), 3)
+        self.assertEqual(contador.total(5), 1)
+        self.assertEqual(contador.total(50), 0)
+        self.assertEqual(contador.somar(50), 1)
+
+
+class TestRegistroDenuncias(unittest.TestCase):
+    def setUp(self):
+        self.relogio = Relogio()
+        self.registro = RegistroDenuncias(limite_ocultar=3, janela_conteudo=60, limite_denunciante=2,
+                                          janela_denunciante=10, baldes=5, relogio=self.relogio)
+
+    def test_oculta_ao_atingir_o_limite(self):
+        self.assertEqual(self.registro.registrar("r1", "ana"), ACEITA)
+        self.assertEqual(self.registro.registrar("r1", "bia"), ACEITA)
+        self.assertEqual(self.registro.registrar("r1", "caio"), OCULTADA)
+        self.assertEqual(self.registro.registrar("r1", "davi"), ACEITA)
+        self.assertTrue(self.registro.oculto("r1"))
+        self.assertEqual(self.registro.denuncias("r1"), 4)
+
+        self.registro.reexibir("r1")
+        self.assertFalse(self.registro.oculto("r1"))
+        self.assertEqual(self.registro.denuncias("r1"), 0)
+
+    def test_mesmo_denunciante_conta_uma_vez(self):
+        registro = RegistroDenuncias(limite_ocultar=5, janela_conteudo=60, baldes=5, relogio=self.relogio)
+        self.assertEqual(registro.registrar("r1", "ana"), ACEITA)
+        for _ in range(4):
+            self.assertEqual(registro.registrar("r1", "ana"), REPETIDA)
+        self.assertFalse(registro.oculto("r1"))
+        self.assertEqual(registro.denuncias("r1"), 1)
+        # Fora da janela, a denúncia volta a contar.
+        self.relogio.agora = 61.0
+        self.assertEqual(registro.registrar("r1", "ana"), ACEITA)
+        self.assertEqual(registro.denuncias("r1"), 1)
+
+    def test_denuncias_antigas_nao_ocultam(self):
+        self.registro.registrar("r1", "ana")
+        self.registro.registrar("r1", "bia")
+        self.relogio.agora = 61.0
+        self.assertEqual(self.registro.registrar("r1", "caio"), ACEITA)
+        self.assertEqual(self.registro.denuncias("r1"), 1)
+
+    def test_denunciante_limitado_ate_a_janela_andar(self):
+        self.registro.registrar("r1", "ana")
+        self.registro.registrar("r2", "ana")
+        self.assertEqual(self.registro.registrar("r3", "ana"), LIMITADA)
+        self.assertEqual(self.registro.denuncias("r3"), 0)
+        self.assertEqual(self.registro.denuncias_de("ana"), 2)
+        self.relogio.agora = 10.0
+        self.assertEqual(self.registro.registrar("r3", "ana"), ACEITA)
+        # Denúncias anônimas não têm limite por denunciante.
+        for _ in range(5):
+            self.registro.registrar("r4")
+        self.assertEqual(self.registro.denuncias("r4"), 5)
+
+    def test_contadores_vazios_sao_descartados(self):
+        for i in range(3000):
+            self.registro.registrar(i)
+        self.relogio.agora = 1000.0
+        for i in range(1200):
+            self.registro.registrar(("novo", i))
+        self.assertLess(len(self.registro._por_conteudo), 3000)
+        self.assertEqual(self.registro.denuncias(("novo", 0)), 1)
+
+
+class TestDenunciaDeTopicoAdaptado(unittest.TestCase):
+    def setUp(self):
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+
+    def tearDown(self):
+        definir_sink(self._sink_anterior)
+
+    def test_adapter_oculta_topico(self):
+        registro = RegistroDenuncias(limite_ocultar=2, limite_denunciante=2)
+        adapter = TopicoAdapter(noticia=Noticia("Mercado", "ana", "", "2025", "", "Folha"))
+        with redirect_stdout(io.StringIO()) as saida:
+            adapter.denunciar("ana", registro)
+            adapter.denunciar("ana", registro)
+            adapter.denunciar("bia", registro)
+            adapter.denunciar("ana", registro)
+        self.assertEqual(saida.getvalue(), "")
+        self.assertTrue(adapter.oculto)
+        self.assertEqual([type(e) for e in self.sink.eventos],
+                         [DenunciaRegistrada, DenunciaRegistrada, ConteudoOcultado, FalhaOperacao])
+        self.assertEqual(self.sink.eventos[2].mensagem(), "Tópico ocultado após denúncias.")
+
+    def test_registro_nao_segura_o_adapter(self):
+        registro = RegistroDenuncias()
+        adapter = TopicoAdapter(noticia=Noticia("Mercado", "ana", "", "2025", "", "Folha"))
+        adapter.denunciar("ana", registro)
+        referencia = weakref.ref(adapter)
+        del adapter
+        gc.collect()
+        self.assertIsNone(referencia())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import os
+import tempfile
+import unittest
+
+from diario import RepositorioDiario
+from eventos import SinkNulo, definir_sink
+from forum_manager import ComunidadeCafeManager
+
+
+class TestRepositorioDiario(unittest.TestCase):
+    def setUp(self):
+        self._sink_anterior = definir_sink(SinkNulo())
+        self._pasta = tempfile.TemporaryDirectory()
+        self.pasta = self._pasta.name
+        self.manager = self.abrir()
+
+    def tearDown(self):
+        self.manager.fechar()
+        ComunidadeCafeManager._instancia = None
+        definir_sink(self._sink_anterior)
+        self._pasta.cleanup()
+
+    def abrir(self, **opcoes):
+        ComunidadeCafeManager._instancia = None
+        manager = ComunidadeCafeManager()
+        manager.usar_repositorio(RepositorioDiario(self.pasta, **opcoes))
+        return manager
+
+    def reiniciar(self, **opcoes):
+        self.manager.fechar()
+        self.manager = self.abrir(**opcoes)
+
+    def popular(self):
+        m = self.manager
+        m.registrar_usuario("Alice Souza", "alice", "123")
+        m.registrar_usuario("Bruno Lima", "bruno", "456")
+        m.criar_topico("Cafés do Sul", "alice", "Discussão", "Lugares no sul.")
+        m.criar_topico("Moagem", "bruno", "Dúvida", "Fina ou grossa?")
+        self.p1 = m.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.p2 = m.adicionar_postagem("Moagem", "alice", "Média para coado")
+        self.r1 = m.responder_postagem_por_id(self.p1.id, "alice", "Vale a visita?")
+        self.r2 = m.responder_postagem_por_id(self.p1.id, "bruno", "Vale sim!")
+        m.curtir_resposta(self.r2.id, "alice")
+
+    def estado(self, manager):
+        return [
+            (t.titulo, [(p.id, p.posicao, p.texto, [(r.id, r.posicao, r.conteudo, r.quantidade_likes)
+                                                    for r in p.respostas]) for p in t.postagens])
+            for t in manager.topicos
+        ]
+
+    def test_reinicio_so_com_diario(self):
+        self.popular()
+        esperado = self.estado(self.manager)
+        self.reiniciar()
+        self.assertEqual(self.estado(self.manager), esperado)
+        self.assertEqual(set(self.manager.usuarios), {"alice", "bruno"})
+
+    def test_snapshot_mais_cauda_do_diario(self):
+        self.popular()
+        self.manager.gravar_snapshot()
+        self.manager.remover_resposta(self.r1.id)
+        self.manager.renomear_topico("Moagem", "Moagem e Extração")
+        nova = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Café do Mercado")
+        self.manager.curtir_resposta(self.r2.id, "bruno")
+        esperado = self.estado(self.manager)
+        self.reiniciar()
+        self.assertEqual(self.estado(self.manager), esperado)
+        self.assertEqual(self.manager.obter_postagem(nova.id).texto, "Café do Mercado")
+        self.assertGreater(self.manager.adicionar_postagem("Moagem e Extração", "bruno", "x").id, nova.id)
+
+    def test_curtidas_por_usuario_no_snapshot_e_no_diario(self):
+        self.popular()
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.manager.gravar_snapshot()
+        self.manager.descurtir_resposta(self.r2.id, "alice")
+        self.manager.curtir_resposta(self.r2.id, "bruno")
+        self.reiniciar()
+        m = self.manager
+        self.assertEqual(m.curtidas_do_usuario("alice", [self.r1.id, self.r2.id]), [False, False])
+        self.assertEqual(m.curtidas_do_usuario("bruno", [self.r1.id, self.r2.id]), [True, True])
+        m.curtir_resposta(self.r2.id, "bruno")
+        self.assertEqual(m.obter_resposta(self.r2.id).quantidade_likes, 1)
+        m.gravar_snapshot()
+        self.reiniciar()
+        self.assertEqual(len(self.manager.curtidas), 2)
+
+    def test_snapshot_com_threads_nao_carregadas(self):
+        self.popular()
+        self.manager.gravar_snapshot()
+        self.reiniciar()
+        self.manager.responder_postagem_por_id(self.p2.id, "bruno", "Concordo")
+        # "Cafés do Sul" nunca foi acessado desde a partida: vai direto do snapshot antigo.
+        self.manager.gravar_snapshot()
+        self.reiniciar()
+        resposta = self.manager.obter_resposta(self.r2.id)
+        self.assertEqual((resposta.conteudo, resposta.quantidade_likes), ("Vale sim!", 1))
+        self.assertEqual([r.conteudo for r in self.manager.obter_postagem(self.p2.id).respostas], ["Concordo"])
+
+    def test_threads_sao_lidas_sob_demanda(self):
+        self.popular()
+        self.manager.gravar_snapshot()
+        self.reiniciar()
+        topicos = list(self.manager.topicos)
+        self.assertFalse(any(t.postagens_carregadas for t in topicos))
+        self.assertEqual(self.manager.obter_resposta(self.r1.id).conteudo, "Vale a visita?")
+        self.assertEqual([t.postagens_carregadas for t in topicos], [True, False])
+
+    def test_posicoes_removidas_no_fim_nao_sao_reusadas(self):
+        self.popular()
+        p3 = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Café do Mercado")
+        self.manager.remover_postagem(p3.id)
+        for snapshot in (False, True):
+            with self.subTest(snapshot=snapshot):
+                if snapshot:
+                    self.manager.gravar_snapshot()
+                self.reiniciar()
+                topico = self.manager.indice_topicos.buscar("Cafés do Sul")
+                nova = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Café Bela Vista")
+                self.assertEqual(nova.posicao, p3.posicao + 1)
+                self.assertEqual([i for i, _ in topico.postagens.posicoes()], [self.p1.posicao, nova.posicao])
+                self.manager.remover_postagem(nova.id)
+                p3 = nova
+
+    def test_posicao_de_resposta_removida_no_fim_nao_e_reusada(self):
+        self.popular()
+        self.manager.remover_resposta(self.r2.id)
+        removida = self.r2
+        for snapshot in (False, True):
+            with self.subTest(snapshot=snapshot):
+                if snapshot:
+                    self.manager.gravar_snapshot()
+                self.reiniciar()
+                nova = self.manager.responder_postagem_por_id(self.p1.id, "bruno", "Também acho")
+                self.assertEqual(nova.posicao, removida.posicao + 1)
+                postagem = self.manager.obter_postagem(self.p1.id)
+                self.assertEqual([i for i, _ in postagem.respostas.posicoes()], [self.r1.posicao, nova.posicao])
+                self.manager.remover_resposta(nova.id)
+                removida = nova
+
+    def test_snapshot_de_thread_nao_carregada_guarda_proxima_posicao(self):
+        self.popular()
+        p3 = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Café do Mercado")
+        self.manager.remover_postagem(p3.id)
+        self.manager.remover_resposta(self.r2.id)
+        self.reiniciar()
+        # Nada foi acessado: o snapshot copia tópico e postagem do diário.
+        self.manager.gravar_snapshot()
+        self.reiniciar()
+        self.assertEqual(self.manager.adicionar_postagem("Cafés do Sul", "bruno", "x").posicao, p3.posicao + 1)
+        self.assertEqual(self.manager.responder_postagem_por_id(self.p1.id, "bruno", "y").posicao,
+                         self.r2.posicao + 1)
+
+    def test_cauda_corrompida_e_descartada(self):
+        self.popular()
+        self.manager.fechar()
+        caminho = os.path.join(self.pasta, "diario.bin")
+        with open(caminho, "ab") as arquivo:
+            arquivo.write(b"\x40\x00\x00\x00lixo")
+        self.manager = self.abrir()
+        self.assertEqual(len(self.manager.obter_postagem(self.p1.id).respostas), 2)
+        self.manager.adicionar_postagem("Moagem", "bruno", "Depois da queda")
+        self.reiniciar()
+        self.assertEqual(len(self.manager.indice_topicos.buscar("Moagem").postagens), 2)
+
+    def test_snapshot_automatico_pelo_tamanho_do_diario(self):
+        self.manager.fechar()
+        self.manager = self.abrir(limite_diario=512)
+        self.popular()
+        for i in range(20):
+            self.manager.adicionar_postagem("Moagem", "alice", f"Postagem {i}")
+        self.assertTrue(os.path.exists(os.path.join(self.pasta, "snapshot.bin")))
+        self.assertLess(os.path.getsize(os.path.join(self.pasta, "diario.bin")), 1024)
+        esperado = self.estado(self.manager)
+        self.reiniciar()
+        self.assertEqual(self.estado(self.manager), esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
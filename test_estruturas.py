@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from estruturas import SkipListIndexada
+
+
+class TestSkipListIndexada(unittest.TestCase):
+    def test_operacoes_aleatorias_batem_com_lista_ordenada(self):
+        aleatorio = random.Random(7)
+        lista = SkipListIndexada(semente=1)
+        referencia = []
+        for _ in range(3000):
+            chave = (aleatorio.randrange(50), aleatorio.randrange(200))
+            if chave in referencia:
+                self.assertEqual(lista.remover(chave), str(chave))
+                referencia.remove(chave)
+            else:
+                lista.inserir(chave, str(chave))
+                referencia.append(chave)
+                referencia.sort()
+            if referencia:
+                indice = aleatorio.randrange(len(referencia))
+                self.assertEqual(lista.obter(indice)[0], referencia[indice])
+                self.assertEqual(lista.posicao(referencia[indice]), indice)
+        self.assertEqual([chave for chave, _ in lista], referencia)
+        self.assertEqual(len(lista), len(referencia))
+        self.assertEqual([c for c, _ in lista.fatia(10, 5)], referencia[10:15])
+
+    def test_carga_ordenada_seguida_de_operacoes(self):
+        aleatorio = random.Random(3)
+        referencia = sorted(aleatorio.sample(range(100_000), 2000))
+        lista = SkipListIndexada(semente=2)
+        lista.carregar_ordenados((chave, -chave) for chave in referencia)
+        self.assertEqual([chave for chave, _ in lista], referencia)
+        for _ in range(1000):
+            chave = aleatorio.randrange(100_000)
+            if chave in referencia:
+                self.assertEqual(lista.remover(chave), -chave)
+                referencia.remove(chave)
+            else:
+                lista.inserir(chave, -chave)
+                referencia.append(chave)
+                referencia.sort()
+            indice = aleatorio.randrange(len(referencia))
+            self.assertEqual(lista.obter(indice), (referencia[indice], -referencia[indice]))
+            self.assertEqual(lista.posicao(referencia[indice]), indice)
+        self.assertEqual(len(lista), len(referencia))
+        with self.assertRaises(ValueError):
+            lista.carregar_ordenados([(1, None)])
+        with self.assertRaises(ValueError):
+            SkipListIndexada().carregar_ordenados([(2, None), (1, None)])
+
+    def test_chave_ausente_ou_duplicada(self):
+        lista = SkipListIndexada()
+        lista.inserir((1, 1))
+        self.assertIsNone(lista.posicao((2, 2)))
+        with self.assertRaises(KeyError):
+            lista.inserir((1, 1))
+        with self.assertRaises(KeyError):
+            lista.remover((2, 2))
+        with self.assertRaises(IndexError):
+            lista.obter(1)
+        self.assertEqual(lista.primeiros(10), [((1, 1), None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
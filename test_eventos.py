@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import eventos
+from eventos import (
+    DenunciaRegistrada, FalhaOperacao, NotificacaoResposta, PostagemAdicionada, RespostaAdicionada,
+    SinkArquivo, SinkConsole, SinkMemoria, SinkNulo, UsuarioRegistrado, definir_sink,
+)
+from forum_manager import ComunidadeCafeManager
+from notificacao_respostas import Topico, Usuario, despachante_atual
+
+
+class TestEventos(unittest.TestCase):
+    def setUp(self):
+        ComunidadeCafeManager._instancia = None
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+
+    def tearDown(self):
+        definir_sink(self._sink_anterior)
+        ComunidadeCafeManager._instancia = None
+
+    def test_manager_publica_eventos_tipados(self):
+        manager = ComunidadeCafeManager()
+        with redirect_stdout(io.StringIO()) as saida:
+            manager.registrar_usuario("Alice Souza", "alice", "123")
+            manager.criar_topico("Espresso", "alice", "Discussão", "Extração")
+            postagem = manager.adicionar_postagem("Espresso", "alice", "Qual a dose?")
+            resposta = manager.responder_postagem_por_id(postagem.id, "alice", "18g")
+            manager.denunciar_resposta(resposta.id, "alice")
+            manager.adicionar_postagem("Inexistente", "alice", "Texto")
+        self.assertEqual(saida.getvalue(), "")
+
+        tipos = [type(e) for e in self.sink.eventos]
+        self.assertEqual(tipos[0], UsuarioRegistrado)
+        self.assertIn(PostagemAdicionada, tipos)
+        adicionada = next(e for e in self.sink.eventos if isinstance(e, RespostaAdicionada))
+        self.assertEqual((adicionada.id_resposta, adicionada.id_postagem), (resposta.id, postagem.id))
+        denuncia = next(e for e in self.sink.eventos if isinstance(e, DenunciaRegistrada))
+        self.assertEqual(denuncia.nome_denunciante, "alice")
+        self.assertEqual(self.sink.eventos[-1], FalhaOperacao("adicionar_postagem", "Tópico não encontrado.",
+                                                              momento=self.sink.eventos[-1].momento))
+
+    def test_notificacao_de_resposta_vira_evento(self):
+        autor = Usuario("João Silva", "joao123")
+        topico = Topico("Moagem", autor, "2025-06-01", "Fina ou grossa?")
+        topico.gerarResposta(Usuario("Ana Maria", "ana_m"), "Depende do método.")
+        despachante_atual().aguardar()
+        self.assertIn(NotificacaoResposta("joao123", momento=self.sink.eventos[-1].momento), self.sink.eventos)
+
+    def test_sink_console_preserva_mensagens(self):
+        definir_sink(SinkConsole())
+        with redirect_stdout(io.StringIO()) as saida:
+            eventos.publicar(UsuarioRegistrado("alice"))
+        self.assertEqual(saida.getvalue(), "Usuário @alice registrado com sucesso.\n")
+
+    def test_sink_memoria_limitado_e_drenar(self):
+        sink = SinkMemoria(capacidade=2)
+        for nome in ("a", "b", "c"):
+            sink.publicar(UsuarioRegistrado(nome))
+        self.assertEqual([e.nome_usuario for e in sink.drenar()], ["b", "c"])
+        self.assertEqual(sink.eventos, [])
+
+    def test_sink_nulo(self):
+        SinkNulo().publicar(UsuarioRegistrado("alice"))
+
+    def test_sink_arquivo_grava_json_lines_em_lote(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "eventos.jsonl")
+            sink = SinkArquivo(caminho, tamanho_lote=10, intervalo=60)
+            for i in range(25):
+                sink.publicar(UsuarioRegistrado(f"u{i}"))
+            sink.descarregar()
+            with open(caminho, encoding="utf-8") as arquivo:
+                self.assertEqual(len(arquivo.readlines()), 25)
+            sink.publicar(UsuarioRegistrado("ultimo"))
+            sink.fechar()
+            with open(caminho, encoding="utf-8") as arquivo:
+                linhas = [json.loads(l) for l in arquivo]
+            self.assertEqual(linhas[-1]["tipo"], "UsuarioRegistrado")
+            self.assertEqual(linhas[-1]["nome_usuario"], "ultimo")
+
+
+if __name__ == "__main__":
+    unittest.main()
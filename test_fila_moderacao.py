@@ -0,0 +1,178 @@
+import threading
+import unittest
+
+from fila_moderacao import CONTEUDO_DENUNCIADO, TOPICO_PENDENTE, FilaModeracao
+from moderacao import Moderador, Topico
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def moderador(nome_usuario):
+    return Moderador(nome_usuario, nome_usuario, "123", ["moderar"], 30, "Prata", 0, "", "", 0, "moderador", "")
+
+
+def topico(titulo, *moderadores):
+    t = Topico(titulo, "autor", 0, "geral", "")
+    t.moderadores.extend(moderadores)
+    return t
+
+
+class TestFilaModeracao(unittest.TestCase):
+    def setUp(self):
+        self.relogio = Relogio()
+        self.fila = FilaModeracao(peso_denuncias=10.0, peso_idade=1.0, peso_reputacao=1.0,
+                                  duracao_concessao=60.0, relogio=self.relogio)
+        self.ana, self.bia = moderador("ana"), moderador("bia")
+
+    def test_prioridade_por_denuncias_idade_e_reputacao(self):
+        t = topico("cafe", self.ana)
+        antigo = self.fila.adicionar_topico(t)
+        self.relogio.agora = 5.0
+        denunciado = self.fila.denunciar("resposta-1", t)
+        self.relogio.agora = 6.0
+        reputado = self.fila.denunciar("resposta-2", t, reputacao=20.0)
+
+        self.assertEqual(antigo.tipo, TOPICO_PENDENTE)
+        self.assertEqual(denunciado.tipo, CONTEUDO_DENUNCIADO)
+        # 10 - 5 = 5 > 0 > 10 - 6 - 20
+        self.assertIs(self.fila.proximo(self.ana), denunciado)
+        self.assertIs(self.fila.proximo(self.ana), antigo)
+        self.assertIs(self.fila.proximo(self.ana), reputado)
+        self.assertIsNone(self.fila.proximo(self.ana))
+
+    def test_denuncias_repetidas_sobem_o_item(self):
+        t = topico("cafe", self.ana)
+        a = self.fila.denunciar("a", t)
+        self.relogio.agora = 1.0
+        b = self.fila.denunciar("b", t)
+        self.fila.denunciar("b", t)
+        self.assertEqual(b.denuncias, 2)
+        self.assertEqual(len(self.fila), 2)
+        self.assertEqual(self.fila.pendentes(self.ana), 2)
+        self.assertIs(self.fila.proximo(self.ana), b)
+        self.assertIs(self.fila.proximo(self.ana), a)
+
+    def test_particiona_entre_moderadores_do_topico(self):
+        t = topico("cafe", self.ana, self.bia)
+        for i in range(10):
+            self.fila.denunciar(i, t)
+        self.assertEqual(self.fila.pendentes(self.ana), 5)
+        self.assertEqual(self.fila.pendentes(self.bia), 5)
+
+        outro = topico("cha", self.bia)
+        item = self.fila.denunciar("x", outro)
+        self.assertIsNot(self.fila.proximo(self.ana).alvo, "x")
+        self.assertEqual(item.fatia, self.bia)
+
+    def test_topico_sem_moderador_vai_para_fatia_geral(self):
+        item = self.fila.adicionar_topico(topico("sem dono"))
+        self.assertEqual(self.fila.pendentes(), 1)
+        self.assertIs(self.fila.proximo(self.bia), item)
+
+    def test_concessao_exclusiva_e_vencimento(self):
+        item = self.fila.adicionar_topico(topico("geral"))
+        self.assertIs(self.fila.proximo(self.ana), item)
+        self.assertIsNone(self.fila.proximo(self.bia))
+
+        self.relogio.agora = 61.0
+        self.assertIs(self.fila.proximo(self.bia), item)
+        self.assertFalse(self.fila.concluir(item, self.ana))
+        self.assertFalse(self.fila.renovar(item, self.ana))
+        self.assertTrue(self.fila.concluir(item, self.bia))
+        self.assertEqual(len(self.fila), 0)
+
+    def test_renovar_e_devolver(self):
+        item = self.fila.adicionar_topico(topico("geral"))
+        self.fila.proximo(self.ana)
+        self.relogio.agora = 50.0
+        self.assertTrue(self.fila.renovar(item, self.ana))
+        self.relogio.agora = 100.0
+        self.assertIsNone(self.fila.proximo(self.bia))
+        self.assertTrue(self.fila.devolver(item, self.ana))
+        self.assertIs(self.fila.proximo(self.bia), item)
+
+    def test_denuncia_durante_concessao_nao_reenfileira(self):
+        t = topico("cafe", self.ana)
+        item = self.fila.denunciar("a", t)
+        self.fila.proximo(self.ana)
+        self.fila.denunciar("a", t)
+        self.assertEqual(item.denuncias, 2)
+        self.assertIsNone(self.fila.proximo(self.ana))
+
+    def test_remover_moderador_redistribui(self):
+        t = topico("cafe", self.ana, self.bia)
+        for i in range(4):
+            self.fila.denunciar(i, t)
+        t.moderadores.remove(self.ana)
+        self.fila.remover_moderador(self.ana)
+        self.assertEqual(self.fila.pendentes(self.ana), 0)
+        self.assertEqual(self.fila.pendentes(self.bia), 4)
+
+    def test_concessao_de_moderador_removido_vai_para_outro(self):
+        t = topico("cafe", self.ana, self.bia)
+        item = self.fila.denunciar("a", t)
+        self.assertIs(self.fila.proximo(self.ana), item)
+        self.fila.remover_moderador(self.ana)
+        self.relogio.agora += 301
+        self.assertIs(self.fila.proximo(self.bia), item)
+        self.assertEqual(self.fila.pendentes(self.ana), 0)
+
+        outro = self.fila.denunciar("b", t)
+        self.assertIs(self.fila.proximo(self.bia), outro)
+        self.assertTrue(self.fila.devolver(outro, self.bia))
+        self.fila.adicionar_moderador(self.ana)
+        self.fila.denunciar("c", t)
+        self.assertEqual(self.fila.pendentes(self.ana), 1)
+
+    def test_descartar_tira_o_item_da_fila_e_da_concessao(self):
+        t = topico("cafe", self.ana)
+        self.fila.denunciar("a", t)
+        item = self.fila.denunciar("b", t)
+        self.assertTrue(self.fila.descartar("a"))
+        self.assertFalse(self.fila.descartar("a"))
+        self.assertEqual((len(self.fila), self.fila.pendentes(self.ana)), (1, 1))
+        self.assertIs(self.fila.proximo(self.ana), item)
+        self.assertTrue(self.fila.descartar("b"))
+        self.assertFalse(self.fila.concluir(item, self.ana))
+        self.relogio.agora += 61
+        self.assertIsNone(self.fila.proximo(self.ana))
+        self.assertEqual(len(self.fila), 0)
+
+    def test_aprovar_topico_pela_fila(self):
+        t = topico("novo", self.ana)
+        self.fila.adicionar_topico(t)
+        item = self.fila.proximo(self.ana)
+        self.ana.aprovarTopico(item.alvo)
+        self.assertTrue(self.fila.concluir(item, self.ana))
+        self.assertTrue(t.aprovado)
+        self.assertEqual(self.ana.obterEstadoTopico(t), "Aprovado")
+
+    def test_moderadores_concorrentes_nunca_pegam_o_mesmo_item(self):
+        fila = FilaModeracao()
+        for i in range(2000):
+            fila.denunciar(i, None)
+        vistos, trava = [], threading.Lock()
+
+        def trabalhar(m):
+            while (item := fila.proximo(m)) is not None:
+                with trava:
+                    vistos.append(item.alvo)
+                fila.concluir(item, m)
+
+        threads = [threading.Thread(target=trabalhar, args=(moderador(f"m{i}"),)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(vistos), list(range(2000)))
+        self.assertEqual(len(fila), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import forum_async
+from eventos import FalhaOperacao, SinkMemoria, definir_sink
+from forum_async import ComunidadeCafeAsync
+from forum_manager import ComunidadeCafeManager
+from repositorio import RepositorioMemoria
+
+
+class RepositorioEspiao(RepositorioMemoria):
+    def __init__(self):
+        self.threads = set()
+
+    def salvar_postagem(self, postagem):
+        self.threads.add(threading.get_ident())
+
+
+class TestComunidadeCafeAsync(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        ComunidadeCafeManager._instancia = None
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+        self.repositorio = RepositorioEspiao()
+        manager = ComunidadeCafeManager()
+        manager.usar_repositorio(self.repositorio)
+        manager.limitador = None  # as escritas em rajada são o assunto destes testes
+        self.forum = ComunidadeCafeAsync(manager)
+        await self.forum.registrar_usuario("Alice Souza", "alice", "123")
+        await self.forum.criar_topico("Cafés do Sul", "alice", "Discussão", "Lugares no sul.")
+
+    async def asyncTearDown(self):
+        definir_sink(self._sink_anterior)
+        ComunidadeCafeManager._instancia = None
+
+    async def test_escritas_nao_rodam_no_laco_de_eventos(self):
+        postagem = await self.forum.adicionar_postagem("Cafés do Sul", "alice", "Café Cultura")
+        self.assertEqual(postagem.texto, "Café Cultura")
+        self.assertNotIn(threading.get_ident(), self.repositorio.threads)
+
+    async def test_escritas_concorrentes_sao_agrupadas(self):
+        lotes = []
+        original = forum_async._executar_lote
+
+        def contar(lote):
+            lotes.append(len(lote))
+            return original(lote)
+
+        with mock.patch.object(forum_async, "_executar_lote", contar):
+            postagens = await asyncio.gather(*(
+                self.forum.adicionar_postagem("Cafés do Sul", "alice", f"postagem {i}") for i in range(100)))
+        self.assertEqual(sum(lotes), 100)
+        self.assertLess(len(lotes), 100)
+        self.assertEqual([p.texto for p in postagens], [f"postagem {i}" for i in range(100)])
+
+    async def test_excecao_chega_apenas_ao_chamador(self):
+        with mock.patch.object(self.forum.manager, "renomear_topico", side_effect=ValueError("falha")):
+            resultados = await asyncio.gather(
+                self.forum.adicionar_postagem("Cafés do Sul", "alice", "ok"),
+                self.forum.renomear_topico("Cafés do Sul", "Outro"),
+                return_exceptions=True,
+            )
+        self.assertEqual(resultados[0].texto, "ok")
+        self.assertIsInstance(resultados[1], ValueError)
+
+    async def test_iteradores_assincronos(self):
+        postagem = await self.forum.adicionar_postagem("Cafés do Sul", "alice", "Café Cultura")
+        await self.forum.responder_postagem_por_id(postagem.id, "alice", "Vale a visita?")
+
+        self.assertEqual([t.titulo async for t in self.forum.iterar_topicos()], ["Cafés do Sul"])
+        self.assertEqual([p.id async for p in self.forum.iterar_postagens("Cafés do Sul")], [postagem.id])
+        self.assertEqual([r.conteudo async for r in self.forum.iterar_respostas(postagem.id)], ["Vale a visita?"])
+
+    async def test_iterador_percorre_varias_paginas(self):
+        self.forum.tamanho_pagina = 7
+        postagens = await asyncio.gather(*(
+            self.forum.adicionar_postagem("Cafés do Sul", "alice", f"postagem {i}") for i in range(30)))
+        obtidas = [p async for p in self.forum.iterar_postagens("Cafés do Sul", recentes=True)]
+        self.assertEqual(obtidas, postagens[::-1])
+
+    async def test_iterar_topico_inexistente_publica_falha(self):
+        self.assertEqual([p async for p in self.forum.iterar_postagens("Inexistente")], [])
+        falhas = [e for e in self.sink.eventos if isinstance(e, FalhaOperacao)]
+        self.assertEqual(falhas[-1].operacao, "paginar_postagens")
+
+
+if __name__ == "__main__":
+    unittest.main()
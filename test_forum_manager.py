@@ -0,0 +1,544 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from antispam import REJEITAR
+from eventos import DuplicataSuspeita, FalhaOperacao, SinkMemoria, definir_sink
+from forum_manager import MSG_CONTEUDO_DUPLICADO, MSG_REGISTRO_INVALIDO, ComunidadeCafeManager
+from moderacao import Moderador
+
+
+class ForumTestCase(unittest.TestCase):
+    def setUp(self):
+        ComunidadeCafeManager._instancia = None
+        self.manager = ComunidadeCafeManager()
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+        self.manager.registrar_usuario("Alice Souza", "alice", "123")
+        self.manager.registrar_usuario("Bruno Lima", "bruno", "456")
+        self.topico = self.manager.criar_topico("Cafés do Sul", "alice", "Discussão", "Lugares no sul.")
+        self.manager.criar_topico("Moagem", "bruno", "Dúvida", "Qual moagem usar?")
+
+    def tearDown(self):
+        definir_sink(self._sink_anterior)
+        ComunidadeCafeManager._instancia = None
+
+
+class TestIndiceTopicos(ForumTestCase):
+    def test_postagem_encontra_topico_pelo_indice(self):
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura em Floripa!")
+        self.assertIn(postagem, self.topico.postagens)
+
+    def test_titulo_duplicado_e_rejeitado(self):
+        self.assertIsNone(self.manager.criar_topico("Cafés do Sul", "bruno", "Discussão", "Outro"))
+        self.assertEqual(len(self.manager.topicos), 2)
+
+    def test_indices_por_autor_e_tipo(self):
+        self.assertEqual(self.manager.topicos_do_autor("alice"), [self.topico])
+        self.assertEqual([t.titulo for t in self.manager.topicos_do_tipo("Dúvida")], ["Moagem"])
+        self.assertEqual(self.manager.topicos_do_tipo("Evento"), [])
+
+    def test_renomear_mantem_indice_consistente(self):
+        self.manager.renomear_topico("Cafés do Sul", "Cafés do Sul do Brasil")
+        self.assertIsNone(self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Texto"))
+        self.assertIsNotNone(self.manager.adicionar_postagem("Cafés do Sul do Brasil", "bruno", "Texto"))
+        self.assertIsNone(self.manager.renomear_topico("Cafés do Sul do Brasil", "Moagem"))
+
+    def test_remover_topico_limpa_indices(self):
+        self.manager.remover_topico("Moagem")
+        self.assertNotIn("Moagem", [t.titulo for t in self.manager.topicos])
+        self.assertEqual(self.manager.topicos_do_autor("bruno"), [])
+        self.assertEqual(self.manager.topicos_do_tipo("Dúvida"), [])
+        self.assertIsNone(self.manager.adicionar_postagem("Moagem", "alice", "Texto"))
+
+
+
+class TestModeloCompacto(ForumTestCase):
+    def test_modelos_sem_dict_por_instancia(self):
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        resposta = self.manager.responder_postagem_por_id(postagem.id, "alice", "Vale a visita?")
+        for objeto in (self.manager.usuarios["alice"], self.topico, postagem, resposta):
+            self.assertFalse(hasattr(objeto, "__dict__"), type(objeto).__name__)
+        self.assertIs(resposta.autor, self.manager.usuarios["alice"])
+        with self.assertRaises(AttributeError):
+            resposta.atributo_inexistente = 1
+
+
+class TestIdentificadores(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.p1 = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Primeira")
+        self.p2 = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Segunda")
+
+    def test_ids_estaveis_e_enderecamento_direto(self):
+        self.assertNotEqual(self.p1.id, self.p2.id)
+        resposta = self.manager.responder_postagem_por_id(self.p2.id, "bruno", "Concordo")
+        self.assertIs(self.manager.obter_resposta(resposta.id), resposta)
+        self.assertIs(resposta.postagem, self.p2)
+        self.manager.curtir_resposta(resposta.id, "alice")
+        self.assertEqual(resposta.quantidade_likes, 1)
+
+    def test_remocao_nao_desloca_posicoes(self):
+        self.manager.remover_postagem(self.p1.id)
+        self.assertIsNone(self.manager.obter_postagem(self.p1.id))
+        self.assertEqual(list(self.topico.postagens), [self.p2])
+        self.assertIs(self.topico.postagens[1], self.p2)
+        self.assertIsNone(self.manager.responder_postagem("Cafés do Sul", 0, "alice", "Oi"))
+        self.assertIsNotNone(self.manager.responder_postagem("Cafés do Sul", 1, "alice", "Oi"))
+
+    def test_remover_resposta(self):
+        r1 = self.manager.responder_postagem_por_id(self.p1.id, "alice", "Um")
+        r2 = self.manager.responder_postagem_por_id(self.p1.id, "bruno", "Dois")
+        self.manager.remover_resposta(r1.id)
+        self.assertEqual(list(self.p1.respostas), [r2])
+        self.assertEqual(len(self.p1.respostas), 1)
+        self.assertIsNone(self.manager.curtir_resposta(r1.id, "bruno"))
+
+    def test_remover_topico_desindexa_postagens(self):
+        resposta = self.manager.responder_postagem_por_id(self.p1.id, "alice", "Um")
+        self.manager.remover_topico("Cafés do Sul")
+        self.assertIsNone(self.manager.obter_postagem(self.p1.id))
+        self.assertIsNone(self.manager.obter_resposta(resposta.id))
+
+    def test_resposta_que_perde_a_corrida_para_remover_topico(self):
+        # A postagem foi encontrada antes da remoção e a resposta chega depois.
+        self.manager.remover_topico("Cafés do Sul")
+        ids_antes = dict(self.manager.respostas_por_id)
+        self.assertIsNone(self.manager._responder("responder_postagem_por_id", self.p1, "alice", "Tarde demais"))
+        self.assertEqual(self.sink.eventos[-1].operacao, "responder_postagem_por_id")
+        self.assertEqual(self.manager.respostas_por_id, ids_antes)
+        self.assertEqual(len(self.p1.respostas), 0)
+
+
+
+class TestIngestaoEmLote(ForumTestCase):
+    def test_usuarios_em_lote_reporta_falhas_sem_imprimir(self):
+        registros = [
+            ("Carla", "carla", "789"),
+            {"nome": "Davi", "nome_usuario": "davi", "senha": "000", "permissoes": "admin"},
+            ("Outra Alice", "alice", "111"),
+            ("incompleto",),
+        ]
+        with redirect_stdout(io.StringIO()) as saida:
+            resultado = self.manager.registrar_usuarios_em_lote(iter(registros))
+        self.assertEqual(saida.getvalue(), "")
+        self.assertEqual(resultado.inseridos, 2)
+        self.assertEqual([(f.indice, f.motivo) for f in resultado.falhas],
+                         [(2, "Nome de usuário já existe."), (3, "Registro inválido.")])
+        self.assertEqual(self.manager.usuarios["davi"].permissoes, "admin")
+        self.assertEqual(self.manager.usuarios["carla"].permissoes, "padrão")
+
+    def test_topicos_e_postagens_em_lote(self):
+        topicos = ((f"Lote {i}", "alice", "Discussão", "Descrição") for i in range(3))
+        resultado = self.manager.criar_topicos_em_lote(topicos)
+        self.assertEqual(resultado.inseridos, 3)
+
+        resultado = self.manager.adicionar_postagens_em_lote([
+            ("Lote 0", "bruno", "Olá"),
+            ("Lote 1", "ninguem", "Olá"),
+            ("Inexistente", "bruno", "Olá"),
+            {"titulo_topico": "Lote 2", "nome_usuario": "alice", "texto": "Oi"},
+        ])
+        self.assertEqual(resultado.inseridos, 2)
+        self.assertEqual([f.indice for f in resultado.falhas], [1, 2])
+        postagem = self.manager.indice_topicos.buscar("Lote 2").postagens[0]
+        self.assertIs(self.manager.obter_postagem(postagem.id), postagem)
+
+    def test_postagens_em_lote_passam_pelas_mesmas_regras(self):
+        spam = "Compre agora o melhor café do Brasil com 50% de desconto no site www.cafebarato.com!!!"
+        self.manager.registrar_usuario("Carla Dias", "carla", "789")
+        self.manager.seguir_usuario("carla", "bruno")
+        self.manager.politica_spam = REJEITAR
+        resultado = self.manager.adicionar_postagens_em_lote([
+            ("Cafés do Sul", "bruno", spam),
+            ("Moagem", "alice", spam.upper()),
+            ("Moagem", "bruno", "Média para coado"),
+        ])
+        self.assertEqual(resultado.inseridos, 2)
+        self.assertEqual([(f.indice, f.motivo) for f in resultado.falhas], [(1, MSG_CONTEUDO_DUPLICADO)])
+        self.assertEqual([p.texto for p in self.manager.paginar_linha_do_tempo("carla").itens],
+                         ["Média para coado", spam])
+
+    def test_valores_invalidos_viram_falhas_sem_abortar_o_lote(self):
+        resultado = self.manager.registrar_usuarios_em_lote([
+            "abcd", ("Carla", "carla", 1), ["Davi", "davi", "000"], ("Eva", None, "1"),
+        ])
+        self.assertEqual(resultado.inseridos, 1)
+        self.assertEqual([(f.indice, f.motivo) for f in resultado.falhas],
+                         [(0, MSG_REGISTRO_INVALIDO), (1, MSG_REGISTRO_INVALIDO), (3, MSG_REGISTRO_INVALIDO)])
+        self.assertEqual(set(self.manager.usuarios), {"alice", "bruno", "davi"})
+
+        resultado = self.manager.criar_topicos_em_lote([
+            (["lista"], "alice", "Discussão", ""), ("Sem tipo", "alice", None, None),
+        ])
+        self.assertEqual((resultado.inseridos, [f.indice for f in resultado.falhas]), (1, [0]))
+
+        resultado = self.manager.adicionar_postagens_em_lote([
+            ("Moagem", "alice", None), ("Moagem", "alice", 42), ("Moagem", "alice", "Fina"),
+        ])
+        self.assertEqual((resultado.inseridos, [f.indice for f in resultado.falhas]), (1, [0, 1]))
+        self.assertEqual([p.texto for p in self.manager.indice_topicos.buscar("Moagem").postagens], ["Fina"])
+
+    def test_titulo_repetido_dentro_do_lote(self):
+        resultado = self.manager.criar_topicos_em_lote([
+            ("Repetido", "alice", "Discussão", ""),
+            ("Repetido", "bruno", "Discussão", ""),
+        ])
+        self.assertEqual(resultado.inseridos, 1)
+        self.assertEqual(resultado.falhas[0].motivo, "Já existe um tópico com esse título.")
+
+
+class TestPaginacao(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.respostas = [self.manager.responder_postagem_por_id(self.postagem.id, "alice", f"r{i}")
+                          for i in range(25)]
+
+    def paginas(self, limite, recentes=False):
+        paginas, cursor = [], None
+        while True:
+            pagina = self.manager.paginar_respostas(self.postagem.id, limite, cursor, recentes)
+            paginas.append([r.conteudo for r in pagina])
+            cursor = pagina.proximo_cursor
+            if cursor is None:
+                return paginas
+
+    def test_paginas_mais_antigas_primeiro(self):
+        paginas = self.paginas(10)
+        self.assertEqual([len(p) for p in paginas], [10, 10, 5])
+        self.assertEqual(sum(paginas, []), [f"r{i}" for i in range(25)])
+
+    def test_paginas_mais_recentes_primeiro(self):
+        paginas = self.paginas(10, recentes=True)
+        self.assertEqual(sum(paginas, []), [f"r{i}" for i in reversed(range(25))])
+
+    def test_cursor_sobrevive_a_remocoes_e_insercoes(self):
+        pagina = self.manager.paginar_respostas(self.postagem.id, 10)
+        # Remove o primeiro item da próxima página e acrescenta outro no fim.
+        self.manager.remover_resposta(self.respostas[10].id)
+        self.manager.responder_postagem_por_id(self.postagem.id, "bruno", "nova")
+        seguinte = self.manager.paginar_respostas(self.postagem.id, 10, pagina.proximo_cursor)
+        self.assertEqual([r.conteudo for r in seguinte], [f"r{i}" for i in range(11, 21)])
+
+    def test_iterar_continua_do_cursor(self):
+        pagina = self.manager.paginar_respostas(self.postagem.id, 20, recentes=True)
+        restantes = self.manager.iterar_respostas(self.postagem.id, pagina.proximo_cursor)
+        self.assertEqual([r.conteudo for r in restantes], ["r4", "r3", "r2", "r1", "r0"])
+
+    def test_topicos_e_postagens(self):
+        pagina = self.manager.paginar_topicos(1, recentes=True)
+        self.assertEqual([t.titulo for t in pagina], ["Moagem"])
+        self.assertEqual([t.titulo for t in self.manager.paginar_topicos(1, pagina.proximo_cursor)],
+                         ["Cafés do Sul"])
+        self.assertTrue(self.manager.paginar_postagens("Cafés do Sul").ultima)
+        self.assertEqual(list(self.manager.iterar_postagens("Cafés do Sul")), [self.postagem])
+
+    def test_cursor_invalido_publica_falha(self):
+        self.assertIsNone(self.manager.paginar_topicos(10, "não é um cursor"))
+        self.assertEqual(list(self.manager.iterar_topicos("AAAA")), [])
+        falhas = [e for e in self.sink.eventos if isinstance(e, FalhaOperacao)]
+        self.assertEqual([f.operacao for f in falhas], ["paginar_topicos", "iterar_topicos"])
+
+
+class TestRankingCurtidas(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.p1 = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.p2 = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Armazém")
+        self.r = [self.manager.responder_postagem_por_id(p.id, "alice", f"r{i}")
+                  for i, p in enumerate([self.p1, self.p1, self.p1, self.p2])]
+
+    def curtir(self, resposta, vezes):
+        # Cada like precisa de um usuário diferente.
+        for _ in range(vezes):
+            nome_usuario = f"fa{len(self.manager.usuarios)}"
+            self.manager.registrar_usuario(nome_usuario, nome_usuario, "123")
+            self.manager.curtir_resposta(resposta.id, nome_usuario)
+
+    def test_top_k_por_postagem_e_topico(self):
+        self.curtir(self.r[0], 1)
+        self.curtir(self.r[1], 3)
+        self.curtir(self.r[3], 2)
+        self.assertEqual(self.manager.top_respostas(self.p1.id, 2), [self.r[1], self.r[0]])
+        self.assertEqual(self.manager.top_respostas_do_topico("Cafés do Sul"), [self.r[1], self.r[3], self.r[0]])
+
+        self.curtir(self.r[0], 3)
+        self.assertEqual(self.manager.top_respostas(self.p1.id), [self.r[0], self.r[1]])
+        self.assertEqual(self.manager.posicao_da_resposta(self.r[1].id), 2)
+        self.assertEqual(self.manager.posicao_da_resposta(self.r[3].id, no_topico=True), 3)
+        self.assertIsNone(self.manager.posicao_da_resposta(self.r[2].id))
+
+    def test_remocoes_saem_do_ranking(self):
+        self.curtir(self.r[0], 1)
+        self.curtir(self.r[1], 2)
+        self.curtir(self.r[3], 3)
+        self.manager.remover_resposta(self.r[1].id)
+        self.assertEqual(self.manager.top_respostas(self.p1.id), [self.r[0]])
+        self.manager.remover_postagem(self.p2.id)
+        self.assertEqual(self.manager.top_respostas_do_topico("Cafés do Sul"), [self.r[0]])
+        self.manager.remover_topico("Cafés do Sul")
+        self.assertEqual(self.manager.ranking_curtidas.por_topico, {})
+        self.assertEqual(self.manager.ranking_curtidas.por_postagem, {})
+
+
+class TestCurtidasPorUsuario(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.r1 = self.manager.responder_postagem_por_id(self.postagem.id, "alice", "Vale a visita?")
+        self.r2 = self.manager.responder_postagem_por_id(self.postagem.id, "bruno", "Vale sim!")
+
+    def test_curtir_duas_vezes_conta_uma(self):
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.assertIs(self.manager.curtir_resposta(self.r1.id, "bruno"), self.r1)
+        self.assertEqual(self.r1.quantidade_likes, 1)
+        self.manager.curtir_resposta(self.r1.id, "alice")
+        self.assertEqual(self.r1.quantidade_likes, 2)
+
+    def test_descurtir(self):
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.manager.curtir_resposta(self.r2.id, "bruno")
+        self.manager.descurtir_resposta(self.r1.id, "bruno")
+        self.manager.descurtir_resposta(self.r1.id, "bruno")
+        self.manager.descurtir_resposta(self.r2.id, "alice")
+        self.assertEqual((self.r1.quantidade_likes, self.r2.quantidade_likes), (0, 1))
+        self.assertEqual(self.manager.top_respostas(self.postagem.id), [self.r2])
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.assertEqual(self.r1.quantidade_likes, 1)
+
+    def test_curtidas_do_usuario_para_uma_pagina(self):
+        self.manager.curtir_resposta(self.r2.id, "alice")
+        pagina = self.manager.paginar_respostas(self.postagem.id)
+        self.assertEqual(self.manager.curtidas_do_usuario("alice", (r.id for r in pagina)), [False, True])
+        self.assertEqual(self.manager.curtidas_do_usuario("bruno", [self.r1.id, self.r2.id]), [False, False])
+
+    def test_remover_resposta_apaga_curtidas(self):
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.manager.remover_resposta(self.r1.id)
+        self.assertEqual(len(self.manager.curtidas), 0)
+        self.assertIsNone(self.manager.curtir_resposta(self.r1.id, "bruno"))
+
+
+class TestDenuncias(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager.denuncias.limite_ocultar = 3
+        self.manager.denuncias.limite_denunciante = 2
+        self.postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.r1 = self.manager.responder_postagem_por_id(self.postagem.id, "alice", "Spam!")
+        self.r2 = self.manager.responder_postagem_por_id(self.postagem.id, "bruno", "Vale sim!")
+        for nome in ("carla", "davi", "edu"):
+            self.manager.registrar_usuario(nome.title(), nome, "000")
+
+    def test_resposta_ocultada_sai_da_paginacao(self):
+        for nome in ("carla", "davi", "edu"):
+            self.assertIs(self.manager.denunciar_resposta(self.r1.id, nome), self.r1)
+        self.assertTrue(self.r1.oculta)
+        self.assertEqual(list(self.manager.paginar_respostas(self.postagem.id)), [self.r2])
+        self.assertEqual(list(self.manager.iterar_respostas(self.postagem.id)), [self.r2])
+
+        self.manager.reexibir_resposta(self.r1.id)
+        self.assertFalse(self.r1.oculta)
+        self.assertEqual(list(self.manager.paginar_respostas(self.postagem.id)), [self.r1, self.r2])
+
+    def test_resposta_ocultada_sai_de_todas_as_leituras(self):
+        m = self.manager
+        m.seguir_usuario("carla", "alice")
+        r3 = m.responder_postagem_por_id(self.postagem.id, "alice", "Spam spam spam!")
+        for resposta in (r3, self.r2):
+            m.curtir_resposta(resposta.id, "davi")
+        m.curtir_resposta(r3.id, "edu")
+        for nome in ("carla", "davi", "edu"):
+            m.denunciar_resposta(r3.id, nome)
+        self.assertTrue(r3.oculta)
+
+        self.assertEqual([r.objeto for r in m.pesquisar("spam", limite=1)], [self.r1])
+        self.assertEqual(m.top_respostas(self.postagem.id, 1), [self.r2])
+        self.assertEqual(m.top_respostas_do_topico("Cafés do Sul", 1), [self.r2])
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [])
+        with redirect_stdout(io.StringIO()) as saida:
+            m.exibir_respostas_da_postagem("Cafés do Sul", self.postagem.posicao)
+        self.assertNotIn("Spam spam", saida.getvalue())
+
+        m.reexibir_resposta(r3.id)
+        self.assertEqual(m.top_respostas(self.postagem.id, 1), [r3])
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [r3])
+        self.assertEqual(len(m.pesquisar("spam")), 2)
+
+    def test_remocao_limpa_marca_de_oculto(self):
+        r3 = self.manager.responder_postagem_por_id(self.postagem.id, "alice", "Mais spam")
+        outra = self.manager.adicionar_postagem("Moagem", "bruno", "Fina")
+        r4 = self.manager.responder_postagem_por_id(outra.id, "alice", "Spam na moagem")
+        self.manager.denuncias.limite_denunciante = 100
+        for resposta in (self.r1, r3, r4):
+            for nome in ("carla", "davi", "edu"):
+                self.manager.denunciar_resposta(resposta.id, nome)
+        self.assertEqual(len(self.manager.denuncias._ocultos), 3)
+        self.manager.remover_resposta(self.r1.id)
+        self.manager.remover_postagem(self.postagem.id)
+        self.manager.remover_topico("Moagem")
+        self.assertEqual(self.manager.denuncias._ocultos, set())
+        self.assertEqual(self.manager.denuncias._por_conteudo, {})
+
+    def test_denuncias_alimentam_a_fila_de_moderacao(self):
+        m = self.manager
+        ana = Moderador("Ana", "ana", "123", ["moderar"], 30, "Prata", 0, "", "", 0, "moderador", "")
+        self.assertIs(m.designar_moderador("Cafés do Sul", ana), self.topico)
+        for nome in ("carla", "davi", "edu"):
+            m.denunciar_resposta(self.r1.id, nome)
+        m.denunciar_resposta(self.r1.id, "carla")
+        m.denunciar_resposta(self.r2.id, "davi")
+        self.assertEqual((len(m.fila_moderacao), m.fila_moderacao.pendentes(ana)), (2, 2))
+
+        item = ana.pegarDenuncia(m)
+        self.assertEqual((item.alvo, item.denuncias), (self.r1, 3))
+        self.assertIsNone(m.concluir_moderacao(item, "outro"))
+        self.assertIs(ana.resolverDenuncia(m, item), self.r1)
+        self.assertFalse(self.r1.oculta)
+        self.assertEqual(m.denuncias.denuncias(("resposta", self.r1.id)), 0)
+
+        item = ana.pegarDenuncia(m)
+        self.assertIs(ana.resolverDenuncia(m, item, remover=True), self.r2)
+        self.assertIsNone(m.obter_resposta(self.r2.id))
+        self.assertEqual(len(m.fila_moderacao), 0)
+
+    def test_remocao_e_reexibicao_tiram_a_resposta_da_fila(self):
+        m = self.manager
+        r3 = m.responder_postagem_por_id(self.postagem.id, "alice", "Mais spam")
+        for resposta in (self.r1, self.r2, r3):
+            m.denunciar_resposta(resposta.id, "carla" if resposta is not r3 else "davi")
+        self.assertEqual(len(m.fila_moderacao), 3)
+        m.reexibir_resposta(self.r1.id)
+        m.remover_resposta(self.r2.id)
+        self.assertEqual(len(m.fila_moderacao), 1)
+        m.remover_postagem(self.postagem.id)
+        self.assertEqual(len(m.fila_moderacao), 0)
+        self.assertIsNone(m.proxima_moderacao("qualquer"))
+
+    def test_mesmo_usuario_nao_oculta_sozinho(self):
+        self.manager.denuncias.limite_ocultar = 5
+        self.manager.denuncias.limite_denunciante = 20
+        for _ in range(5):
+            self.assertIs(self.manager.denunciar_resposta(self.r1.id, "carla"), self.r1)
+        self.assertFalse(self.r1.oculta)
+        self.assertEqual(list(self.manager.paginar_respostas(self.postagem.id)), [self.r1, self.r2])
+        self.assertEqual(self.manager.denuncias.denuncias(("resposta", self.r1.id)), 1)
+
+    def test_denunciante_em_excesso_e_limitado(self):
+        self.manager.denunciar_resposta(self.r1.id, "carla")
+        self.manager.denunciar_resposta(self.r2.id, "carla")
+        self.assertIsNone(self.manager.denunciar_resposta(self.r1.id, "carla"))
+        self.assertEqual(self.sink.eventos[-1].operacao, "denunciar")
+        self.assertEqual(self.manager.denuncias.denuncias(("resposta", self.r1.id)), 1)
+
+
+class TestQuaseDuplicatas(ForumTestCase):
+    SPAM = "Compre agora o melhor café do Brasil com 50% de desconto no site www.cafebarato.com!!!"
+    VARIACAO = "COMPRE JÁ o melhor cafe do brasil com 50% desconto no site www.cafebarato.com"
+    LEGITIMA = "Alguém sabe qual a melhor moagem para prensa francesa? Uso grãos de torra média."
+
+    def test_sinaliza_por_padrao(self):
+        original = self.manager.adicionar_postagem("Cafés do Sul", "bruno", self.SPAM)
+        copia = self.manager.responder_postagem_por_id(original.id, "alice", self.VARIACAO)
+        self.assertIsNotNone(copia)
+        suspeita = self.sink.eventos[-1]
+        self.assertIsInstance(suspeita, DuplicataSuspeita)
+        self.assertEqual((suspeita.tipo_conteudo, suspeita.id_conteudo), ("resposta", copia.id))
+        self.assertEqual((suspeita.tipo_semelhante, suspeita.id_semelhante), ("postagem", original.id))
+
+    def test_rejeita_antes_de_qualquer_mudanca(self):
+        self.manager.politica_spam = REJEITAR
+        original = self.manager.adicionar_postagem("Cafés do Sul", "bruno", self.SPAM)
+        self.assertIsNone(self.manager.adicionar_postagem("Cafés do Sul", "alice", self.VARIACAO))
+        self.assertEqual(self.sink.eventos[-1].operacao, "adicionar_postagem")
+        self.assertIsNone(self.manager.responder_postagem_por_id(original.id, "alice", self.VARIACAO))
+        self.assertEqual(list(self.topico.postagens), [original])
+        self.assertEqual(len(original.respostas), 0)
+        self.assertIsNotNone(self.manager.responder_postagem_por_id(original.id, "alice", "Obrigado!"))
+
+    def test_conteudo_removido_sai_do_indice(self):
+        self.manager.politica_spam = REJEITAR
+        original = self.manager.adicionar_postagem("Cafés do Sul", "bruno", self.SPAM)
+        resposta = self.manager.responder_postagem_por_id(original.id, "alice", self.LEGITIMA)
+        self.manager.remover_resposta(resposta.id)
+        self.assertIsNotNone(self.manager.responder_postagem_por_id(original.id, "alice", self.LEGITIMA + "!"))
+        self.manager.remover_postagem(original.id)
+        self.assertIsNotNone(self.manager.adicionar_postagem("Cafés do Sul", "bruno", self.VARIACAO))
+        self.manager.remover_topico("Cafés do Sul")
+        self.assertEqual(len(self.manager.antispam), 0)
+
+    def test_edicao_troca_a_assinatura(self):
+        self.manager.politica_spam = REJEITAR
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", self.SPAM)
+        self.assertIs(self.manager.editar_postagem(postagem.id, self.VARIACAO), postagem)
+        self.assertIs(self.manager.editar_postagem(postagem.id, self.LEGITIMA), postagem)
+        self.assertIsNotNone(self.manager.adicionar_postagem("Cafés do Sul", "alice", self.SPAM))
+        self.assertIsNone(self.manager.editar_postagem(postagem.id, self.VARIACAO))
+        self.assertEqual(self.sink.eventos[-1].operacao, "editar_postagem")
+        self.assertEqual(postagem.texto, self.LEGITIMA)
+
+
+class TestLimiteDeEscrita(ForumTestCase):
+    def test_rajada_de_um_usuario_nao_afeta_os_demais(self):
+        postagem = self.manager.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        respostas = [self.manager.responder_postagem_por_id(postagem.id, "alice", f"resposta {n}") for n in range(40)]
+        self.assertEqual(sum(r is not None for r in respostas), 30)
+        self.assertEqual(self.sink.eventos[-1].motivo, "Muitas publicações em pouco tempo; tente mais tarde.")
+        self.assertIsNotNone(self.manager.responder_postagem_por_id(postagem.id, "bruno", "Vale sim!"))
+
+    def test_administrador_nao_tem_limite(self):
+        self.manager.registrar_usuario("Admin", "adm", "000", "admin")
+        titulos = [f"Tópico {n}" for n in range(20)]
+        self.assertTrue(all(self.manager.criar_topico(t, "adm", "Discussão", "") for t in titulos))
+        self.manager.limitador = None
+        self.assertTrue(all(self.manager.criar_topico(f"Outro {n}", "bruno", "Discussão", "") for n in range(20)))
+
+
+class TestLinhaDoTempo(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager.registrar_usuario("Carla Dias", "carla", "789")
+
+    def test_publicacoes_de_usuarios_e_topicos_seguidos(self):
+        m = self.manager
+        m.seguir_usuario("carla", "bruno")
+        m.seguir_topico("carla", "Moagem")
+        p1 = m.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        p2 = m.adicionar_postagem("Moagem", "alice", "Média para coado")
+        r1 = m.responder_postagem_por_id(p2.id, "bruno", "Concordo")
+        m.adicionar_postagem("Cafés do Sul", "alice", "Não seguido")
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [r1, p2, p1])
+        self.assertEqual(self.manager.usuarios["carla"].topicos_seguidos, {m.indice_topicos.buscar("Moagem")})
+
+        pagina = m.paginar_linha_do_tempo("carla", limite=2)
+        self.assertEqual(pagina.itens, [r1, p2])
+        self.assertEqual(m.paginar_linha_do_tempo("carla", cursor=pagina.proximo_cursor).itens, [p1])
+
+    def test_remocoes_e_deixar_de_seguir(self):
+        m = self.manager
+        m.seguir_usuario("carla", "bruno")
+        m.seguir_topico("carla", "Moagem")
+        p1 = m.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        p2 = m.adicionar_postagem("Moagem", "alice", "Média para coado")
+        m.remover_postagem(p1.id)
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [p2])
+
+        m.remover_topico("Moagem")
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [])
+        self.assertEqual(m.usuarios["carla"].topicos_seguidos, set())
+
+        m.deixar_de_seguir_usuario("carla", "bruno")
+        m.adicionar_postagem("Cafés do Sul", "bruno", "Depois")
+        self.assertEqual(m.paginar_linha_do_tempo("carla").itens, [])
+
+    def test_falhas(self):
+        self.assertIsNone(self.manager.seguir_topico("carla", "Inexistente"))
+        self.assertIsNone(self.manager.seguir_usuario("carla", "ninguem"))
+        self.assertIsNone(self.manager.paginar_linha_do_tempo("carla", cursor="???"))
+        self.assertEqual([e.operacao for e in self.sink.eventos if isinstance(e, FalhaOperacao)][-3:],
+                         ["seguir_topico", "seguir_usuario", "paginar_linha_do_tempo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
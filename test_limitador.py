@@ -0,0 +1,66 @@
+import unittest
+
+from decorator import Administrador, Lojista, Moderador, UsuarioConvidado, UsuarioLogado
+from forum_manager import Usuario
+from limitador import (
+    ADICIONAR_POSTAGEM, ADMINISTRADOR, CONVIDADO, CRIAR_TOPICO, LOGADO, LOJISTA, MODERADOR, Limite,
+    LimitadorEscrita, papel_de,
+)
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TestLimitadorEscrita(unittest.TestCase):
+    def setUp(self):
+        self.relogio = Relogio()
+        limites = {LOGADO: {ADICIONAR_POSTAGEM: Limite(3, 1.0)}, CONVIDADO: {ADICIONAR_POSTAGEM: Limite(1, 0.1)},
+                   ADMINISTRADOR: {}}
+        self.limitador = LimitadorEscrita(limites, maximo_baldes=4, relogio=self.relogio)
+
+    def permitir(self, nome, papel=LOGADO, operacao=ADICIONAR_POSTAGEM):
+        return self.limitador.permitir(nome, operacao, papel)
+
+    def test_rajada_ate_a_capacidade_e_reposicao(self):
+        self.assertEqual([self.permitir("ana") for _ in range(4)], [True, True, True, False])
+        self.relogio.agora = 1.0
+        self.assertEqual([self.permitir("ana") for _ in range(2)], [True, False])
+        self.assertTrue(self.permitir("bia"))
+
+    def test_limites_por_papel_e_operacao(self):
+        self.assertTrue(self.permitir("ana", CONVIDADO))
+        self.assertFalse(self.permitir("ana", CONVIDADO))
+        self.assertTrue(all(self.permitir("adm", ADMINISTRADOR) for _ in range(100)))
+        self.assertTrue(all(self.permitir("ana", operacao=CRIAR_TOPICO) for _ in range(100)))
+
+    def test_baldes_cheios_sao_descartados(self):
+        for nome in ("ana", "bia", "caio"):
+            self.permitir(nome)
+        self.assertEqual(len(self.limitador), 3)
+        self.relogio.agora = 1.0
+        self.permitir("davi")
+        self.assertEqual(len(self.limitador), 1)
+
+    def test_memoria_limitada_pelos_ativos(self):
+        for i in range(10):
+            self.permitir(f"u{i}")
+        self.assertEqual(len(self.limitador), 4)
+
+    def test_papel_dos_decorators_e_do_usuario_do_manager(self):
+        logado = UsuarioLogado(UsuarioConvidado())
+        self.assertEqual(papel_de(UsuarioConvidado()), CONVIDADO)
+        self.assertEqual(papel_de(logado), LOGADO)
+        self.assertEqual(papel_de(Lojista(logado)), LOJISTA)
+        self.assertEqual(papel_de(Moderador(logado, 1)), MODERADOR)
+        self.assertEqual(papel_de(Administrador(logado, 1)), ADMINISTRADOR)
+        self.assertEqual(papel_de(Usuario("Ana", "ana", "1", "padrão")), LOGADO)
+        self.assertEqual(papel_de(Usuario("Adm", "adm", "1", "admin")), ADMINISTRADOR)
+
+
+if __name__ == "__main__":
+    unittest.main()
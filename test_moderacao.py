@@ -0,0 +1,118 @@
+import asyncio
+import gc
+import io
+import unittest
+from concurrent.futures import wait
+from contextlib import redirect_stdout
+
+from eventos import FalhaOperacao, SinkMemoria, definir_sink
+from moderacao import ASYNCIO, THREADS, AlteracaoTopico, Moderador, Observador, SujeitoObserver, Topico
+
+
+class Contador(Observador):
+    __slots__ = ("eventos",)
+
+    def __init__(self):
+        self.eventos = []
+
+    def atualizar(self, evento=None):
+        self.eventos.append(evento)
+
+
+class Quebrado(Observador):
+    __slots__ = ()
+
+    def atualizar(self, evento=None):
+        raise RuntimeError("falhou")
+
+
+class ContadorAssincrono(Contador):
+    __slots__ = ()
+
+    async def atualizar(self, evento=None):
+        await asyncio.sleep(0)
+        self.eventos.append(evento)
+
+
+def novo_moderador(nome_usuario):
+    return Moderador(nome_usuario, nome_usuario, "123", ["moderar"], 30, "Prata", 0, "", "", 0, "moderador", "")
+
+
+class TestSujeitoObserver(unittest.TestCase):
+    def setUp(self):
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+
+    def tearDown(self):
+        definir_sink(self._sink_anterior)
+
+    def test_registro_sem_repeticao_e_referencias_fracas(self):
+        sujeito, fica = SujeitoObserver(), Contador()
+        sujeito.vincular(fica)
+        sujeito.vincular(fica)
+        sujeito.vincular(Contador())  # sem outra referência: é coletado
+        gc.collect()
+        self.assertEqual(len(sujeito.observers), 1)
+        self.assertEqual(sujeito.notificar("e1"), 1)
+        sujeito.desvincular(fica)
+        sujeito.desvincular(fica)
+        self.assertEqual(sujeito.notificar("e2"), 0)
+        self.assertEqual(fica.eventos, ["e1"])
+
+    def test_excecao_fica_isolada_no_observador(self):
+        sujeito, antes, depois = SujeitoObserver(), Contador(), Contador()
+        quebrado = Quebrado()
+        for observador in (antes, quebrado, depois):
+            sujeito.vincular(observador)
+        self.assertEqual(sujeito.notificar("e"), 2)
+        self.assertEqual((antes.eventos, depois.eventos), (["e"], ["e"]))
+        self.assertEqual(self.sink.eventos[-1], FalhaOperacao("atualizar", "Quebrado: falhou",
+                                                              momento=self.sink.eventos[-1].momento))
+
+    def test_filtros_por_inscricao_e_por_moderador(self):
+        central = SujeitoObserver()
+        cafe = Topico("Café", "ana", 1, "Dúvida", "")
+        moagem = Topico("Moagem", "ana", 2, "Dúvida", "")
+        moderador, pares = novo_moderador("mod"), Contador()
+        moderador.moderarTopico(cafe)
+        central.vincular(moderador)
+        central.vincular(pares, filtro=lambda evento: evento.acao == "editado")
+        with redirect_stdout(io.StringIO()) as saida:
+            self.assertEqual(central.notificar(AlteracaoTopico(cafe, "criado")), 1)
+            self.assertEqual(central.notificar(AlteracaoTopico(moagem, "editado")), 1)
+        self.assertEqual(saida.getvalue().count("mod foi notificado"), 1)
+        self.assertEqual([e.topico.titulo for e in pares.eventos], ["Moagem"])
+
+    def test_moderador_vinculado_sem_moderar_recebe_tudo(self):
+        topico, moderador = Topico("Café", "ana", 1, "Dúvida", ""), novo_moderador("mod")
+        topico.vincular(moderador)
+        moderador.aprovarTopico(Topico("Outro", "ana", 2, "Dúvida", ""))
+        with redirect_stdout(io.StringIO()) as saida:
+            self.assertEqual(topico.notificar(AlteracaoTopico(topico, "criado")), 1)
+        self.assertIn("mod foi notificado", saida.getvalue())
+
+    def test_despacho_em_threads(self):
+        sujeito = SujeitoObserver(despacho=THREADS)
+        observadores = [Contador() for _ in range(1000)]
+        for observador in observadores:
+            sujeito.vincular(observador)
+        futuros = sujeito.notificar("e")
+        wait(futuros)
+        self.assertEqual(sum(f.result() for f in futuros), 1000)
+        self.assertTrue(all(o.eventos == ["e"] for o in observadores))
+
+    def test_despacho_asyncio(self):
+        sujeito = SujeitoObserver(despacho=ASYNCIO)
+        observadores = [ContadorAssincrono(), Contador(), Quebrado()]
+        for observador in observadores:
+            sujeito.vincular(observador)
+
+        async def principal():
+            return await sujeito.notificar("e")
+
+        self.assertEqual(asyncio.run(principal()), 2)
+        self.assertEqual([o.eventos for o in observadores[:2]], [["e"], ["e"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import threading
+import time
 import unittest
-from notificacao_respostas import Usuario, Topico  # ajuste o nome do módulo
+
+from eventos import FalhaOperacao, NotificacaoResposta, SinkMemoria, definir_sink
+from notificacao_respostas import DespachanteNotificacoes, Usuario, Topico, definir_despachante  # ajuste o nome do módulo
 
 class TestForum(unittest.TestCase):
     def setUp(self):
@@ -25,5 +29,91 @@ class TestForum(unittest.TestCase):
         # Como notificar() só printa, não dá pra testar diretamente,
         # mas você pode mockar ou checar efeitos colaterais em um teste mais avançado.
 
+
+class UsuarioLento(Usuario):
+    # Entrega presa até o teste liberar.
+    __slots__ = ("liberar", "entregas")
+
+    def __init__(self, nome, nome_usuario):
+        super().__init__(nome, nome_usuario)
+        self.liberar = threading.Event()
+        self.entregas = []
+
+    def notificar(self, quantidade=1):
+        self.liberar.wait()
+        self.entregas.append(quantidade)
+
+
+class TestDespachanteNotificacoes(unittest.TestCase):
+    def setUp(self):
+        self.sink = SinkMemoria()
+        self._sink_anterior = definir_sink(self.sink)
+        self.despachante = DespachanteNotificacoes(trabalhadores=2, capacidade=2, janela=0.05)
+        self._despachante_anterior = definir_despachante(self.despachante)
+        self.autor = Usuario("Rita Lee", "rita")
+        self.topico = Topico("Moagem", self.autor, "2025-06-01", "Fina ou grossa?")
+
+    def notificacoes(self, nome_usuario):
+        return [e for e in self.sink.eventos if isinstance(e, NotificacaoResposta) and e.nome_usuario == nome_usuario]
+
+    def tearDown(self):
+        self.despachante.fechar()
+        definir_despachante(self._despachante_anterior)
+        definir_sink(self._sink_anterior)
+
+    def test_respostas_rapidas_viram_um_resumo(self):
+        leitor = Usuario("Ana Maria", "ana_m")
+        for i in range(1000):
+            self.topico.gerarResposta(leitor, f"resposta {i}")
+        self.assertTrue(self.despachante.aguardar(timeout=5))
+        notificacoes = self.notificacoes("rita")
+        self.assertEqual(sum(n.quantidade for n in notificacoes), 1000)
+        self.assertLess(len(notificacoes), 10)
+        self.assertEqual(NotificacaoResposta("rita", 12).mensagem(),
+                         "[NOTIFICAÇÃO] rita, seu tópico recebeu 12 novas respostas!")
+
+    def test_fila_cheia_aplica_contrapressao(self):
+        lentos = [UsuarioLento(f"Lento {i}", f"lento{i}") for i in range(4)]
+        for lento in lentos:
+            self.assertTrue(self.despachante.enfileirar(lento))  # 2 em entrega, 2 na fila
+        time.sleep(0.2)
+        self.assertTrue(self.despachante.enfileirar(lentos[3], 5))  # soma na entrada pendente
+        self.assertFalse(self.despachante.enfileirar(Usuario("Novo", "novo"), timeout=0.05))
+
+        for lento in lentos:
+            lento.liberar.set()
+        self.assertTrue(self.despachante.aguardar(timeout=5))
+        self.assertEqual([lento.entregas for lento in lentos], [[1], [1], [1], [6]])
+
+    def test_erro_na_entrega_nao_derruba_o_trabalhador(self):
+        class Quebrado(Usuario):
+            __slots__ = ()
+
+            def notificar(self, quantidade=1):
+                raise RuntimeError("caixa de e-mail indisponível")
+
+        self.despachante.enfileirar(Quebrado("Q", "q"))
+        self.despachante.enfileirar(self.autor)
+        self.assertTrue(self.despachante.aguardar(timeout=5))
+        falhas = [e for e in self.sink.eventos if isinstance(e, FalhaOperacao)]
+        self.assertEqual([f.motivo for f in falhas], ["caixa de e-mail indisponível"])
+        self.assertEqual([n.quantidade for n in self.notificacoes("rita")], [1])
+
+
+    def test_despachante_encerrado_nao_deixa_resposta_pela_metade(self):
+        self.despachante.fechar()
+        leitor = Usuario("Ana Maria", "ana_m")
+        resposta = self.topico.gerarResposta(leitor, "Média.")
+        self.assertEqual((self.topico.respostas, leitor.respostas), ([resposta], [resposta]))
+        self.assertEqual([n.quantidade for n in self.notificacoes("rita")], [1])
+
+    def test_fechar_entrega_os_resumos_pendentes(self):
+        despachante = DespachanteNotificacoes(janela=60)
+        for _ in range(3):
+            despachante.enfileirar(self.autor)
+        despachante.fechar()
+        self.assertEqual([n.quantidade for n in self.notificacoes("rita")], [3])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from placar import Placar
+from strategy import RankPorAvaliacoes, RankPorTempoNoSistema, Usuario
+
+
+def ordem_esperada(usuarios, estrategia):
+    return [u.nome for u in sorted(usuarios, key=lambda u: (-estrategia.calcular(u), u.nome))]
+
+
+class TestPlacar(unittest.TestCase):
+    def setUp(self):
+        aleatorio = random.Random(5)
+        self.estrategia = RankPorAvaliacoes()
+        self.usuarios = []
+        for i in range(300):
+            usuario = Usuario(f"u{i:03}", manter_historico=False)
+            for _ in range(aleatorio.randrange(1, 4)):
+                usuario.adicionar_avaliacao(aleatorio.randint(1, 5))
+            self.usuarios.append(usuario)
+        self.placar = Placar(self.estrategia, semente=1)
+
+    def conferir(self):
+        esperado = ordem_esperada([u for u in self.usuarios if u in self.placar], self.estrategia)
+        self.assertEqual([u.nome for _, u, _ in self.placar.primeiros(len(esperado))], esperado)
+        for usuario in self.usuarios[::17]:
+            if usuario in self.placar:
+                self.assertEqual(self.placar.posicao(usuario), esperado.index(usuario.nome) + 1)
+
+    def test_carga_e_acompanhamento_individual_dao_a_mesma_ordem(self):
+        self.placar.carregar(self.usuarios)
+        self.conferir()
+        outro = Placar(self.estrategia, semente=2)
+        for usuario in self.usuarios:
+            outro.acompanhar(usuario)
+        self.assertEqual([u.nome for _, u, _ in outro.primeiros(300)],
+                         [u.nome for _, u, _ in self.placar.primeiros(300)])
+
+    def test_mudancas_no_usuario_reposicionam(self):
+        self.placar.carregar(self.usuarios)
+        aleatorio = random.Random(9)
+        for _ in range(500):
+            aleatorio.choice(self.usuarios).adicionar_avaliacao(aleatorio.randint(1, 5))
+        self.conferir()
+        lanterna = self.placar.primeiros(300)[-1][1]
+        for _ in range(20):
+            lanterna.adicionar_avaliacao(5)
+        self.assertLess(self.placar.posicao(lanterna), 150)
+        self.conferir()
+
+    def test_empates_pelo_nome_e_notas(self):
+        placar = Placar(RankPorTempoNoSistema())
+        ana, bia, caio = Usuario("ana"), Usuario("bia"), Usuario("caio")
+        ana.meses_ativo, bia.meses_ativo, caio.meses_ativo = 10, 20, 10
+        placar.carregar([caio, ana, bia])
+        self.assertEqual(placar.primeiros(), [(1, bia, 16.0), (2, ana, 8.0), (3, caio, 8.0)])
+        caio.meses_ativo = 30
+        self.assertEqual([u.nome for _, u, _ in placar.primeiros(2)], ["caio", "bia"])
+        with self.assertRaises(ValueError):
+            Placar(RankPorTempoNoSistema()).carregar([ana, Usuario("ana")])
+
+    def test_ao_redor(self):
+        self.placar.carregar(self.usuarios)
+        primeiro = self.placar.primeiros(1)[0][1]
+        self.assertEqual([p for p, _, _ in self.placar.ao_redor(primeiro, raio=2)], [1, 2, 3])
+        meio = self.placar.primeiros(150)[-1][1]
+        vizinhos = self.placar.ao_redor(meio, raio=3)
+        self.assertEqual([p for p, _, _ in vizinhos], list(range(147, 154)))
+        self.assertIs(vizinhos[3][1], meio)
+        self.assertEqual(self.placar.ao_redor(Usuario("fora")), [])
+
+    def test_remover_e_deixar_de_acompanhar(self):
+        self.placar.carregar(self.usuarios)
+        saiu = self.usuarios[0]
+        self.placar.deixar_de_acompanhar(saiu)
+        saiu.adicionar_avaliacao(5)
+        self.assertNotIn(saiu, self.placar)
+        self.assertIsNone(self.placar.posicao(saiu))
+        self.assertEqual(len(self.placar), 299)
+        self.conferir()
+        novo = Usuario("zz")
+        self.placar.carregar([novo])
+        self.assertEqual(self.placar.posicao(novo), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
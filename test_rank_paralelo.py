@@ -0,0 +1,98 @@
+import random
+import unittest
+
+import rank_paralelo
+from rank_paralelo import RankeadorParalelo
+from strategy import (
+    ColunasUsuarios, EstrategiaRankeamento, RankComposto, RankPorAvaliacoes, RankPorParticipacao,
+    RankPorTempoNoSistema, Usuario,
+)
+
+ESTRATEGIAS = (RankPorParticipacao(), RankPorAvaliacoes(), RankPorTempoNoSistema())
+
+
+def colunas_aleatorias(quantidade, semente=3):
+    aleatorio = random.Random(semente)
+    qtd_avaliacoes = [aleatorio.randrange(6) for _ in range(quantidade)]
+    return ColunasUsuarios([aleatorio.randrange(40) for _ in range(quantidade)],
+                           [aleatorio.randrange(8) for _ in range(quantidade)],
+                           [aleatorio.randint(1, 5) * n for n in qtd_avaliacoes], qtd_avaliacoes,
+                           [aleatorio.randrange(60) for _ in range(quantidade)])
+
+
+class RankSemLote(EstrategiaRankeamento):
+    # Só calcular(): o calcular_lote padrão precisa dos objetos Usuario.
+    def calcular(self, usuario):
+        return len(usuario.nome)
+
+
+def esperado(notas, quantidade):
+    return sorted(enumerate(notas), key=lambda par: (-par[1], par[0]))[:quantidade]
+
+
+class TestRankeadorParalelo(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.colunas = colunas_aleatorias(20_000)
+        cls.rankeador = RankeadorParalelo(processos=2, minimo_paralelo=1000, fatias_por_processo=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rankeador.fechar()
+
+    def test_notas_e_top_iguais_ao_serial(self):
+        # Notas inteiras repetidas: os empates precisam sair pelo menor índice.
+        for estrategia in ESTRATEGIAS:
+            with self.subTest(estrategia=type(estrategia).__name__):
+                notas = list(estrategia.calcular_lote(self.colunas))
+                self.assertEqual(list(self.rankeador.calcular(estrategia, self.colunas)), notas)
+                self.assertEqual(self.rankeador.ranquear(estrategia, self.colunas, 250), esperado(notas, 250))
+
+    def test_sem_numpy(self):
+        anterior, rank_paralelo.np = rank_paralelo.np, None
+        try:
+            estrategia = RankPorTempoNoSistema()
+            notas = list(estrategia.calcular_lote(self.colunas))
+            serial = RankeadorParalelo(processos=1)
+            self.assertEqual(serial.ranquear(estrategia, self.colunas, 30), esperado(notas, 30))
+            self.assertEqual(self.rankeador.ranquear(estrategia, self.colunas, 30), esperado(notas, 30))
+        finally:
+            rank_paralelo.np = anterior
+
+    def test_composto_normalizado_usa_parametros_da_populacao(self):
+        composto = RankComposto(zip(ESTRATEGIAS, (0.5, 0.3, 0.2)), "zscore")
+        paralelo = self.rankeador.ranquear(composto, self.colunas, 40)
+        parametros = composto.parametros
+        notas = list(composto.calcular_lote(self.colunas))
+        self.assertEqual(composto.parametros, parametros)
+        self.assertEqual(paralelo, esperado(notas, 40))
+
+    def test_entradas_pequenas_rodam_em_serie(self):
+        pequeno = colunas_aleatorias(50)
+        self.assertFalse(self.rankeador.em_paralelo(pequeno))
+        self.assertFalse(RankeadorParalelo(processos=1, minimo_paralelo=0).em_paralelo(self.colunas))
+        notas = list(RankPorAvaliacoes().calcular_lote(pequeno))
+        self.assertEqual(self.rankeador.ranquear(RankPorAvaliacoes(), pequeno, 500), esperado(notas, 500))
+        self.assertEqual(self.rankeador.ranquear(RankPorAvaliacoes(), ColunasUsuarios([], [], [], [], []), 5), [])
+
+    def test_estrategia_que_precisa_dos_usuarios(self):
+        colunas = ColunasUsuarios.de_usuarios([Usuario("ana"), Usuario("bia")])
+        self.assertEqual(RankeadorParalelo(processos=1).ranquear(RankSemLote(), colunas, 1)[0][0], 0)
+        with self.assertRaises(ValueError):
+            self.rankeador.calcular(RankSemLote(), self.colunas)
+
+    def test_estrategia_sem_lote_roda_em_serie(self):
+        usuarios = [Usuario("u" * (i % 7 + 1)) for i in range(1500)]
+        colunas = ColunasUsuarios.de_usuarios(usuarios)
+        composto = RankComposto([(RankPorParticipacao(), 0.5), (RankSemLote(), 0.5)])
+        for estrategia in (RankSemLote(), composto):
+            with self.subTest(estrategia=type(estrategia).__name__):
+                self.assertFalse(self.rankeador.em_paralelo(colunas, estrategia))
+                notas = list(estrategia.calcular_lote(colunas))
+                self.assertEqual(list(self.rankeador.calcular(estrategia, colunas)), notas)
+                self.assertEqual(self.rankeador.ranquear(estrategia, colunas, 20), esperado(notas, 20))
+        self.assertTrue(self.rankeador.em_paralelo(colunas, RankPorParticipacao()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from eventos import FalhaOperacao, SinkMemoria, SinkNulo, definir_sink
+from forum_manager import ComunidadeCafeManager
+from repositorio import MSG_ESCRITA_REJEITADA, RepositorioSQLite
+
+
+class TestRepositorioSQLite(unittest.TestCase):
+    def setUp(self):
+        self._sink_anterior = definir_sink(SinkNulo())
+        self._pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self._pasta.name, "forum.db")
+        ComunidadeCafeManager._instancia = None
+        self.manager = ComunidadeCafeManager()
+        self.manager.usar_repositorio(RepositorioSQLite(self.caminho, tamanho_lote=4))
+
+    def tearDown(self):
+        self.manager.fechar()
+        ComunidadeCafeManager._instancia = None
+        definir_sink(self._sink_anterior)
+        self._pasta.cleanup()
+
+    def reiniciar(self):
+        self.manager.fechar()
+        ComunidadeCafeManager._instancia = None
+        self.manager = ComunidadeCafeManager()
+        self.manager.usar_repositorio(RepositorioSQLite(self.caminho))
+
+    def popular(self):
+        m = self.manager
+        m.registrar_usuario("Alice Souza", "alice", "123")
+        m.registrar_usuario("Bruno Lima", "bruno", "456")
+        m.criar_topico("Cafés do Sul", "alice", "Discussão", "Lugares no sul.")
+        m.criar_topico("Moagem", "bruno", "Dúvida", "Fina ou grossa?")
+        self.p1 = m.adicionar_postagem("Cafés do Sul", "bruno", "Café Cultura")
+        self.p2 = m.adicionar_postagem("Cafés do Sul", "alice", "Café do Mercado")
+        self.r1 = m.responder_postagem_por_id(self.p2.id, "bruno", "Ótimo ambiente")
+        m.curtir_resposta(self.r1.id, "alice")
+
+    def test_estado_sobrevive_ao_reinicio(self):
+        self.popular()
+        self.manager.remover_postagem(self.p1.id)
+        self.manager.renomear_topico("Moagem", "Moagem e Extração")
+        self.reiniciar()
+
+        m = self.manager
+        self.assertEqual(set(m.usuarios), {"alice", "bruno"})
+        self.assertEqual([t.titulo for t in m.topicos], ["Cafés do Sul", "Moagem e Extração"])
+        topico = m.indice_topicos.buscar("Cafés do Sul")
+        self.assertEqual([p.texto for p in topico.postagens], ["Café do Mercado"])
+        self.assertIs(topico.postagens[1].autor, m.usuarios["alice"])
+        resposta = topico.postagens[1].respostas[0]
+        self.assertEqual((resposta.id, resposta.conteudo, resposta.quantidade_likes),
+                         (self.r1.id, "Ótimo ambiente", 1))
+
+    def test_curtidas_por_usuario_sobrevivem_ao_reinicio(self):
+        self.popular()
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.manager.descurtir_resposta(self.r1.id, "alice")
+        self.reiniciar()
+        self.assertEqual(self.manager.curtidas_do_usuario("bruno", [self.r1.id]), [True])
+        self.manager.curtir_resposta(self.r1.id, "bruno")
+        self.assertEqual(self.manager.obter_resposta(self.r1.id).quantidade_likes, 1)
+        self.manager.remover_postagem(self.p2.id)
+        self.reiniciar()
+        self.assertEqual(len(self.manager.curtidas), 0)
+
+    def test_threads_carregam_sob_demanda(self):
+        self.popular()
+        self.reiniciar()
+        self.assertEqual(self.manager.postagens_por_id, {})
+        resposta = self.manager.obter_resposta(self.r1.id)
+        self.assertEqual(resposta.conteudo, "Ótimo ambiente")
+        self.assertIs(resposta.postagem, self.manager.obter_postagem(self.p2.id))
+
+    def test_ids_continuam_apos_reinicio(self):
+        self.popular()
+        self.reiniciar()
+        nova = self.manager.adicionar_postagem("Moagem", "alice", "Média")
+        self.assertGreater(nova.id, self.p2.id)
+        self.reiniciar()
+        self.assertEqual(self.manager.obter_postagem(nova.id).texto, "Média")
+
+    def test_posicoes_removidas_no_fim_nao_sao_reusadas(self):
+        self.popular()
+        r2 = self.manager.responder_postagem_por_id(self.p2.id, "alice", "Concordo")
+        self.manager.remover_resposta(r2.id)
+        self.manager.remover_postagem(self.p2.id)
+        self.reiniciar()
+        topico = self.manager.indice_topicos.buscar("Cafés do Sul")
+        nova = self.manager.adicionar_postagem("Cafés do Sul", "alice", "Café Bela Vista")
+        self.assertEqual(nova.posicao, self.p2.posicao + 1)
+        self.assertEqual([i for i, _ in topico.postagens.posicoes()], [self.p1.posicao, nova.posicao])
+
+    def test_posicao_de_resposta_removida_no_fim_nao_e_reusada(self):
+        self.popular()
+        r2 = self.manager.responder_postagem_por_id(self.p2.id, "alice", "Concordo")
+        self.manager.remover_resposta(r2.id)
+        self.reiniciar()
+        r3 = self.manager.responder_postagem_por_id(self.p2.id, "alice", "Também acho")
+        self.assertEqual(r3.posicao, r2.posicao + 1)
+        self.reiniciar()
+        postagem = self.manager.obter_postagem(self.p2.id)
+        self.assertEqual([i for i, _ in postagem.respostas.posicoes()], [self.r1.posicao, r3.posicao])
+
+    def test_linha_rejeitada_nao_descarta_o_resto_do_lote(self):
+        sink = SinkMemoria()
+        definir_sink(sink)
+        self.manager.registrar_usuario("Alice Souza", "alice", "123")
+        self.manager.registrar_usuario(None, "bob", "456")  # viola NOT NULL em nome
+        self.manager.registrar_usuario("Carla Dias", "carla", "789")
+        self.manager.confirmar()
+        falhas = [e for e in sink.eventos if isinstance(e, FalhaOperacao)]
+        self.assertEqual([e.operacao for e in falhas], ["confirmar"])
+        self.assertTrue(falhas[0].motivo.startswith(MSG_ESCRITA_REJEITADA))
+        self.assertEqual(len(self.manager._repositorio.rejeitadas), 1)
+        self.reiniciar()
+        self.assertEqual(set(self.manager.usuarios), {"alice", "carla"})
+
+    def test_remover_topico_apaga_thread(self):
+        self.popular()
+        self.manager.remover_topico("Cafés do Sul")
+        self.reiniciar()
+        self.assertIsNone(self.manager.obter_postagem(self.p2.id))
+        self.assertIsNone(self.manager.obter_resposta(self.r1.id))
+
+    def test_lote_persiste(self):
+        self.manager.registrar_usuarios_em_lote([("Carla", "carla", "1"), ("Davi", "davi", "2")])
+        self.manager.criar_topicos_em_lote([("Lote", "carla", "Discussão", "")])
+        self.manager.adicionar_postagens_em_lote([("Lote", "davi", "Oi")])
+        self.reiniciar()
+        self.assertEqual(len(self.manager.indice_topicos.buscar("Lote").postagens), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
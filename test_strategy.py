@@ -0,0 +1,216 @@
+import operator
+import random
+import unittest
+from functools import reduce
+
+import strategy
+from strategy import (
+    Agregado, ColunasUsuarios, EstrategiaRankeamento, RankComposto, RankPorAvaliacoes, RankPorParticipacao,
+    RankPorTempoNoSistema, Usuario,
+)
+
+ESTRATEGIAS = (RankPorParticipacao(), RankPorAvaliacoes(), RankPorTempoNoSistema())
+
+
+def usuarios_aleatorios(quantidade, semente=7):
+    aleatorio = random.Random(semente)
+    usuarios = []
+    for i in range(quantidade):
+        usuario = Usuario(f"u{i}")
+        usuario.comentarios = ["c"] * aleatorio.randrange(50)
+        usuario.topicos = ["t"] * aleatorio.randrange(10)
+        usuario.avaliacoes = [aleatorio.choice((1, 2.5, 3.7, 4.1, 5.0, 0.3)) for _ in range(aleatorio.randrange(8))]
+        usuario.meses_ativo = aleatorio.randrange(120)
+        usuarios.append(usuario)
+    return usuarios
+
+
+def soma_sequencial(valores):
+    # Referência fixa, independente do sum() do interpretador.
+    return reduce(operator.add, valores, 0)
+
+
+class RankPorNome(EstrategiaRankeamento):
+    def calcular(self, usuario):
+        return float(len(usuario.nome))
+
+
+class TestCalcularLote(unittest.TestCase):
+    def setUp(self):
+        self.usuarios = usuarios_aleatorios(2000)
+        self.colunas = ColunasUsuarios.de_usuarios(self.usuarios)
+
+    def verificar_identico(self, estrategia):
+        lote = estrategia.calcular_lote(self.colunas)
+        self.assertEqual(len(lote), len(self.usuarios))
+        for usuario, nota in zip(self.usuarios, lote):
+            usuario.set_estrategia_rankeamento(estrategia)
+            self.assertEqual(usuario.calcular_rank(), nota)
+
+    def test_lote_igual_ao_calculo_por_usuario(self):
+        for estrategia in ESTRATEGIAS:
+            with self.subTest(estrategia=type(estrategia).__name__):
+                self.verificar_identico(estrategia)
+
+    def test_lote_sem_numpy(self):
+        anterior, strategy.np = strategy.np, None
+        try:
+            self.test_lote_igual_ao_calculo_por_usuario()
+        finally:
+            strategy.np = anterior
+
+    def test_estrategia_sem_lote_usa_calcular(self):
+        self.verificar_identico(RankPorNome())
+        colunas = ColunasUsuarios([1], [1], [0.0], [0], [3])
+        self.assertEqual(list(RankPorTempoNoSistema().calcular_lote(colunas)), [3 * 0.8])
+        with self.assertRaises(ValueError):
+            RankPorNome().calcular_lote(colunas)
+
+    def test_colunas_de_tamanhos_diferentes(self):
+        with self.assertRaises(ValueError):
+            ColunasUsuarios([1, 2], [1], [0.0], [0], [3])
+
+
+class TestRankComposto(unittest.TestCase):
+    def setUp(self):
+        self.usuarios = usuarios_aleatorios(2000, semente=11)
+        self.colunas = ColunasUsuarios.de_usuarios(self.usuarios)
+
+    def composto(self, normalizacao):
+        return RankComposto([(RankPorParticipacao(), 0.5), (RankPorAvaliacoes(), 0.3),
+                             (RankPorTempoNoSistema(), 0.2)], normalizacao)
+
+    def test_lote_igual_ao_calculo_por_usuario(self):
+        for normalizacao in RankComposto.NORMALIZACOES:
+            with self.subTest(normalizacao=normalizacao):
+                composto = self.composto(normalizacao)
+                lote = composto.calcular_lote(self.colunas)
+                self.assertEqual(list(lote), [composto.calcular(u) for u in self.usuarios])
+
+    def test_lote_sem_numpy(self):
+        anterior, strategy.np = strategy.np, None
+        try:
+            self.test_lote_igual_ao_calculo_por_usuario()
+        finally:
+            strategy.np = anterior
+
+    def test_normalizacoes(self):
+        minmax = self.composto("minmax").calcular_lote(self.colunas)
+        self.assertGreaterEqual(min(minmax), 0.0)
+        self.assertLessEqual(max(minmax), 1.0 + 1e-12)
+        parte = RankComposto([(RankPorAvaliacoes(), 1)], "minmax").calcular_lote(self.colunas)
+        self.assertEqual((min(parte), max(parte)), (0.0, 1.0))
+
+        zscore = RankComposto([(RankPorTempoNoSistema(), 1)], "zscore")
+        notas = list(zscore.calcular_lote(self.colunas))
+        media = sum(notas) / len(notas)
+        self.assertAlmostEqual(media, 0.0)
+        self.assertAlmostEqual(sum((n - media) ** 2 for n in notas) / len(notas), 1.0)
+
+        sem = RankComposto([(RankPorParticipacao(), 2), (RankPorTempoNoSistema(), 1)])
+        usuario = self.usuarios[0]
+        self.assertEqual(sem.calcular(usuario),
+                         2 * RankPorParticipacao().calcular(usuario) + RankPorTempoNoSistema().calcular(usuario))
+
+    def test_populacao_constante_e_erros(self):
+        colunas = ColunasUsuarios([3, 3], [1, 1], [0.0, 0.0], [0, 0], [5, 5])
+        for normalizacao in ("minmax", "zscore"):
+            self.assertEqual(list(RankComposto([(RankPorParticipacao(), 1)], normalizacao).calcular_lote(colunas)),
+                             [0.0, 0.0])
+        with self.assertRaises(ValueError):
+            self.composto("zscore").calcular(self.usuarios[0])
+        with self.assertRaises(ValueError):
+            RankComposto([(RankPorParticipacao(), 1)], "log")
+        with self.assertRaises(ValueError):
+            RankComposto([])
+
+    def test_ajustar_fixa_a_populacao(self):
+        composto = self.composto("minmax")
+        composto.ajustar(self.colunas)
+        novo = Usuario("novo")
+        novo.meses_ativo = 10_000
+        self.assertGreater(composto.calcular(novo), 1.0)
+
+
+class TestAgregados(unittest.TestCase):
+    def test_media_e_variancia(self):
+        agregado = Agregado([2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0])
+        self.assertEqual((agregado.quantidade, agregado.soma, agregado.soma_quadrados), (8, 40.0, 232.0))
+        self.assertEqual((agregado.media, agregado.variancia), (5.0, 4.0))
+        self.assertIsNotNone(agregado.atualizado_em)
+        self.assertEqual((Agregado().media, Agregado().variancia), (0.0, 0.0))
+        with self.assertRaises(ValueError):
+            Agregado().remover()
+
+    def test_soma_e_sequencial_em_qualquer_python(self):
+        # Soma compensada (sum() do Python 3.12+, fsum) daria 1.0.
+        self.assertEqual(Agregado([0.1] * 10).soma, 0.9999999999999999)
+        aleatorio = random.Random(1)
+        for _ in range(200):
+            notas = [aleatorio.choice((0.1, 0.2, 0.7, 3.3, 4.9)) for _ in range(aleatorio.randrange(1, 30))]
+            self.assertEqual(Agregado(notas).soma, soma_sequencial(notas))
+
+    def test_inclusoes_e_remocoes_mantem_o_rank_sequencial(self):
+        usuario = Usuario("ana")
+        usuario.set_estrategia_rankeamento(RankPorAvaliacoes())
+        notas = [0.1, 0.2, 0.7, 3.3, 4.9]
+        for nota in notas:
+            usuario.adicionar_avaliacao(nota)
+        usuario.remover_avaliacao(0.1)
+        notas.remove(0.1)
+        self.assertEqual(usuario.avaliacoes, tuple(notas))
+        self.assertEqual(usuario.calcular_rank(), soma_sequencial(notas) / len(notas))
+
+        usuario.adicionar_comentario("bom")
+        usuario.adicionar_comentario("ótimo")
+        usuario.adicionar_topico("Moagem")
+        usuario.remover_comentario("bom")
+        usuario.set_estrategia_rankeamento(RankPorParticipacao())
+        self.assertEqual(usuario.calcular_rank(), 1 * 1.5 + 1 * 2)
+        self.assertEqual((usuario.comentarios, usuario.topicos), (("ótimo",), ("Moagem",)))
+
+    def test_historico_aceita_a_interface_de_lista(self):
+        usuario = Usuario("ana")
+        usuario.set_estrategia_rankeamento(RankPorAvaliacoes())
+        usuario.avaliacoes.append(4.0)
+        usuario.avaliacoes += [5.0, 3.0]
+        self.assertEqual(usuario.avaliacoes, [4.0, 5.0, 3.0])
+        self.assertEqual(usuario.calcular_rank(), 4.0)
+        usuario.avaliacoes.remove(5.0)
+        del usuario.avaliacoes[0]
+        self.assertEqual((usuario.avaliacoes, usuario.agregado_avaliacoes.quantidade), ([3.0], 1))
+        usuario.avaliacoes[0] = 1.0
+        self.assertEqual(usuario.calcular_rank(), 1.0)
+
+        usuario.comentarios.extend(["bom", "ótimo"])
+        usuario.topicos.append("Moagem")
+        usuario.comentarios.pop()
+        self.assertEqual(len(usuario.comentarios), 1)
+        usuario.set_estrategia_rankeamento(RankPorParticipacao())
+        self.assertEqual(usuario.calcular_rank(), 1 * 1.5 + 1 * 2)
+        usuario.comentarios.clear()
+        self.assertEqual(usuario.agregado_comentarios.quantidade, 0)
+
+    def test_sem_historico_guarda_so_os_agregados(self):
+        usuario = Usuario("bia", manter_historico=False)
+        for nota in (4.0, 5.0, 3.0):
+            usuario.adicionar_avaliacao(nota)
+        usuario.remover_avaliacao(3.0)
+        for n in range(100):
+            usuario.adicionar_comentario(f"c{n}")
+        self.assertEqual(usuario.avaliacoes, ())
+        self.assertEqual(usuario.comentarios, ())
+        self.assertEqual(usuario.agregado_comentarios.quantidade, 100)
+        usuario.set_estrategia_rankeamento(RankPorAvaliacoes())
+        self.assertEqual(usuario.calcular_rank(), 4.5)
+
+        outro = Usuario("caio")
+        outro.avaliacoes = [1.0, 2.0]
+        outro.descartar_historico()
+        outro.adicionar_avaliacao(3.0)
+        self.assertFalse(outro.mantem_historico)
+        self.assertEqual((outro.avaliacoes, outro.agregado_avaliacoes.media), ((), 2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
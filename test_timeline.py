@@ -0,0 +1,57 @@
+import unittest
+
+from timeline import LinhaDoTempo
+
+
+class Origem:
+    def __init__(self, nome):
+        self.nome = nome
+
+
+class TestLinhaDoTempo(unittest.TestCase):
+    def setUp(self):
+        self.linha = LinhaDoTempo(capacidade=5, limite_pesado=2)
+        self.ana, self.bia, self.caio = Origem("ana"), Origem("bia"), Origem("caio")
+        self.topico = Origem("topico")
+
+    def test_fan_out_na_escrita_sem_duplicar(self):
+        self.linha.seguir(self.ana, self.bia)
+        self.linha.seguir(self.ana, self.topico)
+        self.linha.distribuir("p1", (self.bia, self.topico), self.bia)
+        self.linha.distribuir("p2", (self.caio, self.topico), self.caio)
+        self.linha.distribuir("p3", (self.caio, Origem("outro")), self.caio)
+        self.assertEqual(self.linha.pagina(self.ana, 10), (["p2", "p1"], None))
+        self.assertEqual(self.linha.pagina(self.bia, 10), ([], None))
+
+    def test_buffer_circular_guarda_so_os_recentes(self):
+        self.linha.seguir(self.ana, self.bia)
+        for i in range(8):
+            self.linha.distribuir(i, (self.bia,), self.bia)
+        self.assertEqual(self.linha.pagina(self.ana, 10)[0], [7, 6, 5, 4, 3])
+
+    def test_paginas_e_itens_inativos(self):
+        self.linha.seguir(self.ana, self.bia)
+        for i in range(5):
+            self.linha.distribuir(i, (self.bia,), self.bia)
+        itens, antes = self.linha.pagina(self.ana, 2, ativo=lambda item: item != 3)
+        self.assertEqual(itens, [4, 2])
+        self.assertEqual(self.linha.pagina(self.ana, 2, antes), ([1, 0], None))
+
+    def test_origem_pesada_e_lida_na_hora(self):
+        for seguidor in (self.ana, self.bia, self.caio):
+            self.linha.seguir(seguidor, self.topico)
+        self.linha.seguir(self.ana, self.caio)
+        self.linha.distribuir("p1", (self.caio, self.topico), self.caio)
+        self.assertEqual(self.linha._caixas.get(self.bia), None)
+        self.assertEqual(self.linha.pagina(self.ana, 10)[0], ["p1"])
+        self.assertEqual(self.linha.pagina(self.bia, 10)[0], ["p1"])
+        self.assertEqual(self.linha.pagina(self.caio, 10)[0], ["p1"])
+
+        self.linha.deixar_de_seguir(self.bia, self.topico)
+        self.assertEqual(self.linha.pagina(self.bia, 10)[0], [])
+        self.assertEqual(self.linha.remover_origem(self.topico), {self.ana, self.caio})
+        self.assertEqual(self.linha.pagina(self.ana, 10)[0], ["p1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import heapq
+import threading
+from collections import deque
+from itertools import count, dropwhile
+
+# === Linha do tempo inicial ===
+# Cada usuário tem uma caixa de entrada: um buffer circular (deque com maxlen)
+# com as publicações mais recentes de quem ele segue, em ordem de sequência.
+# Uma publicação nova é copiada na hora para as caixas dos seguidores do autor
+# e do tópico (fan-out na escrita), o que deixa a leitura barata.
+#
+# Origens com muitos seguidores (acima de `limite_pesado`) não são copiadas:
+# gravam só na própria caixa de saída, e quem as segue junta essas caixas com
+# a sua na hora de ler (fan-out na leitura). Uma origem que passa do limite
+# continua pesada dali em diante, para não alternar entre os dois modos.
+#
+# Origens são objetos Usuario ou Topico; os itens são postagens e respostas.
+# A linha do tempo vive só em memória e começa vazia a cada partida.
+
+
+class LinhaDoTempo:
+    def __init__(self, capacidade: int = 500, limite_pesado: int = 10_000):
+        self.capacidade = capacidade
+        self.limite_pesado = limite_pesado
+        self._seguidores = {}        # origem -> {Usuario}
+        self._caixas = {}            # Usuario -> deque[(sequencia, item)]
+        self._saidas = {}            # origem pesada -> deque[(sequencia, item)]
+        self._pesadas_seguidas = {}  # Usuario -> {origem pesada}
+        self._sequencia = count(1)
+        self._trava = threading.Lock()
+
+    def seguir(self, usuario, origem):
+        with self._trava:
+            seguidores = self._seguidores.setdefault(origem, set())
+            if usuario in seguidores:
+                return
+            seguidores.add(usuario)
+            if origem in self._saidas:
+                self._pesadas_seguidas.setdefault(usuario, set()).add(origem)
+            elif len(seguidores) > self.limite_pesado:
+                self._tornar_pesada(origem, seguidores)
+
+    def _tornar_pesada(self, origem, seguidores):
+        self._saidas[origem] = deque(maxlen=self.capacidade)
+        for seguidor in seguidores:
+            self._pesadas_seguidas.setdefault(seguidor, set()).add(origem)
+
+    def deixar_de_seguir(self, usuario, origem):
+        with self._trava:
+            seguidores = self._seguidores.get(origem)
+            if seguidores is None or usuario not in seguidores:
+                return
+            seguidores.discard(usuario)
+            pesadas = self._pesadas_seguidas.get(usuario)
+            if pesadas is not None:
+                pesadas.discard(origem)
+            # O que já foi copiado para a caixa dele fica até ser empurrado
+            # para fora do buffer.
+
+    def remover_origem(self, origem):
+        # Tópico removido: devolve quem o seguia para o manager atualizar.
+        with self._trava:
+            seguidores = self._seguidores.pop(origem, set())
+            if self._saidas.pop(origem, None) is not None:
+                for seguidor in seguidores:
+                    self._pesadas_seguidas.get(seguidor, set()).discard(origem)
+            return seguidores
+
+    def seguidores(self, origem):
+        return len(self._seguidores.get(origem, ()))
+
+    def distribuir(self, item, origens, autor=None):
+        # O autor não recebe a própria publicação; quem segue o autor e o
+        # tópico ao mesmo tempo recebe uma cópia só.
+        with self._trava:
+            entrada = (next(self._sequencia), item)
+            destinatarios = set()
+            for origem in origens:
+                saida = self._saidas.get(origem)
+                if saida is not None:
+                    saida.append(entrada)
+                else:
+                    destinatarios.update(self._seguidores.get(origem, ()))
+            destinatarios.discard(autor)
+            caixas, capacidade = self._caixas, self.capacidade
+            for destinatario in destinatarios:
+                caixa = caixas.get(destinatario)
+                if caixa is None:
+                    caixa = caixas[destinatario] = deque(maxlen=capacidade)
+                caixa.append(entrada)
+
+    def pagina(self, usuario, limite, antes=None, ativo=None):
+        # Até `limite` itens, do mais recente ao mais antigo, com sequência
+        # menor que `antes`. Devolve (itens, `antes` da próxima página ou None).
+        # Cada fonte é percorrida de trás para frente e as fontes são
+        # intercaladas por um heap, então o custo depende do tamanho da página
+        # e do número de origens pesadas seguidas, não de quantos são seguidos.
+        with self._trava:
+            fontes = [self._caixas.get(usuario, ())]
+            fontes.extend(self._saidas[origem] for origem in self._pesadas_seguidas.get(usuario, ()))
+            iteradores = [reversed(fonte) for fonte in fontes if fonte]
+            if antes is not None:
+                iteradores = [dropwhile(lambda entrada: entrada[0] >= antes, it) for it in iteradores]
+            intercalados = heapq.merge(*iteradores, key=lambda entrada: entrada[0], reverse=True)
+
+            itens, ultima, vista = [], None, None
+            for sequencia, item in intercalados:
+                # A mesma publicação pode vir da caixa e de uma saída pesada.
+                if sequencia == vista:
+                    continue
+                vista = sequencia
+                if ativo is not None and not ativo(item):
+                    continue
+                if len(itens) == limite:
+                    return itens, ultima
+                itens.append(item)
+                ultima = sequencia
+        return itens, None